@@ -5,17 +5,15 @@ Creates and configures the Flask application instance.
 """
 
 import os
+import hashlib
 import logging
+from functools import lru_cache
 from flask import Flask
-from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
 
 def create_app(config_name=None):
     """
@@ -28,23 +26,32 @@ def create_app(config_name=None):
         Configured Flask application instance
     """
     from app.config import get_config, Config
+    from app.json_provider import ORJSONProvider
+    
+    # Configure logging (no-op if the host process already did)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
     
     # Create Flask app
     app = Flask(
         __name__,
-        template_folder=str(Config.TEMPLATES_DIR),
-        static_folder=str(Config.STATIC_DIR)
+        template_folder=Config.TEMPLATES_DIR_STR,
+        static_folder=Config.STATIC_DIR_STR
     )
+    app.json = ORJSONProvider(app)
     
     # Load configuration
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
     
-    config_class = get_config()
+    config_class = get_config(config_name)
     app.config.from_object(config_class)
     
     # Ensure required directories exist
-    _ensure_directories(app)
+    _ensure_directories()
+    
+    # Serve static files outside of Flask when WhiteNoise is available
+    _init_static_files(app)
+    _init_static_versioning(app)
     
     # Initialize extensions and services
     _init_extensions(app)
@@ -55,13 +62,39 @@ def create_app(config_name=None):
     # Register error handlers
     _register_error_handlers(app)
     
-    logger.info(f"Application initialized in {config_name} mode")
+    logger.info("Application initialized in %s mode", config_name)
     
     return app
 
 
-def _ensure_directories(app):
-    """Ensure required directories exist."""
+def warmup(app):
+    """
+    Compile the numeric kernels and trace the inference paths in the current process.
+    
+    Called per Gunicorn worker (post_worker_init) and by run.py, so that
+    the first request does not pay for it and nothing TF-related is built
+    before a fork.
+    
+    Args:
+        app: Application returned by create_app
+    """
+    from utils import fast_ewm, plotting_utils
+    
+    fast_ewm.warmup()
+    plotting_utils.warmup()
+    
+    forecasting_service = getattr(app, 'forecasting_service', None)
+    if forecasting_service is None:
+        return
+    try:
+        forecasting_service.warmup()
+    except Exception as e:
+        logger.warning("Model warmup failed: %s", e)
+
+
+@lru_cache(maxsize=1)
+def _ensure_directories():
+    """Ensure required directories exist (once per process)."""
     from app.config import Config
     
     directories = [
@@ -70,21 +103,73 @@ def _ensure_directories(app):
     ]
     
     for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def _init_static_files(app):
+    """Wrap the WSGI app with WhiteNoise if it is installed."""
+    try:
+        from whitenoise import WhiteNoise
+    except ImportError:
+        logger.info("whitenoise not installed, Flask will serve static files")
+        return
+    
+    app.wsgi_app = WhiteNoise(
+        app.wsgi_app,
+        root=app.static_folder,
+        prefix=app.static_url_path,
+        max_age=app.config['SEND_FILE_MAX_AGE_DEFAULT'],
+        autorefresh=app.config['DEBUG']
+    )
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path, mtime_ns):
+    """Short content hash of a static file (mtime_ns keys out stale entries)."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+
+
+def _init_static_versioning(app):
+    """
+    Add a content-hash query string (?v=...) to every static URL.
+    
+    Assets are served with a long max-age, so each deploy that changes a
+    file must also change its URL or browsers keep the old copy.
+    """
+    static_folder = app.static_folder
+    
+    @app.url_defaults
+    def add_static_version(endpoint, values):
+        if endpoint != 'static' or 'filename' not in values or 'v' in values:
+            return
+        path = os.path.join(static_folder, values['filename'])
+        try:
+            values['v'] = _file_digest(path, os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
 
 
 def _init_extensions(app):
-    """Initialize Flask extensions and load ML models."""
+    """Initialize Flask extensions, shared services and ML models."""
+    from services.data_service import DataService
+    from services.indicator_service import IndicatorService
+    from services.report_service import ReportService
     from services.forecasting_service import ForecastingService
     
+    # One instance of each service per app, shared by all blueprints
+    app.data_service = DataService()
+    app.indicator_service = IndicatorService()
+    app.report_service = ReportService()
+    
     # Load ML model at startup to avoid reloading on each request
     with app.app_context():
         try:
-            forecasting_service = ForecastingService()
+            forecasting_service = ForecastingService(data_service=app.data_service)
             app.forecasting_service = forecasting_service
             logger.info("ML model loaded successfully")
         except Exception as e:
-            logger.error(f"Failed to load ML model: {e}")
+            logger.error("Failed to load ML model: %s", e)
             app.forecasting_service = None
 
 
@@ -102,30 +187,26 @@ def _register_blueprints(app):
 
 
 def _register_error_handlers(app):
-    """Register error handlers."""
-    from flask import jsonify, render_template
+    """
+    Register HTML error handlers.
+    
+    Errors raised inside the API and forecast blueprints are turned into
+    JSON by their own handlers (see routes._errors).
+    """
+    from flask import jsonify, render_template, request
     
     @app.errorhandler(404)
     def not_found_error(error):
-        if _is_api_request():
-            return jsonify({'error': 'Resource not found'}), 404
+        # Unmatched URLs never reach a blueprint, so API misses are caught here
+        if request.path.startswith('/api/'):
+            return jsonify({'success': False, 'error': 'Resource not found'}), 404
         return render_template('errors/404.html'), 404
     
     @app.errorhandler(500)
     def internal_error(error):
-        if _is_api_request():
-            return jsonify({'error': 'Internal server error'}), 500
         return render_template('errors/500.html'), 500
     
     @app.errorhandler(Exception)
     def handle_exception(error):
-        logger.error(f"Unhandled exception: {error}")
-        if _is_api_request():
-            return jsonify({'error': str(error)}), 500
+        logger.error("Unhandled exception: %s", error)
         return render_template('errors/500.html'), 500
-
-
-def _is_api_request():
-    """Check if current request is an API request."""
-    from flask import request
-    return request.path.startswith('/api/')
@@ -6,8 +6,12 @@ Uses environment variables with sensible defaults.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
+# Project root, computed once; absolute() avoids resolve()'s symlink walk
+_BASE_DIR = Path(__file__).absolute().parent.parent
+
 
 class Config:
     """Base configuration class."""
@@ -19,20 +23,29 @@ class Config:
     DEBUG = os.environ.get('DEBUG', 'False').lower() in ('true', '1', 'yes')
     
     # Base Paths
-    BASE_DIR = Path(__file__).resolve().parent.parent
+    BASE_DIR = _BASE_DIR
     MODELS_DIR = BASE_DIR / 'models'
     STATIC_DIR = BASE_DIR / 'static'
     TEMPLATES_DIR = BASE_DIR / 'templates'
+    STATIC_DIR_STR = str(STATIC_DIR)
+    TEMPLATES_DIR_STR = str(TEMPLATES_DIR)
+    
+    # Model Configuration (plain strings, accepted directly by Keras/joblib)
+    MODEL_PATH = str(MODELS_DIR / 'stock_prediction_model.keras')
+    SCALER_PATH = str(MODELS_DIR / 'scaler.joblib')
     
-    # Model Configuration
-    MODEL_PATH = MODELS_DIR / 'stock_prediction_model.keras'
-    SCALER_PATH = MODELS_DIR / 'scaler.joblib'
+    # Bundled ticker -> name/sector/exchange table (avoids Yahoo lookups for names)
+    TICKERS_PATH = BASE_DIR / 'data' / 'tickers.csv'
     
     # LSTM Model Parameters (must match training)
     WINDOW_SIZE = 100  # Lookback window (days)
     FEATURES = ['Close']  # Feature order must match training - CLOSE ONLY!
     NUM_FEATURES = 1
     
+    # Inference Settings
+    ENABLE_XLA = os.environ.get('ENABLE_XLA', 'False').lower() in ('true', '1', 'yes')
+    ENABLE_TFLITE = os.environ.get('ENABLE_TFLITE', 'False').lower() in ('true', '1', 'yes')  # int8 weights, slight accuracy loss
+    
     # Forecasting Parameters
     DEFAULT_FORECAST_HORIZON = 5  # Days
     MAX_FORECAST_HORIZON = 30
@@ -44,14 +57,29 @@ class Config:
     DEFAULT_LOOKBACK_DAYS = 365  # Historical data to fetch
     MIN_DATA_POINTS = WINDOW_SIZE + 10  # Minimum required data
     
+    # Market Data Cache
+    DATA_CACHE_TTL = 300  # Seconds
+    DATA_CACHE_SIZE = 256  # Max frames kept in memory
+    DATA_CACHE_DIR = os.environ.get('DATA_CACHE_DIR', '')  # Opt-in diskcache directory shared by workers; '' disables
+    
     # Technical Indicators
     MA_SHORT = 20  # Moving average short period
     MA_LONG = 50   # Moving average long period
     VOLATILITY_WINDOW = 20  # Rolling volatility window
+    INDICATOR_CACHE_DIR = os.environ.get('INDICATOR_CACHE_DIR', '')  # .npy store for repeat backtests; '' disables
     
     # API Rate Limiting
     RATE_LIMIT = os.environ.get('RATE_LIMIT', '100 per minute')
     
+    # Response Caching (seconds, stale-while-revalidate)
+    PRICE_CACHE_TTL = 60
+    INDICATOR_CACHE_TTL = 300
+    FORECAST_CACHE_TTL = 900
+    API_CACHE_MAX_AGE = 30  # Browser/CDN max-age for conditional GETs
+    
+    # Static asset caching (seconds); safe because static URLs carry a ?v=<content hash>
+    SEND_FILE_MAX_AGE_DEFAULT = int(os.environ.get('STATIC_MAX_AGE', 31536000))
+    
     # Report Settings
     REPORTS_DIR = BASE_DIR / 'reports'
     
@@ -88,7 +116,16 @@ config_by_name = {
 }
 
 
-def get_config():
-    """Get configuration based on environment."""
-    env = os.environ.get('FLASK_ENV', 'development')
+@lru_cache(maxsize=None)
+def get_config(config_name=None):
+    """
+    Get configuration class by name, defaulting to the environment.
+    
+    Args:
+        config_name: Configuration name (falls back to FLASK_ENV)
+        
+    Returns:
+        Configuration class
+    """
+    env = config_name or os.environ.get('FLASK_ENV', 'development')
     return config_by_name.get(env, DevelopmentConfig)
@@ -0,0 +1,52 @@
+"""
+JSON Provider Module
+====================
+Fast JSON serialization for API responses using orjson.
+"""
+
+import decimal
+from typing import Any
+
+import numpy as np
+import orjson
+from flask.json.provider import JSONProvider
+
+# numpy arrays/scalars and datetimes are encoded natively in C
+ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NAIVE_UTC
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not handle natively."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    mimetype = 'application/json'
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string."""
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize data as JSON and wrap it in a response."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype
+        )
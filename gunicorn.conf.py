@@ -0,0 +1,33 @@
+"""
+Gunicorn Configuration
+======================
+Production server settings for the Stock Forecast Dashboard.
+Usage: gunicorn -c gunicorn.conf.py "app:create_app()"
+"""
+
+import os
+
+# Server socket
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+
+# Worker processes
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Each worker builds its own app and loads the model after fork: TensorFlow
+# state created in the master deadlocks predict() and tf.function in children
+preload_app = False
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    """Warm up the model this worker loaded, after fork and before serving."""
+    from app import warmup
+    
+    warmup(worker.wsgi)
+    worker.log.info("Worker %s loaded and warmed up application", worker.pid)
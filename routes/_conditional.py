@@ -0,0 +1,39 @@
+"""
+Conditional Responses
+=====================
+ETag / If-None-Match support for cacheable GET endpoints.
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import current_app, request
+
+from app.config import Config
+
+
+def conditional_json(view):
+    """
+    Add a content ETag to successful JSON responses and honor If-None-Match.
+    
+    Clients polling data that has not changed get an empty 304 instead of
+    the full payload.
+    
+    Args:
+        view: Flask view function returning a JSON response or dict
+    
+    Returns:
+        Wrapped view function
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = current_app.make_response(view(*args, **kwargs))
+        if response.status_code != 200 or not response.is_json:
+            return response
+        
+        body = response.get_data()
+        response.set_etag(hashlib.blake2b(body, digest_size=8).hexdigest())
+        response.headers['Cache-Control'] = f'public, max-age={Config.API_CACHE_MAX_AGE}'
+        return response.make_conditional(request)
+    
+    return wrapper
@@ -0,0 +1,59 @@
+"""
+Blueprint Error Handlers
+========================
+JSON error responses shared by the API and forecast blueprints.
+"""
+
+import logging
+from flask import Blueprint, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+from utils.errors import UserError
+
+logger = logging.getLogger(__name__)
+
+
+def register_json_error_handlers(bp: Blueprint) -> None:
+    """
+    Make every error raised inside a blueprint's views return JSON.
+    
+    HTTP errors keep their status code. UserError (and UpstreamError)
+    messages are written for clients and returned with their own status;
+    any other ValueError/TypeError becomes a 400 and anything else a 500,
+    both with a fixed message so internal exception text never reaches
+    the client.
+    
+    Args:
+        bp: Blueprint to attach the handlers to
+    """
+    @bp.errorhandler(HTTPException)
+    def handle_http_error(error):
+        return jsonify({
+            'success': False,
+            'error': error.description
+        }), error.code
+    
+    @bp.errorhandler(UserError)
+    def handle_user_error(error):
+        logger.warning("Request failed in %s: %s", request.endpoint, error)
+        return jsonify({
+            'success': False,
+            'error': str(error)
+        }), error.status_code
+    
+    @bp.errorhandler(ValueError)
+    @bp.errorhandler(TypeError)
+    def handle_bad_request(error):
+        logger.warning("Bad request in %s: %s", request.endpoint, error)
+        return jsonify({
+            'success': False,
+            'error': 'Invalid request'
+        }), 400
+    
+    @bp.errorhandler(Exception)
+    def handle_error(error):
+        logger.exception("Unhandled error in %s", request.endpoint)
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
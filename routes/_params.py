@@ -0,0 +1,65 @@
+"""
+Request Parameter Parsing
+=========================
+Shared parsing and validation for forecast request bodies.
+"""
+
+from typing import Tuple
+
+from flask import request
+
+from app.config import Config
+from utils.errors import UserError
+from utils.validation import is_valid_ticker
+
+
+def parse_horizon(value, max_horizon: int = Config.MAX_FORECAST_HORIZON) -> int:
+    """
+    Convert a request horizon to an int clamped to [1, max_horizon].
+    
+    Args:
+        value: Raw horizon from the request
+        max_horizon: Upper bound for the horizon
+    
+    Returns:
+        Clamped horizon
+    
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    try:
+        horizon = int(value)
+    except (TypeError, ValueError):
+        raise UserError('Invalid horizon') from None
+    return min(max(horizon, 1), max_horizon)
+
+
+def parse_forecast_body(
+    default_horizon: int = Config.DEFAULT_FORECAST_HORIZON,
+    max_horizon: int = Config.MAX_FORECAST_HORIZON
+) -> Tuple[str, int]:
+    """
+    Read ticker and horizon from the JSON request body.
+    
+    Missing values fall back to the configured defaults and the horizon is
+    clamped to [1, max_horizon].
+    
+    Args:
+        default_horizon: Horizon used when the body has none
+        max_horizon: Upper bound for the horizon
+    
+    Returns:
+        Tuple of (ticker, horizon)
+    
+    Raises:
+        ValueError: If the ticker or horizon is malformed
+    """
+    body = request.get_json(silent=True) or {}
+    
+    ticker = body.get('ticker') or Config.DEFAULT_TICKER
+    if not is_valid_ticker(ticker):
+        raise UserError('Invalid ticker')
+    
+    horizon = parse_horizon(body.get('horizon', default_horizon), max_horizon)
+    
+    return ticker.upper(), horizon
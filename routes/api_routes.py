@@ -5,24 +5,74 @@ REST API endpoints for the stock forecast dashboard.
 """
 
 import logging
-from flask import Blueprint, jsonify, request, current_app, send_file
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 
-from services.data_service import DataService
-from services.indicator_service import IndicatorService
-from services.report_service import ReportService
 from app.config import Config
+from routes._conditional import conditional_json
+from routes._errors import register_json_error_handlers
+from routes._params import parse_forecast_body
+from utils.cache import SWRCache
+from utils.validation import is_valid_ticker
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__)
+register_json_error_handlers(api_bp)
 
-# Initialize services
-data_service = DataService()
-indicator_service = IndicatorService()
-report_service = ReportService()
+# Short-lived response cache for read-only endpoints
+response_cache = SWRCache()
+
+# Bytes of CSV gathered before each write to the client socket
+CSV_STREAM_CHUNK = 16 * 1024
+
+
+def _coalesce(chunks, size=CSV_STREAM_CHUNK):
+    """
+    Join small string chunks into blocks of at least size characters.
+    
+    Args:
+        chunks: Iterable of strings
+        size: Minimum block length before a block is emitted
+    
+    Yields:
+        Concatenated blocks; the last one may be shorter
+    """
+    pending = []
+    pending_len = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_len += len(chunk)
+        if pending_len >= size:
+            yield ''.join(pending)
+            pending = []
+            pending_len = 0
+    if pending:
+        yield ''.join(pending)
+
+
+def _csv_response(rows, filename):
+    """
+    Stream CSV lines to the client as an attachment.
+    
+    Lines are coalesced so the server makes one socket write per block
+    rather than one per line.
+    
+    Args:
+        rows: Iterable of CSV-formatted lines
+        filename: Download filename
+    
+    Returns:
+        Streaming text/csv response
+    """
+    return Response(
+        stream_with_context(_coalesce(rows)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 
 @api_bp.route('/stock/<ticker>', methods=['GET'])
+@conditional_json
 def get_stock_data(ticker):
     """
     Get historical stock data with indicators.
@@ -30,69 +80,84 @@ def get_stock_data(ticker):
     Query params:
         days: Number of days of historical data (default: 365)
     """
-    try:
-        days = request.args.get('days', 365, type=int)
-        days = max(30, min(days, 365 * 5))  # Limit range
-        
+    if not is_valid_ticker(ticker):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid ticker'
+        }), 400
+    
+    days = request.args.get('days', 365, type=int)
+    days = max(30, min(days, 365 * 5))  # Limit range
+    
+    data_service = current_app.data_service
+    indicator_service = current_app.indicator_service
+    
+    def load():
         # Fetch data
         data = data_service.fetch_stock_data(ticker, period_days=days)
         
         # Calculate indicators
-        chart_data = indicator_service.get_chart_data(data, days=days)
-        
-        return jsonify({
-            'success': True,
-            'ticker': ticker.upper(),
-            'data': chart_data
-        })
-        
-    except Exception as e:
-        logger.error(f"Error fetching stock data: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+        return indicator_service.get_chart_data(data, days=days)
+    
+    chart_data = response_cache.get_or_load(
+        ('stock', ticker.upper(), days), load, Config.INDICATOR_CACHE_TTL
+    )
+    
+    return jsonify({
+        'success': True,
+        'ticker': ticker.upper(),
+        'data': chart_data
+    })
 
 
 @api_bp.route('/stock/<ticker>/latest', methods=['GET'])
+@conditional_json
 def get_latest_price(ticker):
     """Get the latest price information for a stock."""
-    try:
-        price_info = data_service.get_latest_price(ticker)
-        
-        return jsonify({
-            'success': True,
-            **price_info
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting latest price: {e}")
+    if not is_valid_ticker(ticker):
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'Invalid ticker'
         }), 400
+    
+    data_service = current_app.data_service
+    price_info = response_cache.get_or_load(
+        ('latest', ticker.upper()),
+        lambda: data_service.get_latest_price(ticker),
+        Config.PRICE_CACHE_TTL
+    )
+    
+    return jsonify({
+        'success': True,
+        **price_info
+    })
 
 
 @api_bp.route('/stock/<ticker>/info', methods=['GET'])
+@conditional_json
 def get_stock_info(ticker):
     """Get detailed stock information."""
-    try:
-        info = data_service.get_stock_info(ticker)
-        
-        return jsonify({
-            'success': True,
-            **info
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting stock info: {e}")
+    if not is_valid_ticker(ticker):
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'Invalid ticker'
         }), 400
+    
+    data_service = current_app.data_service
+    info = response_cache.get_or_load(
+        ('info', ticker.upper()),
+        lambda: data_service.get_stock_info(ticker),
+        Config.INDICATOR_CACHE_TTL
+    )
+    
+    return jsonify({
+        'success': True,
+        **info
+    })
 
 
 @api_bp.route('/stock/<ticker>/indicators', methods=['GET'])
+@conditional_json
 def get_indicators(ticker):
     """
     Get technical indicators for a stock.
@@ -100,9 +165,19 @@ def get_indicators(ticker):
     Query params:
         days: Number of days of data to use (default: 100)
     """
-    try:
-        days = request.args.get('days', 100, type=int)
-        
+    if not is_valid_ticker(ticker):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid ticker'
+        }), 400
+    
+    days = request.args.get('days', 100, type=int)
+    days = max(30, min(days, 365 * 5))  # Limit range
+    
+    data_service = current_app.data_service
+    indicator_service = current_app.indicator_service
+    
+    def load():
         # Fetch data
         data = data_service.fetch_stock_data(ticker, period_days=days + 60)
         
@@ -110,28 +185,23 @@ def get_indicators(ticker):
         data_with_indicators = indicator_service.calculate_all_indicators(data)
         
         # Get various indicator summaries
-        trend = indicator_service.get_trend_signal(data_with_indicators)
-        volatility = indicator_service.get_volatility_metrics(data_with_indicators)
-        returns_stats = indicator_service.get_returns_statistics(data_with_indicators)
-        support_resistance = indicator_service.get_support_resistance(data_with_indicators)
-        rsi = indicator_service.get_rsi_signal(data_with_indicators)
-        
-        return jsonify({
-            'success': True,
-            'ticker': ticker.upper(),
-            'trend': trend,
-            'volatility': volatility,
-            'returns': returns_stats,
-            'support_resistance': support_resistance,
-            'rsi': rsi
-        })
-        
-    except Exception as e:
-        logger.error(f"Error calculating indicators: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+        return {
+            'trend': indicator_service.get_trend_signal(data_with_indicators),
+            'volatility': indicator_service.get_volatility_metrics(data_with_indicators),
+            'returns': indicator_service.get_returns_statistics(data_with_indicators),
+            'support_resistance': indicator_service.get_support_resistance(data_with_indicators),
+            'rsi': indicator_service.get_rsi_signal(data_with_indicators)
+        }
+    
+    indicators = response_cache.get_or_load(
+        ('indicators', ticker.upper(), days), load, Config.INDICATOR_CACHE_TTL
+    )
+    
+    return jsonify({
+        'success': True,
+        'ticker': ticker.upper(),
+        **indicators
+    })
 
 
 @api_bp.route('/predict', methods=['POST'])
@@ -142,30 +212,21 @@ def predict():
     JSON body:
         ticker: Stock ticker symbol
     """
-    try:
-        data = request.get_json()
-        ticker = data.get('ticker', Config.DEFAULT_TICKER)
-        
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        # Make prediction
-        result = current_app.forecasting_service.predict_next_day(ticker)
-        
-        return jsonify({
-            'success': True,
-            **result
-        })
-        
-    except Exception as e:
-        logger.error(f"Error making prediction: {e}")
+    ticker, _ = parse_forecast_body()
+    
+    if not current_app.forecasting_service:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 400
+            'error': 'Model not loaded'
+        }), 500
+    
+    # Make prediction
+    result = current_app.forecasting_service.predict_next_day(ticker)
+    
+    return jsonify({
+        'success': True,
+        **result
+    })
 
 
 @api_bp.route('/forecast', methods=['POST'])
@@ -177,104 +238,74 @@ def forecast():
         ticker: Stock ticker symbol
         horizon: Number of days to forecast (1-30)
     """
-    try:
-        data = request.get_json()
-        ticker = data.get('ticker', Config.DEFAULT_TICKER)
-        horizon = data.get('horizon', Config.DEFAULT_FORECAST_HORIZON)
-        
-        # Validate horizon
-        horizon = max(1, min(int(horizon), Config.MAX_FORECAST_HORIZON))
-        
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        # Generate forecast
-        result = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
-        
-        return jsonify({
-            'success': True,
-            **result
-        })
-        
-    except Exception as e:
-        logger.error(f"Error generating forecast: {e}")
+    ticker, horizon = parse_forecast_body()
+    
+    if not current_app.forecasting_service:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 400
+            'error': 'Model not loaded'
+        }), 500
+    
+    # Generate forecast
+    result = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
+    
+    return jsonify({
+        'success': True,
+        **result
+    })
 
 
 @api_bp.route('/metrics/<ticker>', methods=['GET'])
 def get_metrics(ticker):
     """Get model performance metrics for a ticker."""
-    try:
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        # Calculate metrics
-        result = current_app.forecasting_service.calculate_metrics(ticker)
-        
-        return jsonify({
-            'success': True,
-            **result
-        })
-        
-    except Exception as e:
-        logger.error(f"Error calculating metrics: {e}")
+    if not is_valid_ticker(ticker):
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'Invalid ticker'
         }), 400
+    
+    if not current_app.forecasting_service:
+        return jsonify({
+            'success': False,
+            'error': 'Model not loaded'
+        }), 500
+    
+    # Calculate metrics
+    result = current_app.forecasting_service.calculate_metrics(ticker)
+    
+    return jsonify({
+        'success': True,
+        **result
+    })
 
 
 @api_bp.route('/model/info', methods=['GET'])
 def get_model_info():
     """Get information about the loaded model."""
-    try:
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        info = current_app.forecasting_service.get_model_info()
-        
-        return jsonify({
-            'success': True,
-            **info
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting model info: {e}")
+    if not current_app.forecasting_service:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 400
+            'error': 'Model not loaded'
+        }), 500
+    
+    info = current_app.forecasting_service.get_model_info()
+    
+    return jsonify({
+        'success': True,
+        **info
+    })
 
 
 @api_bp.route('/validate/<ticker>', methods=['GET'])
 def validate_ticker(ticker):
     """Validate if a ticker symbol exists."""
-    try:
-        is_valid, message = data_service.validate_ticker(ticker)
-        
-        return jsonify({
-            'success': True,
-            'valid': is_valid,
-            'message': message
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+    is_valid, message = current_app.data_service.validate_ticker(ticker)
+    
+    return jsonify({
+        'success': True,
+        'valid': is_valid,
+        'message': message
+    })
 
 
 @api_bp.route('/search', methods=['GET'])
@@ -286,22 +317,15 @@ def search_tickers():
         q: Search query
         limit: Maximum results (default: 10)
     """
-    try:
-        query = request.args.get('q', '')
-        limit = request.args.get('limit', 10, type=int)
-        
-        results = data_service.search_tickers(query, limit)
-        
-        return jsonify({
-            'success': True,
-            'results': results
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    
+    results = current_app.data_service.search_tickers(query, limit)
+    
+    return jsonify({
+        'success': True,
+        'results': results
+    })
 
 
 @api_bp.route('/download/csv', methods=['POST'])
@@ -313,38 +337,61 @@ def download_csv():
         ticker: Stock ticker symbol
         horizon: Forecast horizon
     """
+    ticker, horizon = parse_forecast_body()
+    
+    if not current_app.forecasting_service:
+        return jsonify({
+            'success': False,
+            'error': 'Model not loaded'
+        }), 500
+    
+    # Generate forecast
+    forecast_data = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
+    
+    # Stream CSV rows as they are produced
+    report_service = current_app.report_service
+    filename = report_service.get_report_filename(ticker, 'csv')
+    
+    return _csv_response(
+        report_service.iter_forecast_csv(forecast_data), filename
+    )
+
+
+@api_bp.route('/download/parquet', methods=['POST'])
+def download_parquet():
+    """
+    Download forecast as a Parquet file.
+    
+    JSON body:
+        ticker: Stock ticker symbol
+        horizon: Forecast horizon
+    """
+    ticker, horizon = parse_forecast_body()
+    
+    if not current_app.forecasting_service:
+        return jsonify({
+            'success': False,
+            'error': 'Model not loaded'
+        }), 500
+    
+    # Generate forecast
+    forecast_data = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
+    
+    report_service = current_app.report_service
     try:
-        data = request.get_json()
-        ticker = data.get('ticker', Config.DEFAULT_TICKER)
-        horizon = data.get('horizon', Config.DEFAULT_FORECAST_HORIZON)
-        
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        # Generate forecast
-        forecast_data = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
-        
-        # Generate CSV
-        csv_buffer = report_service.generate_forecast_csv(forecast_data)
-        
-        filename = report_service.get_report_filename(ticker, 'csv')
-        
-        return send_file(
-            csv_buffer,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=filename
-        )
-        
-    except Exception as e:
-        logger.error(f"Error generating CSV: {e}")
+        buffer = report_service.generate_forecast_parquet(forecast_data)
+    except ImportError:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 400
+            'error': 'Parquet export is not available on this server'
+        }), 501
+    filename = report_service.get_report_filename(ticker, 'parquet')
+    
+    return Response(
+        buffer.getvalue(),
+        mimetype='application/vnd.apache.parquet',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
 
 @api_bp.route('/download/report', methods=['POST'])
@@ -356,66 +403,47 @@ def download_report():
         ticker: Stock ticker symbol
         horizon: Forecast horizon
     """
-    try:
-        req_data = request.get_json()
-        ticker = req_data.get('ticker', Config.DEFAULT_TICKER)
-        horizon = req_data.get('horizon', Config.DEFAULT_FORECAST_HORIZON)
-        
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        # Fetch data
-        historical_data = data_service.fetch_stock_data(ticker, period_days=365)
-        
-        # Generate forecast
-        forecast_data = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
-        
-        # Get indicators
-        data_with_indicators = indicator_service.calculate_all_indicators(historical_data)
-        indicators = {
-            'trend': indicator_service.get_trend_signal(data_with_indicators),
-            'volatility': indicator_service.get_volatility_metrics(data_with_indicators),
-            'returns': indicator_service.get_returns_statistics(data_with_indicators)
-        }
-        
-        # Generate report
-        csv_buffer = report_service.generate_csv_report(
-            ticker, forecast_data, historical_data, indicators
-        )
-        
-        filename = report_service.get_report_filename(ticker, 'csv')
-        
-        return send_file(
-            csv_buffer,
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=filename
-        )
-        
-    except Exception as e:
-        logger.error(f"Error generating report: {e}")
+    ticker, horizon = parse_forecast_body()
+    
+    if not current_app.forecasting_service:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 400
+            'error': 'Model not loaded'
+        }), 500
+    
+    data_service = current_app.data_service
+    indicator_service = current_app.indicator_service
+    report_service = current_app.report_service
+    
+    # Fetch data
+    historical_data = data_service.fetch_stock_data(ticker, period_days=365)
+    
+    # Generate forecast
+    forecast_data = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
+    
+    # Get indicators
+    data_with_indicators = indicator_service.calculate_all_indicators(historical_data)
+    indicators = {
+        'trend': indicator_service.get_trend_signal(data_with_indicators),
+        'volatility': indicator_service.get_volatility_metrics(data_with_indicators),
+        'returns': indicator_service.get_returns_statistics(data_with_indicators)
+    }
+    
+    # Stream report rows as they are produced
+    filename = report_service.get_report_filename(ticker, 'csv')
+    
+    return _csv_response(
+        report_service.iter_csv_report(ticker, forecast_data, historical_data, indicators),
+        filename
+    )
 
 
 @api_bp.route('/market/status', methods=['GET'])
 def market_status():
     """Get current market status."""
-    try:
-        status = data_service.get_market_status()
-        
-        return jsonify({
-            'success': True,
-            **status
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+    status = current_app.data_service.get_market_status()
+    
+    return jsonify({
+        'success': True,
+        **status
+    })
@@ -5,22 +5,30 @@ Specialized routes for forecast-related operations.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, jsonify, request, current_app
 
-from services.data_service import DataService
-from services.indicator_service import IndicatorService
 from app.config import Config
+from routes._conditional import conditional_json
+from routes._errors import register_json_error_handlers
+from routes._params import parse_horizon
+from utils.cache import SWRCache
+from utils.validation import is_valid_ticker
 
 logger = logging.getLogger(__name__)
 
 forecast_bp = Blueprint('forecast', __name__)
+register_json_error_handlers(forecast_bp)
 
-# Initialize services
-data_service = DataService()
-indicator_service = IndicatorService()
+# Short-lived response cache for read-only endpoints
+response_cache = SWRCache()
+
+# Worker pool for independent I/O and model calls within a request
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='forecast')
 
 
 @forecast_bp.route('/dashboard/<ticker>', methods=['GET'])
+@conditional_json
 def get_dashboard_data(ticker):
     """
     Get all data needed for the dashboard in one call.
@@ -31,19 +39,44 @@ def get_dashboard_data(ticker):
         days: Historical days (default: 90)
         horizon: Forecast horizon (default: 5)
     """
-    try:
-        days = request.args.get('days', 90, type=int)
-        horizon = request.args.get('horizon', 5, type=int)
-        
-        # Validate inputs
-        days = max(30, min(days, 365))
-        horizon = max(1, min(horizon, Config.MAX_FORECAST_HORIZON))
-        
-        # Fetch historical data
-        historical_data = data_service.fetch_stock_data(ticker, period_days=days + 60)
+    if not is_valid_ticker(ticker):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid ticker'
+        }), 400
+    
+    days = request.args.get('days', 90, type=int)
+    horizon = request.args.get('horizon', 5, type=int)
+    
+    # Validate inputs
+    days = max(30, min(days, 365))
+    horizon = max(1, min(horizon, Config.MAX_FORECAST_HORIZON))
+    
+    forecasting_service = current_app.forecasting_service
+    data_service = current_app.data_service
+    indicator_service = current_app.indicator_service
+    
+    def run_models(historical_data):
+        prediction = forecasting_service.predict_next_day(
+            ticker, data=historical_data
+        )
+        forecast = forecasting_service.forecast_multi_day(
+            ticker, horizon, data=historical_data
+        )
+        return prediction, forecast
+    
+    def load():
+        # Fetch historical data and latest price concurrently
+        f_hist = _EXECUTOR.submit(
+            data_service.fetch_stock_data, ticker, period_days=days + 60
+        )
+        f_latest = _EXECUTOR.submit(data_service.get_latest_price, ticker)
+        historical_data = f_hist.result()
         
-        # Get latest price
-        latest_price = data_service.get_latest_price(ticker)
+        # Run the model while indicators are computed on this thread
+        f_models = None
+        if forecasting_service:
+            f_models = _EXECUTOR.submit(run_models, historical_data)
         
         # Calculate indicators
         data_with_indicators = indicator_service.calculate_all_indicators(historical_data)
@@ -55,23 +88,19 @@ def get_dashboard_data(ticker):
         rsi = indicator_service.get_rsi_signal(data_with_indicators)
         support_resistance = indicator_service.get_support_resistance(data_with_indicators)
         
-        # Generate forecast
+        # Collect forecast
         forecast = None
         prediction = None
         
-        if current_app.forecasting_service:
+        if f_models is not None:
             try:
-                prediction = current_app.forecasting_service.predict_next_day(
-                    ticker, data=historical_data
-                )
-                forecast = current_app.forecasting_service.forecast_multi_day(
-                    ticker, horizon, data=historical_data
-                )
+                prediction, forecast = f_models.result()
             except Exception as e:
-                logger.warning(f"Forecast error: {e}")
+                logger.warning("Forecast error: %s", e)
         
-        return jsonify({
-            'success': True,
+        latest_price = f_latest.result()
+        
+        return {
             'ticker': ticker.upper(),
             'latest': latest_price,
             'chart_data': chart_data,
@@ -84,14 +113,17 @@ def get_dashboard_data(ticker):
             'prediction': prediction,
             'forecast': forecast,
             'disclaimer': Config.DISCLAIMER
-        })
-        
-    except Exception as e:
-        logger.error(f"Error fetching dashboard data: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+        }
+    
+    # The payload embeds the latest quote, so it follows the price TTL
+    dashboard = response_cache.get_or_load(
+        ('dashboard', ticker.upper(), days, horizon), load, Config.PRICE_CACHE_TTL
+    )
+    
+    return jsonify({
+        'success': True,
+        **dashboard
+    })
 
 
 @forecast_bp.route('/quick/<ticker>', methods=['GET'])
@@ -102,44 +134,42 @@ def get_quick_forecast(ticker):
     Query params:
         horizon: Forecast horizon (default: 5)
     """
-    try:
-        horizon = request.args.get('horizon', 5, type=int)
-        horizon = max(1, min(horizon, 7))  # Quick forecast limited to 7 days
-        
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        # Get latest price
-        latest = data_service.get_latest_price(ticker)
-        
-        # Generate forecast
-        forecast = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
-        
-        # Quick summary
-        summary = {
-            'ticker': ticker.upper(),
-            'current_price': latest['current_price'],
-            'predicted_close': forecast['summary']['final_predicted_close'],
-            'change': forecast['summary']['total_change'],
-            'change_percent': forecast['summary']['total_change_percent'],
-            'trend': forecast['summary']['trend'],
-            'horizon': horizon
-        }
-        
-        return jsonify({
-            'success': True,
-            **summary
-        })
-        
-    except Exception as e:
-        logger.error(f"Error in quick forecast: {e}")
+    if not is_valid_ticker(ticker):
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'Invalid ticker'
         }), 400
+    
+    horizon = request.args.get('horizon', 5, type=int)
+    horizon = max(1, min(horizon, 7))  # Quick forecast limited to 7 days
+    
+    if not current_app.forecasting_service:
+        return jsonify({
+            'success': False,
+            'error': 'Model not loaded'
+        }), 500
+    
+    # Get latest price
+    latest = current_app.data_service.get_latest_price(ticker, live_info=False)
+    
+    # Generate forecast
+    forecast = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
+    
+    # Quick summary
+    summary = {
+        'ticker': ticker.upper(),
+        'current_price': latest['current_price'],
+        'predicted_close': forecast['summary']['final_predicted_close'],
+        'change': forecast['summary']['total_change'],
+        'change_percent': forecast['summary']['total_change_percent'],
+        'trend': forecast['summary']['trend'],
+        'horizon': horizon
+    }
+    
+    return jsonify({
+        'success': True,
+        **summary
+    })
 
 
 @forecast_bp.route('/compare', methods=['POST'])
@@ -151,57 +181,69 @@ def compare_forecasts():
         tickers: List of ticker symbols
         horizon: Forecast horizon (default: 5)
     """
-    try:
-        data = request.get_json()
-        tickers = data.get('tickers', [])
-        horizon = data.get('horizon', 5)
-        
-        if not tickers or len(tickers) > 5:
-            return jsonify({
-                'success': False,
-                'error': 'Provide 1-5 tickers'
-            }), 400
-        
-        if not current_app.forecasting_service:
-            return jsonify({
-                'success': False,
-                'error': 'Model not loaded'
-            }), 500
-        
-        results = []
-        
-        for ticker in tickers:
-            try:
-                forecast = current_app.forecasting_service.forecast_multi_day(ticker, horizon)
-                latest = data_service.get_latest_price(ticker)
-                
-                results.append({
-                    'ticker': ticker.upper(),
-                    'current_price': latest['current_price'],
-                    'predicted_close': forecast['summary']['final_predicted_close'],
-                    'change_percent': forecast['summary']['total_change_percent'],
-                    'trend': forecast['summary']['trend'],
-                    'success': True
-                })
-            except Exception as e:
-                results.append({
-                    'ticker': ticker.upper(),
-                    'success': False,
-                    'error': str(e)
-                })
-        
+    data = request.get_json(silent=True) or {}
+    tickers = data.get('tickers', [])
+    horizon = parse_horizon(data.get('horizon', 5))
+    
+    if not tickers or len(tickers) > 5:
         return jsonify({
-            'success': True,
-            'horizon': horizon,
-            'comparison': results
-        })
-        
-    except Exception as e:
-        logger.error(f"Error comparing forecasts: {e}")
+            'success': False,
+            'error': 'Provide 1-5 tickers'
+        }), 400
+    
+    if not all(is_valid_ticker(t) for t in tickers):
         return jsonify({
             'success': False,
-            'error': str(e)
+            'error': 'Invalid ticker'
         }), 400
+    
+    if not current_app.forecasting_service:
+        return jsonify({
+            'success': False,
+            'error': 'Model not loaded'
+        }), 500
+    
+    data_service = current_app.data_service
+    tickers = [t.upper() for t in tickers]
+    
+    # Quotes are fetched in the background while one batched model run
+    # forecasts every ticker
+    latest_future = _EXECUTOR.submit(data_service.get_latest_prices, tickers, live_info=False)
+    forecasts = current_app.forecasting_service.forecast_multi_day_batch(tickers, horizon)
+    
+    latest_prices = latest_future.result()
+    
+    results = []
+    for ticker in tickers:
+        forecast = forecasts[ticker]
+        latest = latest_prices[ticker]
+        try:
+            if 'error' in forecast:
+                raise ValueError(forecast['error'])
+            if 'error' in latest:
+                raise ValueError(latest['error'])
+            
+            results.append({
+                'ticker': ticker,
+                'current_price': latest['current_price'],
+                'predicted_close': forecast['summary']['final_predicted_close'],
+                'change_percent': forecast['summary']['total_change_percent'],
+                'trend': forecast['summary']['trend'],
+                'success': True
+            })
+        except Exception as e:
+            logger.warning("Compare forecast failed for %s: %s", ticker, e)
+            results.append({
+                'ticker': ticker,
+                'success': False,
+                'error': 'Forecast unavailable'
+            })
+    
+    return jsonify({
+        'success': True,
+        'horizon': horizon,
+        'comparison': results
+    })
 
 
 @forecast_bp.route('/analysis/<ticker>', methods=['GET'])
@@ -212,9 +254,20 @@ def get_full_analysis(ticker):
     Query params:
         days: Historical days for analysis (default: 180)
     """
-    try:
-        days = request.args.get('days', 180, type=int)
-        
+    if not is_valid_ticker(ticker):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid ticker'
+        }), 400
+    
+    days = request.args.get('days', 180, type=int)
+    days = max(30, min(days, 365 * 5))  # Limit range
+    
+    forecasting_service = current_app.forecasting_service
+    data_service = current_app.data_service
+    indicator_service = current_app.indicator_service
+    
+    def load():
         # Fetch data
         historical_data = data_service.fetch_stock_data(ticker, period_days=days + 60)
         
@@ -235,15 +288,14 @@ def get_full_analysis(ticker):
         model_metrics = None
         forecast = None
         
-        if current_app.forecasting_service:
+        if forecasting_service:
             try:
-                model_metrics = current_app.forecasting_service.calculate_metrics(ticker)
-                forecast = current_app.forecasting_service.forecast_multi_day(ticker, 5)
+                model_metrics = forecasting_service.calculate_metrics(ticker)
+                forecast = forecasting_service.forecast_multi_day(ticker, 5)
             except Exception as e:
-                logger.warning(f"Analysis forecast error: {e}")
+                logger.warning("Analysis forecast error: %s", e)
         
-        return jsonify({
-            'success': True,
+        return {
             'ticker': ticker.upper(),
             'stock_info': stock_info,
             'technical_analysis': {
@@ -258,11 +310,13 @@ def get_full_analysis(ticker):
             'model_performance': model_metrics,
             'forecast': forecast,
             'disclaimer': Config.DISCLAIMER
-        })
-        
-    except Exception as e:
-        logger.error(f"Error in full analysis: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
+        }
+    
+    analysis = response_cache.get_or_load(
+        ('analysis', ticker.upper(), days), load, Config.FORECAST_CACHE_TTL
+    )
+    
+    return jsonify({
+        'success': True,
+        **analysis
+    })
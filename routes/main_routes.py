@@ -4,16 +4,38 @@ Main Routes Module
 Serves the main HTML templates for the dashboard.
 """
 
-from flask import Blueprint, render_template, current_app
+from functools import lru_cache
+
+from flask import Blueprint, render_template, current_app, make_response, request
 
 from app.config import Config
 
 main_bp = Blueprint('main', __name__)
 
+# The page templates only depend on constant Config values, so each page is
+# rendered once and then served from memory with an ETag
+PAGE_CACHE_CONTROL = 'public, max-age=3600'
 
-@main_bp.route('/')
-def index():
-    """Render the main dashboard page."""
+
+def _cached_page(html):
+    """
+    Build a cacheable response for a pre-rendered page.
+    
+    Args:
+        html: Rendered page HTML
+    
+    Returns:
+        Response with Cache-Control and ETag, or 304 if the client copy matches
+    """
+    response = make_response(html)
+    response.headers['Cache-Control'] = PAGE_CACHE_CONTROL
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@lru_cache(maxsize=1)
+def _render_index():
+    """Render the dashboard template once."""
     return render_template(
         'dashboard.html',
         title='Dashboard',
@@ -22,9 +44,9 @@ def index():
     )
 
 
-@main_bp.route('/forecast')
-def forecast():
-    """Render the forecast page."""
+@lru_cache(maxsize=1)
+def _render_forecast():
+    """Render the forecast template once."""
     return render_template(
         'forecast.html',
         title='Price Forecast',
@@ -34,9 +56,9 @@ def forecast():
     )
 
 
-@main_bp.route('/report')
-def report():
-    """Render the report page."""
+@lru_cache(maxsize=1)
+def _render_report():
+    """Render the report template once."""
     return render_template(
         'report.html',
         title='Analysis Report',
@@ -45,6 +67,24 @@ def report():
     )
 
 
+@main_bp.route('/')
+def index():
+    """Render the main dashboard page."""
+    return _cached_page(_render_index())
+
+
+@main_bp.route('/forecast')
+def forecast():
+    """Render the forecast page."""
+    return _cached_page(_render_forecast())
+
+
+@main_bp.route('/report')
+def report():
+    """Render the report page."""
+    return _cached_page(_render_report())
+
+
 @main_bp.route('/health')
 def health():
     """Health check endpoint."""
@@ -2,7 +2,8 @@
 Application Entry Point
 =======================
 Run this file to start the Flask development server.
-For production, use Gunicorn: gunicorn -w 4 "app:create_app()"
+For production, use Gunicorn: gunicorn -c gunicorn.conf.py "app:create_app()"
+(each worker builds its own app and model; TensorFlow is not fork-safe.)
 """
 
 import os
@@ -11,12 +12,14 @@ import sys
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import create_app
+from app import create_app, warmup
 
 # Create application instance
 app = create_app()
 
 if __name__ == '__main__':
+    warmup(app)
+    
     # Development server configuration
     host = os.environ.get('HOST', '127.0.0.1')
     port = int(os.environ.get('PORT', 5000))
@@ -4,17 +4,83 @@ Data Service Module
 Handles fetching and managing stock market data via yfinance.
 """
 
+import csv
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from functools import lru_cache, partial
+from typing import Optional, Dict, Any, Callable, List, Tuple
 
 import pandas as pd
 import numpy as np
+import requests
 import yfinance as yf
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import Config
+from utils.errors import UpstreamError, UserError
+from utils.ticker_index import TickerIndex
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _load_ticker_table(path: str) -> Dict[str, Dict[str, str]]:
+    """
+    Load the bundled ticker reference table (once per process).
+    
+    Args:
+        path: CSV file with ticker, name, sector and exchange columns
+    
+    Returns:
+        Dictionary of ticker -> {'name', 'sector', 'exchange'}, in file order
+    """
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            return {
+                row.pop('ticker').upper(): row
+                for row in csv.DictReader(f)
+            }
+    except OSError as e:
+        logger.warning("Could not load ticker table from %s: %s", path, e)
+        return {}
+
+
+@lru_cache(maxsize=1)
+def _from_yahoo(fetch: Callable[[], Any], ticker: str) -> Any:
+    """Run a yfinance call, reporting any provider failure as UpstreamError."""
+    try:
+        return fetch()
+    except Exception as e:
+        raise UpstreamError(f"Market data provider unavailable for {ticker}") from e
+
+
+def _market_status(timestamp: int) -> Dict[str, Any]:
+    """Build the market status for a whole-second Unix timestamp."""
+    now = datetime.fromtimestamp(timestamp)
+    
+    # Simple market hours check (NYSE hours in EST)
+    market_open = now.replace(hour=9, minute=30, second=0)
+    market_close = now.replace(hour=16, minute=0, second=0)
+    
+    is_weekday = now.weekday() < 5
+    is_market_hours = market_open <= now <= market_close
+    
+    return {
+        'is_open': is_weekday and is_market_hours,
+        'current_time': now.isoformat(),
+        'market_open': '09:30 EST',
+        'market_close': '16:00 EST',
+        'day_of_week': now.strftime('%A')
+    }
+
+
 class DataService:
     """Service for fetching and managing stock market data."""
     
@@ -26,11 +92,46 @@ class DataService:
         'MCD', 'CSCO', 'ACN', 'ABT', 'LLY', 'DHR', 'TXN', 'NEE'
     ]
     
+    # Maximum symbols per bulk Yahoo download
+    BATCH_CHUNK_SIZE = 20
+    
+    # Maximum concurrent per-ticker requests
+    MAX_FETCH_WORKERS = 16
+    
     def __init__(self):
         """Initialize the data service."""
-        self._cache = {}
-        self._cache_ttl = 300  # 5 minutes cache
+        self._cache_ttl = Config.DATA_CACHE_TTL
+        
+        # Bounded in-memory cache; TTLCache is not thread-safe on its own
+        self._cache = TTLCache(maxsize=Config.DATA_CACHE_SIZE, ttl=self._cache_ttl)
+        self._cache_lock = threading.Lock()
         
+        # Optional on-disk layer so restarts don't refetch everything
+        self._disk_cache = self._open_disk_cache()
+        
+        # Static names/sectors so name lookups don't need a Yahoo request
+        self._names = _load_ticker_table(str(Config.TICKERS_PATH))
+        if not self._names:
+            self._names = {t: {'name': t} for t in self.POPULAR_TICKERS}
+        self._ticker_index = TickerIndex({t: info['name'] for t, info in self._names.items()})
+        
+        # One pooled HTTP session for all yfinance calls so that repeated
+        # fetches reuse open TLS connections instead of reconnecting.
+        # It must stay a plain Session: yfinance rejects response-caching
+        # sessions (requests_cache), so caching happens on parsed frames above
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+        
+        # Worker pool for fanning out per-ticker quote/info requests
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_FETCH_WORKERS,
+            thread_name_prefix='yf-fetch'
+        )
+    
     def fetch_stock_data(
         self,
         ticker: str,
@@ -46,76 +147,209 @@ class DataService:
             include_all_columns: Whether to include volume and adjusted close
             
         Returns:
-            DataFrame with OHLC data
+            DataFrame with OHLC data. The frame is shared with the cache,
+            so callers must copy it before modifying it.
         """
         try:
             ticker = ticker.upper().strip()
             
             # Check cache
             cache_key = f"{ticker}_{period_days}"
-            if cache_key in self._cache:
-                cached_data, timestamp = self._cache[cache_key]
-                if (datetime.now() - timestamp).seconds < self._cache_ttl:
-                    logger.info(f"Returning cached data for {ticker}")
-                    return cached_data.copy()
+            cached_data = self._get_cached(cache_key)
+            if cached_data is not None:
+                logger.info("Returning cached data for %s", ticker)
+                return cached_data
             
             # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=period_days + 30)  # Extra buffer
+            start_date, end_date = self._date_range(period_days)
             
-            logger.info(f"Fetching data for {ticker} from {start_date} to {end_date}")
+            logger.info("Fetching data for %s from %s to %s", ticker, start_date, end_date)
             
             # Fetch data
-            stock = yf.Ticker(ticker)
-            data = stock.history(start=start_date, end=end_date)
+            stock = yf.Ticker(ticker, session=self._session)
+            data = _from_yahoo(partial(stock.history, start=start_date, end=end_date), ticker)
             
             if data.empty:
-                raise ValueError(f"No data found for ticker: {ticker}")
-            
-            # Select columns
-            if include_all_columns:
-                columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            else:
-                columns = ['Open', 'High', 'Low', 'Close']
+                raise UserError(f"No data found for ticker: {ticker}")
             
-            data = data[columns].copy()
-            data.dropna(inplace=True)
-            
-            # Ensure datetime index
-            data.index = pd.to_datetime(data.index)
+            data = self._prepare_frame(data, include_all_columns)
             
             # Cache the data
-            self._cache[cache_key] = (data.copy(), datetime.now())
+            self._store_cached(cache_key, data)
             
-            logger.info(f"Fetched {len(data)} rows for {ticker}")
+            logger.info("Fetched %s rows for %s", len(data), ticker)
             return data
             
         except Exception as e:
-            logger.error(f"Error fetching data for {ticker}: {e}")
+            logger.error("Error fetching data for %s: %s", ticker, e)
             raise
     
-    def get_latest_price(self, ticker: str) -> Dict[str, Any]:
+    def fetch_stock_data_batch(
+        self,
+        tickers: List[str],
+        period_days: int = 365,
+        include_all_columns: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch historical data for several tickers with as few requests as possible.
+        
+        Uncached tickers are downloaded together, up to BATCH_CHUNK_SIZE
+        symbols per Yahoo request.
+        
+        Args:
+            tickers: Stock ticker symbols
+            period_days: Number of days of historical data
+            include_all_columns: Whether to include volume
+            
+        Returns:
+            Dictionary of ticker -> DataFrame with OHLC data; tickers with
+            no data are omitted
+        """
+        tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+        
+        # A single symbol gains nothing from the bulk endpoint
+        if len(tickers) == 1:
+            return {tickers[0]: self.fetch_stock_data(tickers[0], period_days, include_all_columns)}
+        
+        results = {}
+        pending = []
+        for ticker in tickers:
+            cached_data = self._get_cached(f"{ticker}_{period_days}")
+            if cached_data is not None:
+                results[ticker] = cached_data
+            else:
+                pending.append(ticker)
+        
+        start_date, end_date = self._date_range(period_days)
+        
+        for i in range(0, len(pending), self.BATCH_CHUNK_SIZE):
+            chunk = pending[i:i + self.BATCH_CHUNK_SIZE]
+            logger.info("Fetching data for %s tickers in one request", len(chunk))
+            
+            raw = yf.download(
+                ' '.join(chunk),
+                start=start_date,
+                end=end_date,
+                group_by='ticker',
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+                session=self._session
+            )
+            
+            for ticker in chunk:
+                if isinstance(raw.columns, pd.MultiIndex):
+                    if ticker not in raw.columns.get_level_values(0):
+                        logger.warning("No data found for ticker: %s", ticker)
+                        continue
+                    frame = raw.xs(ticker, axis=1, level=0)
+                else:
+                    frame = raw
+                
+                data = self._prepare_frame(frame, include_all_columns)
+                if data.empty:
+                    logger.warning("No data found for ticker: %s", ticker)
+                    continue
+                
+                self._store_cached(f"{ticker}_{period_days}", data)
+                results[ticker] = data
+        
+        return results
+    
+    def _open_disk_cache(self):
+        """Open the persistent cache if diskcache is installed and enabled."""
+        if not Config.DATA_CACHE_DIR:
+            return None
+        try:
+            import diskcache
+        except ImportError:
+            logger.info("diskcache not installed, using in-memory data cache only")
+            return None
+        return diskcache.Cache(str(Config.DATA_CACHE_DIR))
+    
+    def _get_cached(self, cache_key: str) -> Optional[pd.DataFrame]:
+        """
+        Return a cached frame if it is still fresh (memory first, then disk).
+        
+        Cached frames are shared, not copied; callers must not modify them
+        in place.
+        """
+        with self._cache_lock:
+            data = self._cache.get(cache_key)
+        if data is not None or self._disk_cache is None:
+            return data
+        
+        data = self._disk_cache.get(cache_key)
+        if data is not None:
+            with self._cache_lock:
+                self._cache[cache_key] = data
+        return data
+    
+    def _store_cached(self, cache_key: str, data: pd.DataFrame) -> None:
+        """Store a freshly fetched frame in the memory and disk caches."""
+        with self._cache_lock:
+            self._cache[cache_key] = data
+        if self._disk_cache is not None:
+            self._disk_cache.set(cache_key, data, expire=self._cache_ttl)
+    
+    @staticmethod
+    def _date_range(period_days: int) -> Tuple[datetime, datetime]:
+        """Return (start, end) covering period_days plus a small buffer."""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=period_days + 30)  # Extra buffer
+        return start_date, end_date
+    
+    @staticmethod
+    def _prepare_frame(data: pd.DataFrame, include_all_columns: bool) -> pd.DataFrame:
+        """Select price columns, drop missing rows, fix dtypes and normalize the index."""
+        # Select columns
+        if include_all_columns:
+            columns = PRICE_COLUMNS + ['Volume']
+        else:
+            columns = PRICE_COLUMNS
+        
+        data = data[columns].dropna()
+        
+        # Prices stay float64: float32 loses cents above ~131k (e.g. BRK-A),
+        # and reports/metrics read these values. Only the model input arrays
+        # are cast to float32, in preprocessing. All columns are cast in one
+        # pass so the frame is only copied once more.
+        dtypes = dict.fromkeys(PRICE_COLUMNS, np.float64)
+        if include_all_columns:
+            # One fixed dtype, so the schema does not vary per ticker or window
+            dtypes['Volume'] = np.int64
+        data = data.astype(dtypes)
+        
+        # Ensure datetime index (yfinance normally returns one already)
+        if not isinstance(data.index, pd.DatetimeIndex):
+            data.index = pd.to_datetime(data.index)
+        return data
+    
+    def get_latest_price(self, ticker: str, live_info: bool = True) -> Dict[str, Any]:
         """
         Get the latest price information for a stock.
         
         Args:
             ticker: Stock ticker symbol
+            live_info: Also scrape Yahoo's info page for market cap and
+                currency; when False the name comes from the bundled table
             
         Returns:
             Dictionary with latest price data
         """
         try:
             ticker = ticker.upper().strip()
-            stock = yf.Ticker(ticker)
+            stock = yf.Ticker(ticker, session=self._session)
             
-            # Get current info
-            info = stock.info
+            # Get current info (a separate, slow request)
+            info = _from_yahoo(lambda: stock.info, ticker) if live_info else {}
+            static = self._names.get(ticker, {})
             
             # Get recent history for additional details
-            history = stock.history(period='5d')
+            history = _from_yahoo(partial(stock.history, period='5d'), ticker)
             
             if history.empty:
-                raise ValueError(f"No recent data for {ticker}")
+                raise UserError(f"No recent data for {ticker}")
             
             latest = history.iloc[-1]
             previous = history.iloc[-2] if len(history) > 1 else latest
@@ -125,7 +359,7 @@ class DataService:
             
             return {
                 'ticker': ticker,
-                'name': info.get('shortName', ticker),
+                'name': info.get('shortName') or static.get('name', ticker),
                 'current_price': round(float(latest['Close']), 2),
                 'open': round(float(latest['Open']), 2),
                 'high': round(float(latest['High']), 2),
@@ -140,9 +374,44 @@ class DataService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting latest price for {ticker}: {e}")
+            logger.error("Error getting latest price for %s: %s", ticker, e)
             raise
     
+    def get_latest_prices(
+        self,
+        tickers: List[str],
+        live_info: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest price information for several stocks concurrently.
+        
+        Args:
+            tickers: Stock ticker symbols
+            live_info: See get_latest_price
+            
+        Returns:
+            Dictionary of ticker -> latest price data, or {'error': message}
+            for tickers that failed
+        """
+        return self._map_tickers(partial(self.get_latest_price, live_info=live_info), tickers)
+    
+    def get_static_info(self, ticker: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a ticker's name, sector and exchange in the bundled table.
+        
+        Args:
+            ticker: Stock ticker symbol
+        
+        Returns:
+            Dictionary with ticker, name, sector and exchange, or None if
+            the ticker is not in the table
+        """
+        ticker = ticker.upper().strip()
+        static = self._names.get(ticker)
+        if static is None:
+            return None
+        return {'ticker': ticker, **static}
+    
     def get_stock_info(self, ticker: str) -> Dict[str, Any]:
         """
         Get detailed stock information.
@@ -155,8 +424,8 @@ class DataService:
         """
         try:
             ticker = ticker.upper().strip()
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            stock = yf.Ticker(ticker, session=self._session)
+            info = _from_yahoo(lambda: stock.info, ticker)
             
             return {
                 'ticker': ticker,
@@ -176,9 +445,38 @@ class DataService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting stock info for {ticker}: {e}")
+            logger.error("Error getting stock info for %s: %s", ticker, e)
             raise
     
+    def get_stock_infos(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed information for several stocks concurrently.
+        
+        Args:
+            tickers: Stock ticker symbols
+            
+        Returns:
+            Dictionary of ticker -> stock information, or {'error': message}
+            for tickers that failed
+        """
+        return self._map_tickers(self.get_stock_info, tickers)
+    
+    def _map_tickers(
+        self,
+        fetch: Callable[[str], Dict[str, Any]],
+        tickers: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run a per-ticker fetch on the worker pool, keeping errors per ticker."""
+        futures = {t: self._executor.submit(fetch, t) for t in dict.fromkeys(tickers)}
+        
+        results = {}
+        for ticker, future in futures.items():
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                results[ticker] = {'error': str(e)}
+        return results
+    
     def validate_ticker(self, ticker: str) -> Tuple[bool, str]:
         """
         Validate if a ticker symbol exists.
@@ -195,7 +493,7 @@ class DataService:
             if not ticker or len(ticker) > 10:
                 return False, "Invalid ticker format"
             
-            stock = yf.Ticker(ticker)
+            stock = yf.Ticker(ticker, session=self._session)
             history = stock.history(period='5d')
             
             if history.empty:
@@ -219,14 +517,11 @@ class DataService:
         """
         query = query.upper().strip()
         
-        # Simple search from popular tickers
-        matches = [
-            {'ticker': t, 'name': t}
-            for t in self.POPULAR_TICKERS
-            if query in t
-        ][:limit]
-        
-        return matches
+        # Substring match on symbols and company names via the suffix index
+        return [
+            {'ticker': t, 'name': self._names[t]['name']}
+            for t in self._ticker_index.search(query, limit)
+        ]
     
     def get_market_status(self) -> Dict[str, Any]:
         """
@@ -235,24 +530,13 @@ class DataService:
         Returns:
             Dictionary with market status info
         """
-        now = datetime.now()
-        
-        # Simple market hours check (NYSE hours in EST)
-        market_open = now.replace(hour=9, minute=30, second=0)
-        market_close = now.replace(hour=16, minute=0, second=0)
-        
-        is_weekday = now.weekday() < 5
-        is_market_hours = market_open <= now <= market_close
-        
-        return {
-            'is_open': is_weekday and is_market_hours,
-            'current_time': now.isoformat(),
-            'market_open': '09:30 EST',
-            'market_close': '16:00 EST',
-            'day_of_week': now.strftime('%A')
-        }
+        # Status only changes on minute boundaries; recompute at most once a second
+        return _market_status(int(time.time()))
     
     def clear_cache(self):
         """Clear the data cache."""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
         logger.info("Data cache cleared")
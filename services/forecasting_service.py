@@ -6,17 +6,23 @@ Handles single-step and multi-step recursive forecasting.
 """
 
 import logging
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import numpy as np
 import pandas as pd
 import tensorflow as tf
+from cachetools import TTLCache
+from sklearn.preprocessing import MinMaxScaler
 
 from app.config import Config
 from services.preprocessing_service import PreprocessingService
 from services.data_service import DataService
+from utils.errors import UserError
+from utils.metrics import calculate_forecast_metrics
+from utils.numpy_lstm import NumpyLSTM
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +36,8 @@ class ForecastingService:
     def __init__(
         self,
         model_path: Optional[Path] = None,
-        scaler_path: Optional[Path] = None
+        scaler_path: Optional[Path] = None,
+        data_service: Optional[DataService] = None
     ):
         """
         Initialize the forecasting service.
@@ -38,6 +45,7 @@ class ForecastingService:
         Args:
             model_path: Path to trained Keras model
             scaler_path: Path to saved scaler
+            data_service: Shared DataService (a private one is created if omitted)
         """
         self.model_path = model_path or Config.MODEL_PATH
         self.scaler_path = scaler_path or Config.SCALER_PATH
@@ -46,20 +54,41 @@ class ForecastingService:
         self.confidence_level = Config.CONFIDENCE_LEVEL
         
         # Initialize services
-        self.data_service = DataService()
+        self.data_service = data_service or DataService()
         self.preprocessing = PreprocessingService(
             window_size=self.window_size,
             features=self.features,
             scaler_path=self.scaler_path
         )
         
+        # The shared preprocessing scaler is refit per request, so
+        # fit/transform/inverse sequences must not interleave across threads
+        self._lock = threading.Lock()
+        
         # Load model
+        if Config.ENABLE_XLA:
+            tf.config.optimizer.set_jit(True)
         self.model = None
+        self._tflite = None
+        self._numpy_lstm = None
         self._load_model()
         
+        # Compile the recursive forecast loop once for any batch size
+        self._rollout = tf.function(
+            self._rollout_steps,
+            input_signature=[
+                tf.TensorSpec((None, self.window_size, len(self.features)), tf.float32),
+                tf.TensorSpec((), tf.int32)
+            ]
+        )
+        
         # Residual standard deviation for confidence intervals
         self._residual_std = None
         
+        # Volatility estimates keyed by data snapshot, shared across horizons
+        self._std_cache = TTLCache(maxsize=128, ttl=Config.DATA_CACHE_TTL)
+        self._std_cache_lock = threading.Lock()
+        
     def _load_model(self) -> None:
         """Load the trained LSTM model."""
         try:
@@ -67,16 +96,154 @@ class ForecastingService:
                 raise FileNotFoundError(f"Model not found at {self.model_path}")
             
             self.model = tf.keras.models.load_model(self.model_path)
-            logger.info(f"Model loaded from {self.model_path}")
+            logger.info("Model loaded from %s", self.model_path)
             
             # Log model summary
-            logger.info(f"Model input shape: {self.model.input_shape}")
-            logger.info(f"Model output shape: {self.model.output_shape}")
+            logger.info("Model input shape: %s", self.model.input_shape)
+            logger.info("Model output shape: %s", self.model.output_shape)
+            
+            # Plain stacked LSTMs roll out faster as NumPy matmuls than via TF dispatch
+            if self.model.output_shape[-1] == len(self.features):
+                self._numpy_lstm = NumpyLSTM.from_keras(self.model)
+                if self._numpy_lstm is not None:
+                    logger.info("Using NumPy LSTM for recursive forecasts")
             
+            if Config.ENABLE_TFLITE:
+                self._load_tflite()
+        
         except Exception as e:
-            logger.error(f"Error loading model: {e}")
+            logger.error("Error loading model: %s", e)
             raise
     
+    def _load_tflite(self) -> None:
+        """
+        Build a dynamic-range int8 TFLite interpreter for single-sample inference.
+        
+        The converted flatbuffer is cached next to the Keras model and only
+        rebuilt when the model file is newer. Failures fall back to Keras.
+        """
+        model_path = Path(self.model_path)
+        tflite_path = model_path.with_suffix('.tflite')
+        
+        try:
+            if tflite_path.exists() and tflite_path.stat().st_mtime >= model_path.stat().st_mtime:
+                content = tflite_path.read_bytes()
+            else:
+                # A fixed batch of one lets the LSTM lower to builtin TFLite ops
+                inputs = tf.keras.Input((self.window_size, len(self.features)), batch_size=1)
+                single = tf.keras.Model(inputs, self.model(inputs))
+                converter = tf.lite.TFLiteConverter.from_keras_model(single)
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                content = converter.convert()
+                tflite_path.write_bytes(content)
+                logger.info("TFLite model written to %s", tflite_path)
+            
+            try:
+                from ai_edge_litert.interpreter import Interpreter
+            except ImportError:
+                Interpreter = tf.lite.Interpreter  # Deprecated in newer TF releases
+            
+            interpreter = Interpreter(model_content=content)
+            interpreter.allocate_tensors()
+            self._tflite = interpreter
+            logger.info("Using quantized TFLite model for inference")
+        
+        except Exception as e:
+            logger.warning("TFLite conversion failed, using Keras model: %s", e)
+            self._tflite = None
+    
+    def _tflite_predict(self, X_input: np.ndarray) -> np.ndarray:
+        """
+        Run one (1, window_size, num_features) input through the TFLite model.
+        
+        The interpreter is not thread-safe; callers must hold self._lock.
+        
+        Args:
+            X_input: Scaled input window
+        
+        Returns:
+            Scaled prediction shaped (1, num_features)
+        """
+        interpreter = self._tflite
+        interpreter.set_tensor(
+            interpreter.get_input_details()[0]['index'],
+            X_input.astype(np.float32, copy=False)
+        )
+        interpreter.invoke()
+        return interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+    
+    def _rollout_tflite(self, X_input: np.ndarray, horizon: int) -> np.ndarray:
+        """
+        Recursive forecast through the TFLite model (see _rollout_steps).
+        
+        Args:
+            X_input: Scaled window shaped (1, window_size, num_features)
+            horizon: Number of steps to predict
+        
+        Returns:
+            Scaled predictions shaped (1, horizon, num_features)
+        """
+        buffer, head = self.preprocessing.make_sequence_buffer(X_input[0].astype(np.float32))
+        sequence = buffer[:self.window_size]
+        preds = np.empty((1, horizon, buffer.shape[-1]), dtype=np.float32)
+        for i in range(horizon):
+            step = self._tflite_predict(sequence[np.newaxis])
+            preds[:, i] = step
+            sequence, head = self.preprocessing.update_sequence_with_prediction(buffer, head, step)
+        return preds
+    
+    def _rollout_array(self, X: np.ndarray, horizon: int) -> np.ndarray:
+        """
+        Recursive forecast on the fastest available backend.
+        
+        Args:
+            X: Scaled windows shaped (batch, window_size, num_features)
+            horizon: Number of steps to predict
+        
+        Returns:
+            Scaled predictions shaped (batch, horizon, num_features)
+        """
+        if self._numpy_lstm is not None:
+            return self._numpy_lstm.rollout(X, horizon)
+        return self._rollout(X, horizon).numpy()
+    
+    def _rollout_steps(self, sequences: tf.Tensor, horizon: tf.Tensor) -> tf.Tensor:
+        """
+        Recursively predict horizon steps, feeding each prediction back in.
+        
+        Runs as a single TensorFlow graph (see __init__), so the loop
+        does not go back through Python between steps.
+        
+        Args:
+            sequences: Scaled windows shaped (batch, window_size, num_features)
+            horizon: Number of steps to predict
+        
+        Returns:
+            Scaled predictions shaped (batch, horizon, num_features)
+        """
+        outputs = tf.TensorArray(tf.float32, size=horizon)
+        for i in tf.range(horizon):
+            pred = self.model(sequences, training=False)
+            outputs = outputs.write(i, pred)
+            sequences = tf.concat([sequences[:, 1:, :], tf.expand_dims(pred, 1)], axis=1)
+        return tf.transpose(outputs.stack(), [1, 0, 2])
+    
+    def warmup(self) -> None:
+        """
+        Run one dummy forecast through each inference path in use so the
+        first real request does not pay for tracing or kernel selection.
+        
+        Call it in the process that serves requests (see app.warmup), never
+        before a fork: TensorFlow state does not survive fork.
+        """
+        dummy = np.zeros((1, self.window_size, len(self.features)), dtype=np.float32)
+        self.model(dummy, training=False)
+        if self._numpy_lstm is None:
+            self._rollout(dummy, 1)
+        if self._tflite is not None:
+            self._tflite_predict(dummy)
+        logger.info("Model warmed up")
+    
     def predict_next_day(
         self,
         ticker: str,
@@ -100,29 +267,38 @@ class ForecastingService:
                     period_days=self.window_size + 60
                 )
             
-            # Fit scaler on the data
-            self.preprocessing.fit_scaler(data)
-            
-            # Prepare input
-            X_input = self.preprocessing.prepare_prediction_input(data)
-            
-            # Make prediction
-            prediction_scaled = self.model.predict(X_input, verbose=0)
+            with self._lock:
+                # Fit scaler on the data
+                self.preprocessing.fit_scaler(data)
+                
+                # Prepare input
+                X_input = self.preprocessing.prepare_prediction_input(data)
+                
+                # Direct call skips predict()'s per-call loop setup for a batch of one
+                if self._tflite is not None:
+                    prediction_scaled = self._tflite_predict(X_input)
+                else:
+                    prediction_scaled = self.model(
+                        tf.constant(X_input, dtype=tf.float32),
+                        training=False
+                    ).numpy()
+                
+                # Inverse transform to get actual values (output is always (1, num_features))
+                prediction = self.preprocessing.inverse_transform(prediction_scaled)
             
-            # Inverse transform to get actual values
-            prediction = self.preprocessing.inverse_transform(prediction_scaled)[0]
-            predicted_close = float(prediction[0]) if len(prediction.shape) > 0 else float(prediction)
+            predicted_close = float(prediction[0, 0])
             
-            # Get latest actual values for comparison
-            latest = data.iloc[-1]
-            latest_close = float(latest['Close'])
+            # Get latest actual values for comparison (array access avoids
+            # building a row Series)
+            latest_close = float(data['Close'].to_numpy()[-1])
+            latest_date = data.index[-1]
             
             # Calculate confidence interval (using estimated residual std)
             std_estimate = self._estimate_residual_std(data)
             
             result = {
                 'ticker': ticker,
-                'prediction_date': self._get_next_business_day(data.index[-1]).isoformat(),
+                'prediction_date': self._get_next_business_day(latest_date).isoformat(),
                 'predicted': {
                     'close': round(predicted_close, 2)
                 },
@@ -131,7 +307,7 @@ class ForecastingService:
                     'close_upper': round(predicted_close + self.confidence_level * std_estimate, 2)
                 },
                 'latest_actual': {
-                    'date': data.index[-1].isoformat(),
+                    'date': latest_date.isoformat(),
                     'close': round(latest_close, 2)
                 },
                 'change_predicted': round(predicted_close - latest_close, 2),
@@ -144,7 +320,7 @@ class ForecastingService:
             return result
             
         except Exception as e:
-            logger.error(f"Error predicting for {ticker}: {e}")
+            logger.error("Error predicting for %s: %s", ticker, e)
             raise
     
     def forecast_multi_day(
@@ -175,90 +351,184 @@ class ForecastingService:
                     period_days=self.window_size + 100
                 )
             
-            # Fit scaler
-            self.preprocessing.fit_scaler(data)
-            
-            # Get initial sequence (last window_size days, scaled)
-            recent_data = data[self.features].iloc[-self.window_size:]
-            current_sequence = self.preprocessing.transform(recent_data)
-            
-            # Storage for predictions
-            predictions = []
-            prediction_dates = []
-            
-            # Get the last date in data
-            last_date = data.index[-1]
-            
-            # Recursive forecasting
-            for i in range(horizon):
-                # Reshape for model input
-                X_input = current_sequence.reshape(1, self.window_size, len(self.features))
-                
-                # Predict
-                pred_scaled = self.model.predict(X_input, verbose=0)
+            with self._lock:
+                # Fit scaler
+                self.preprocessing.fit_scaler(data)
                 
-                # Store prediction (inverse transform)
-                pred_actual = self.preprocessing.inverse_transform(pred_scaled)[0]
-                pred_close = float(pred_actual[0]) if len(pred_actual.shape) > 0 else float(pred_actual)
-                predictions.append(pred_close)
+                # Get initial sequence (last window_size days, scaled)
+                recent_data = data[self.features].to_numpy(dtype=np.float32)[-self.window_size:]
+                current_sequence = self.preprocessing.transform_arr(recent_data)
                 
-                # Calculate next business day
-                next_date = self._get_next_business_day(last_date, offset=i+1)
-                prediction_dates.append(next_date)
+                # Recursive forecasting in one graph call
+                X_input = current_sequence.reshape(1, self.window_size, len(self.features))
+                if self._tflite is not None:
+                    preds_scaled = self._rollout_tflite(X_input, horizon)[0]
+                else:
+                    preds_scaled = self._rollout_array(X_input, horizon)[0]
                 
-                # Update sequence for next iteration
-                current_sequence = self.preprocessing.update_sequence_with_prediction(
-                    current_sequence,
-                    pred_scaled[0]
-                )
+                # Inverse transform all steps at once
+                predictions = self.preprocessing.inverse_transform(preds_scaled)[:, 0]
             
-            # Calculate confidence intervals
-            std_estimate = self._estimate_residual_std(data)
+            return self._build_forecast_result(ticker, horizon, data, predictions)
             
-            # Build forecast table
-            forecast_table = []
-            for i, (pred, date) in enumerate(zip(predictions, prediction_dates)):
-                # Confidence bands widen with horizon
-                horizon_factor = np.sqrt(i + 1)  # Uncertainty grows with sqrt of time
-                ci_width = self.confidence_level * std_estimate * horizon_factor
-                
-                forecast_table.append({
-                    'day': i + 1,
-                    'date': date.strftime('%Y-%m-%d'),
-                    'close': round(pred, 2),
-                    'close_lower': round(pred - ci_width, 2),
-                    'close_upper': round(pred + ci_width, 2)
-                })
+        except Exception as e:
+            logger.error("Error in multi-day forecast for %s: %s", ticker, e)
+            raise
+    
+    def forecast_multi_day_batch(
+        self,
+        tickers: List[str],
+        horizon: int = 5,
+        data_map: Optional[Dict[str, pd.DataFrame]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate multi-day recursive forecasts for several tickers at once.
+        
+        Each ticker is scaled with its own scaler, but all windows are
+        stacked into one batch so the whole recursive rollout is one graph call.
+        
+        Args:
+            tickers: Stock ticker symbols
+            horizon: Number of days to forecast
+            data_map: Optional pre-fetched data keyed by ticker
             
-            # Calculate summary statistics
-            close_predictions = predictions
-            latest_close = float(data['Close'].iloc[-1])
+        Returns:
+            Dictionary keyed by ticker with forecast results, or
+            {'error': message} for tickers that could not be forecast
+        """
+        horizon = max(1, min(horizon, Config.MAX_FORECAST_HORIZON))
+        data_map = dict(data_map or {})
+        results = {}
+        
+        # Fetch missing histories with as few requests as possible
+        missing = [t for t in tickers if t not in data_map]
+        if missing:
+            try:
+                fetched = self.data_service.fetch_stock_data_batch(
+                    missing,
+                    period_days=self.window_size + 100
+                )
+            except Exception as e:
+                logger.error("Error fetching batch data: %s", e)
+                fetched = {}
+                fetch_error = str(e)
+            else:
+                fetch_error = None
+            for t in missing:
+                data = fetched.get(t.upper().strip())
+                if data is None:
+                    message = fetch_error or f"No data found for ticker: {t}"
+                    logger.error("Error in multi-day forecast for %s: %s", t, message)
+                    results[t] = {'error': message}
+                else:
+                    data_map[t] = data
+        
+        # Scale each ticker's last window with its own scaler
+        batch_tickers = []
+        scalers = []
+        windows = []
+        for t in tickers:
+            if t in results:
+                continue
+            data = data_map[t]
+            if len(data) < self.window_size:
+                results[t] = {
+                    'error': f"Insufficient data. Need at least {self.window_size} rows, got {len(data)}"
+                }
+                continue
+            values = data[self.features].to_numpy(dtype=np.float32)
+            scaler = MinMaxScaler(feature_range=(0, 1)).fit(values)
+            batch_tickers.append(t)
+            scalers.append(scaler)
+            windows.append(scaler.transform(values[-self.window_size:]))
+        
+        if not batch_tickers:
+            return results
+        
+        # (N, window_size, num_features) -> (N, horizon, num_features)
+        X = np.stack(windows).astype(np.float32, copy=False)
+        preds_scaled = self._rollout_array(X, horizon)
+        
+        for k, t in enumerate(batch_tickers):
+            predictions = scalers[k].inverse_transform(preds_scaled[k])[:, 0]
+            results[t] = self._build_forecast_result(t, horizon, data_map[t], predictions)
+        
+        return results
+    
+    def _build_forecast_result(
+        self,
+        ticker: str,
+        horizon: int,
+        data: pd.DataFrame,
+        predictions: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Build the forecast table and summary from recursive predictions.
+        
+        Bands and rounding are computed on whole arrays; rows are only
+        assembled from the finished columns.
+        
+        Args:
+            ticker: Stock ticker symbol
+            horizon: Number of days forecast
+            data: Historical data the forecast was made from
+            predictions: Predicted closes, one per forecast day
             
-            result = {
-                'ticker': ticker,
-                'horizon': horizon,
-                'forecast': forecast_table,
-                'summary': {
-                    'latest_close': round(latest_close, 2),
-                    'final_predicted_close': round(close_predictions[-1], 2),
-                    'total_change': round(close_predictions[-1] - latest_close, 2),
-                    'total_change_percent': round(
-                        (close_predictions[-1] - latest_close) / latest_close * 100, 2
-                    ),
-                    'max_predicted_close': round(max(predictions), 2),
-                    'min_predicted_close': round(min(predictions), 2),
-                    'avg_predicted_close': round(float(np.mean(close_predictions)), 2),
-                    'trend': 'Bullish' if close_predictions[-1] > latest_close else 'Bearish'
-                },
-                'confidence_level': f'{int((1 - (1 - 0.95)) * 100)}%',
-                'generated_at': datetime.now().isoformat()
+        Returns:
+            Dictionary with forecast results
+        """
+        # Calculate confidence intervals
+        std_estimate = self._estimate_residual_std(data)
+        
+        # Business days following the last date in data
+        dates = self._future_business_days(data.index[-1], len(predictions)).strftime('%Y-%m-%d')
+        
+        # Confidence bands widen with horizon
+        close_predictions = np.asarray(predictions, dtype=np.float64)
+        days = np.arange(1, len(close_predictions) + 1)
+        ci_width = self.confidence_level * std_estimate * np.sqrt(days)  # Uncertainty grows with sqrt of time
+        
+        # Build forecast table
+        forecast_table = [
+            {
+                'day': day,
+                'date': date,
+                'close': close,
+                'close_lower': lower,
+                'close_upper': upper
             }
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error in multi-day forecast for {ticker}: {e}")
-            raise
+            for day, date, close, lower, upper in zip(
+                days.tolist(),
+                dates,
+                np.round(close_predictions, 2).tolist(),
+                np.round(close_predictions - ci_width, 2).tolist(),
+                np.round(close_predictions + ci_width, 2).tolist()
+            )
+        ]
+        
+        # Calculate summary statistics
+        latest_close = float(data['Close'].to_numpy()[-1])
+        final_close = float(close_predictions[-1])
+        
+        return {
+            'ticker': ticker,
+            'horizon': horizon,
+            'forecast': forecast_table,
+            'summary': {
+                'latest_close': round(latest_close, 2),
+                'final_predicted_close': round(final_close, 2),
+                'total_change': round(final_close - latest_close, 2),
+                'total_change_percent': round(
+                    (final_close - latest_close) / latest_close * 100, 2
+                ),
+                'max_predicted_close': round(float(close_predictions.max()), 2),
+                'min_predicted_close': round(float(close_predictions.min()), 2),
+                'avg_predicted_close': round(float(close_predictions.mean()), 2),
+                'trend': 'Bullish' if final_close > latest_close else 'Bearish'
+            },
+            'confidence_level': f'{int((1 - (1 - 0.95)) * 100)}%',
+            'generated_at': datetime.now().isoformat()
+        }
     
     def _estimate_residual_std(self, data: pd.DataFrame) -> float:
         """
@@ -275,16 +545,27 @@ class ForecastingService:
         if self._residual_std is not None:
             return self._residual_std
         
+        close = data['Close'].to_numpy(dtype=np.float64)
+        if len(close) < 3:
+            return float('nan')
+        
+        # The same fetched frame is reused across requests until the data cache expires
+        key = (len(close), data.index[0], data.index[-1], close[0], close[-1])
+        with self._std_cache_lock:
+            cached = self._std_cache.get(key)
+        if cached is not None:
+            return cached
+        
         # Use recent price volatility as estimate
-        returns = data['Close'].pct_change().dropna()
-        daily_volatility = returns.std()
+        returns = np.diff(close) / close[:-1]
+        daily_volatility = returns.std(ddof=1)
         
-        # Convert to price standard deviation
-        recent_price = data['Close'].iloc[-1]
-        price_std = daily_volatility * recent_price
+        # Convert to price standard deviation, plus a small buffer for model uncertainty
+        price_std = float(daily_volatility * close[-1] * 1.5)
         
-        # Add a small buffer for model uncertainty
-        return price_std * 1.5
+        with self._std_cache_lock:
+            self._std_cache[key] = price_std
+        return price_std
     
     def _get_next_business_day(
         self,
@@ -301,15 +582,26 @@ class ForecastingService:
         Returns:
             Next business day
         """
-        current = pd.Timestamp(from_date)
-        days_added = 0
+        return self._future_business_days(from_date, offset)[-1].to_pydatetime()
+    
+    @staticmethod
+    def _future_business_days(from_date: pd.Timestamp, count: int) -> pd.DatetimeIndex:
+        """
+        Get the next count business days (Mon-Fri) after a date.
         
-        while days_added < offset:
-            current += timedelta(days=1)
-            if current.weekday() < 5:  # Monday = 0, Friday = 4
-                days_added += 1
+        Args:
+            from_date: Starting date (time of day and timezone are kept)
+            count: Number of business days to return
         
-        return current.to_pydatetime()
+        Returns:
+            DatetimeIndex of the following business days
+        """
+        start = pd.Timestamp(from_date)
+        base = np.datetime64(start.date(), 'D')
+        
+        # Rolling a weekend start back to Friday makes offset 1 the next weekday
+        days = np.busday_offset(base, np.arange(1, count + 1), roll='backward')
+        return start + pd.to_timedelta(days - base)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model."""
@@ -349,51 +641,38 @@ class ForecastingService:
             train_data = data.iloc[:split_idx]
             test_data = data.iloc[split_idx:]
             
-            # Fit scaler on training data
-            self.preprocessing.fit_scaler(train_data)
-            
-            # Scale all data
-            train_scaled = self.preprocessing.transform(train_data)
-            test_scaled = self.preprocessing.transform(test_data)
-            
-            # Create test sequences
-            X_test, y_test = self.preprocessing.create_sequences(test_scaled)
-            
-            if len(X_test) < 10:
-                raise ValueError("Insufficient test data")
-            
-            # Make predictions
-            predictions_scaled = self.model.predict(X_test, verbose=0)
-            
-            # Inverse transform
-            predictions = self.preprocessing.inverse_transform(predictions_scaled)
-            actuals = self.preprocessing.inverse_transform(y_test)
+            with self._lock:
+                # Fit scaler on training data
+                self.preprocessing.fit_scaler(train_data)
+                
+                # Scale all data
+                train_scaled = self.preprocessing.transform(train_data)
+                test_scaled = self.preprocessing.transform(test_data)
+                
+                # Create test sequences
+                X_test, y_test = self.preprocessing.create_sequences(test_scaled)
+                
+                if len(X_test) < 10:
+                    raise UserError("Insufficient test data")
+                
+                # Make predictions
+                predictions_scaled = self.model.predict(X_test, verbose=0)
+                
+                # Inverse transform
+                predictions = self.preprocessing.inverse_transform(predictions_scaled)
+                actuals = self.preprocessing.inverse_transform(y_test)
             
             # Extract Close price (single feature model)
             close_pred = predictions.flatten()
             close_actual = actuals.flatten()
             
-            # RMSE
-            rmse = float(np.sqrt(np.mean((close_actual - close_pred) ** 2)))
-            
-            # MAE
-            mae = float(np.mean(np.abs(close_actual - close_pred)))
-            
-            # MAPE
-            mape = float(np.mean(np.abs((close_actual - close_pred) / close_actual)) * 100)
-            
-            # Naive baseline RMSE (persistence model)
-            naive_pred = close_actual[:-1]
-            naive_actual = close_actual[1:]
-            naive_rmse = float(np.sqrt(np.mean((naive_actual - naive_pred) ** 2)))
-            
-            # Directional accuracy
-            pred_direction = np.sign(close_pred[1:] - close_pred[:-1])
-            actual_direction = np.sign(close_actual[1:] - close_actual[:-1])
-            directional_accuracy = float(np.mean(pred_direction == actual_direction) * 100)
+            # RMSE, MAE, MAPE, naive (persistence) RMSE and directional accuracy
+            rmse, mae, mape, naive_rmse, directional_accuracy, residual_std = (
+                calculate_forecast_metrics(close_actual, close_pred)
+            )
             
             # Store residual std for confidence intervals
-            self._residual_std = float(np.std(close_actual - close_pred))
+            self._residual_std = residual_std
             
             return {
                 'ticker': ticker,
@@ -414,7 +693,7 @@ class ForecastingService:
             }
             
         except Exception as e:
-            logger.error(f"Error calculating metrics: {e}")
+            logger.error("Error calculating metrics: %s", e)
             raise
     
     def _interpret_skill_score(self, skill_score: float) -> str:
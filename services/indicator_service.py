@@ -4,16 +4,161 @@ Indicator Service Module
 Calculates technical indicators for stock analysis.
 """
 
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Optional
 
 import numpy as np
 import pandas as pd
 
 from app.config import Config
+from utils.fast_ewm import ewm_adjust_false, rsi_wilder, span_to_alpha
+from utils.metrics import linear_percentile
+from utils.rolling import rolling_mean, rolling_mean_std, rolling_std
 
 logger = logging.getLogger(__name__)
 
+# Columns added by calculate_all_indicators, in output order
+INDICATOR_COLUMNS = [
+    'MA20', 'MA50', 'Return', 'Volatility', 'Volatility_Annual', 'RSI',
+    'BB_Middle', 'BB_Upper', 'BB_Lower',
+    'EMA12', 'EMA26', 'MACD', 'MACD_Signal', 'MACD_Histogram'
+]
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Per-call constants, computed once
+TRADING_DAYS = 252
+ANNUALIZE_VOL = math.sqrt(TRADING_DAYS)
+MACD_ALPHAS = (span_to_alpha(12), span_to_alpha(26), span_to_alpha(9))  # fast, slow, signal
+
+# Indicator series sent to the chart: (column, multiplier, fill for NaN)
+CHART_SERIES = [
+    ('MA20', 1, 0), ('MA50', 1, 0),
+    ('BB_Upper', 1, 0), ('BB_Middle', 1, 0), ('BB_Lower', 1, 0),
+    ('Volatility', 100, 0), ('Return', 100, 0), ('RSI', 1, 50)
+]
+
+
+@lru_cache(maxsize=64)
+def _indicator_block(
+    close_bytes: bytes,
+    ma_short: int,
+    ma_long: int,
+    volatility_window: int,
+    cache_dir: str = ''
+) -> np.ndarray:
+    """
+    Compute (and memoize) every indicator column for one series of closes.
+    
+    Keyed on the raw bytes of the float64 closes, so the route that calls
+    calculate_all_indicators and then get_chart_data on the same history
+    (or two requests for the same ticker) compute it only once. With a
+    cache_dir, blocks also persist as .npy files and are memory-mapped back
+    in, so repeated backtests over the same histories skip the computation
+    across processes.
+    
+    Args:
+        close_bytes: float64 closing prices as bytes
+        ma_short: Short moving-average window
+        ma_long: Long moving-average window
+        volatility_window: Rolling volatility window
+        cache_dir: Directory for persisted blocks ('' disables)
+    
+    Returns:
+        Read-only array shaped (len(closes), len(INDICATOR_COLUMNS))
+    """
+    path = None
+    if cache_dir:
+        key = close_bytes + repr((ma_short, ma_long, volatility_window, INDICATOR_COLUMNS)).encode()
+        path = Path(cache_dir) / f"{hashlib.blake2b(key, digest_size=16).hexdigest()}.npy"
+        if path.exists():
+            try:
+                return np.load(path, mmap_mode='r')
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable indicator cache %s: %s", path, e)
+    
+    out = _compute_indicators(np.frombuffer(close_bytes, dtype=np.float64), ma_short, ma_long, volatility_window)
+    out.setflags(write=False)
+    
+    if path is not None:
+        _save_block(path, out)
+    return out
+
+
+def _save_block(path: Path, block: np.ndarray) -> None:
+    """Write an indicator block atomically, so readers never map a partial file."""
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            np.save(f, block)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not persist indicator cache %s: %s", path, e)
+        tmp.unlink(missing_ok=True)
+
+
+def _compute_indicators(
+    close: np.ndarray,
+    ma_short: int,
+    ma_long: int,
+    volatility_window: int
+) -> np.ndarray:
+    """
+    Compute every indicator for one series or a (days, symbols) matrix of closes.
+    
+    Args:
+        close: float64 closing prices without NaNs, time along axis 0
+        ma_short: Short moving-average window
+        ma_long: Long moving-average window
+        volatility_window: Rolling volatility window
+    
+    Returns:
+        Array shaped close.shape + (len(INDICATOR_COLUMNS),)
+    """
+    # All indicators are written into one float64 block
+    out = np.full(close.shape + (len(INDICATOR_COLUMNS),), np.nan)
+    col = {name: out[..., i] for i, name in enumerate(INDICATOR_COLUMNS)}
+    
+    # Bollinger Bands (mean and std from one set of running sums)
+    bb_middle, bb_std = rolling_mean_std(close, 20)
+    
+    # Moving Averages (the default short MA is the Bollinger middle band)
+    col['MA20'][:] = bb_middle if ma_short == 20 else rolling_mean(close, ma_short)
+    col['MA50'][:] = rolling_mean(close, ma_long)
+    
+    # Daily Returns
+    col['Return'][1:] = close[1:] / close[:-1] - 1
+    
+    # Rolling Volatility (the first return is undefined)
+    col['Volatility'][1:] = rolling_std(col['Return'][1:], volatility_window)
+    
+    # Annualized Volatility
+    col['Volatility_Annual'][:] = col['Volatility'] * ANNUALIZE_VOL
+    
+    # RSI (14-day)
+    col['RSI'][:] = rsi_wilder(close, period=14)
+    
+    # Bollinger Bands
+    col['BB_Middle'][:] = bb_middle
+    col['BB_Upper'][:] = bb_middle + (2 * bb_std)
+    col['BB_Lower'][:] = bb_middle - (2 * bb_std)
+    
+    # MACD
+    fast, slow, signal = MACD_ALPHAS
+    col['EMA12'][:] = ewm_adjust_false(close, fast)
+    col['EMA26'][:] = ewm_adjust_false(close, slow)
+    col['MACD'][:] = col['EMA12'] - col['EMA26']
+    col['MACD_Signal'][:] = ewm_adjust_false(col['MACD'], signal)
+    col['MACD_Histogram'][:] = col['MACD'] - col['MACD_Signal']
+    
+    return out
+
 
 class IndicatorService:
     """Service for calculating technical indicators."""
@@ -23,6 +168,7 @@ class IndicatorService:
         self.ma_short = Config.MA_SHORT
         self.ma_long = Config.MA_LONG
         self.volatility_window = Config.VOLATILITY_WINDOW
+        self.cache_dir = Config.INDICATOR_CACHE_DIR
     
     def calculate_all_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -34,62 +180,54 @@ class IndicatorService:
         Returns:
             DataFrame with added indicator columns
         """
-        df = data.copy()
-        
-        # Moving Averages
-        df['MA20'] = df['Close'].rolling(window=self.ma_short).mean()
-        df['MA50'] = df['Close'].rolling(window=self.ma_long).mean()
-        
-        # Daily Returns
-        df['Return'] = df['Close'].pct_change()
-        
-        # Rolling Volatility
-        df['Volatility'] = df['Return'].rolling(window=self.volatility_window).std()
-        
-        # Annualized Volatility
-        df['Volatility_Annual'] = df['Volatility'] * np.sqrt(252)
-        
-        # RSI (14-day)
-        df['RSI'] = self._calculate_rsi(df['Close'], period=14)
-        
-        # Bollinger Bands
-        df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-        bb_std = df['Close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (2 * bb_std)
-        df['BB_Lower'] = df['BB_Middle'] - (2 * bb_std)
-        
-        # MACD
-        df['EMA12'] = df['Close'].ewm(span=12, adjust=False).mean()
-        df['EMA26'] = df['Close'].ewm(span=26, adjust=False).mean()
-        df['MACD'] = df['EMA12'] - df['EMA26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-        
-        return df
+        # The cached block is shared and read-only, so the frame gets its own copy
+        indicators = pd.DataFrame(
+            self._indicator_values(data), index=data.index, columns=INDICATOR_COLUMNS, copy=True
+        )
+        
+        # Recomputing on an already-enriched frame replaces its indicator columns
+        if data.columns.isin(INDICATOR_COLUMNS).any():
+            data = data.drop(columns=INDICATOR_COLUMNS, errors='ignore')
+        return pd.concat([data, indicators], axis=1)
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
+    def calculate_batch(
+        self,
+        symbols: List[str],
+        close_matrix: np.ndarray
+    ) -> Dict[str, np.ndarray]:
         """
-        Calculate Relative Strength Index.
+        Calculate all technical indicators for many symbols at once.
+        
+        Every indicator runs as one vectorized pass over the whole matrix
+        (the EMA/RSI recursions in parallel across symbols when numba is
+        installed), instead of one DataFrame per symbol.
         
         Args:
-            prices: Price series
-            period: RSI period
-            
+            symbols: Ticker symbols, one per row of close_matrix
+            close_matrix: Aligned closing prices shaped (n_symbols, n_days),
+                without NaNs
+        
         Returns:
-            RSI series
+            Dictionary mapping each indicator column name to an
+            (n_symbols, n_days) array
         """
-        delta = prices.diff()
-        
-        gain = delta.where(delta > 0, 0)
-        loss = (-delta).where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        close_matrix = np.asarray(close_matrix, dtype=np.float64)
+        if close_matrix.ndim != 2 or close_matrix.shape[0] != len(symbols):
+            raise ValueError(
+                f"Expected a ({len(symbols)}, n_days) close matrix, got shape {close_matrix.shape}"
+            )
+        
+        out = _compute_indicators(
+            np.ascontiguousarray(close_matrix.T), self.ma_short, self.ma_long, self.volatility_window
+        )
+        return {name: out[..., i].T for i, name in enumerate(INDICATOR_COLUMNS)}
+    
+    def _indicator_values(self, data: pd.DataFrame) -> np.ndarray:
+        """Cached, read-only indicator block for the frame's closes."""
+        close = data['Close'].to_numpy(dtype=np.float64)
+        return _indicator_block(
+            close.tobytes(), self.ma_short, self.ma_long, self.volatility_window, self.cache_dir
+        )
     
     def get_trend_signal(self, data: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -101,22 +239,23 @@ class IndicatorService:
         Returns:
             Dictionary with trend signal information
         """
-        df = data.copy()
-        
-        # Ensure MAs are calculated
-        if 'MA20' not in df.columns:
-            df['MA20'] = df['Close'].rolling(window=self.ma_short).mean()
-        if 'MA50' not in df.columns:
-            df['MA50'] = df['Close'].rolling(window=self.ma_long).mean()
-        
-        latest = df.iloc[-1]
-        previous = df.iloc[-5] if len(df) > 5 else df.iloc[0]
+        # Read the few values needed straight from the column arrays, taking
+        # the MAs from the cached indicator block if they are not present
+        if 'MA20' in data.columns and 'MA50' in data.columns:
+            ma20 = data['MA20'].to_numpy()
+            ma50 = data['MA50'].to_numpy()
+        else:
+            block = self._indicator_values(data)
+            ma20 = block[:, INDICATOR_COLUMNS.index('MA20')]
+            ma50 = block[:, INDICATOR_COLUMNS.index('MA50')]
+        latest_close = float(data['Close'].to_numpy()[-1])
+        previous = -5 if len(data) > 5 else 0
         
-        ma20_current = latest['MA20']
-        ma50_current = latest['MA50']
+        ma20_current = float(ma20[-1])
+        ma50_current = float(ma50[-1])
         
         # Determine trend
-        if pd.isna(ma20_current) or pd.isna(ma50_current):
+        if math.isnan(ma20_current) or math.isnan(ma50_current):
             signal = 'Neutral'
             strength = 0
         elif ma20_current > ma50_current:
@@ -128,11 +267,11 @@ class IndicatorService:
         
         # Check for recent crossover
         crossover = None
-        if len(df) >= 5:
-            ma20_prev = previous['MA20']
-            ma50_prev = previous['MA50']
+        if len(data) >= 5:
+            ma20_prev = float(ma20[previous])
+            ma50_prev = float(ma50[previous])
             
-            if pd.notna(ma20_prev) and pd.notna(ma50_prev):
+            if not (math.isnan(ma20_prev) or math.isnan(ma50_prev)):
                 if ma20_prev < ma50_prev and ma20_current > ma50_current:
                     crossover = 'Golden Cross (Bullish)'
                 elif ma20_prev > ma50_prev and ma20_current < ma50_current:
@@ -141,11 +280,11 @@ class IndicatorService:
         return {
             'signal': signal,
             'strength': round(float(strength), 1),
-            'ma20': round(float(ma20_current), 2) if pd.notna(ma20_current) else None,
-            'ma50': round(float(ma50_current), 2) if pd.notna(ma50_current) else None,
+            'ma20': round(ma20_current, 2) if not math.isnan(ma20_current) else None,
+            'ma50': round(ma50_current, 2) if not math.isnan(ma50_current) else None,
             'crossover': crossover,
-            'price_vs_ma20': 'Above' if latest['Close'] > ma20_current else 'Below',
-            'price_vs_ma50': 'Above' if latest['Close'] > ma50_current else 'Below'
+            'price_vs_ma20': 'Above' if latest_close > ma20_current else 'Below',
+            'price_vs_ma50': 'Above' if latest_close > ma50_current else 'Below'
         }
     
     def get_volatility_metrics(self, data: pd.DataFrame) -> Dict[str, Any]:
@@ -158,32 +297,31 @@ class IndicatorService:
         Returns:
             Dictionary with volatility metrics
         """
-        df = data.copy()
-        
         # Calculate returns if not present
-        if 'Return' not in df.columns:
-            df['Return'] = df['Close'].pct_change()
+        if 'Return' in data.columns:
+            returns = data['Return'].to_numpy(dtype=np.float64)
+        else:
+            close = data['Close'].to_numpy(dtype=np.float64)
+            returns = close[1:] / close[:-1] - 1
         
-        returns = df['Return'].dropna()
+        returns = returns[~np.isnan(returns)]
         
         # Daily volatility
-        daily_vol = returns.std()
+        daily_vol = returns.std(ddof=1)
         
         # Annualized volatility
-        annual_vol = daily_vol * np.sqrt(252)
+        annual_vol = daily_vol * ANNUALIZE_VOL
         
-        # Rolling volatilities
-        vol_20d = returns.rolling(20).std().iloc[-1] * np.sqrt(252)
-        vol_60d = returns.rolling(60).std().iloc[-1] * np.sqrt(252) if len(returns) >= 60 else None
+        # Rolling volatilities (latest full window only)
+        vol_20d = returns[-20:].std(ddof=1) * ANNUALIZE_VOL if len(returns) >= 20 else np.nan
+        vol_60d = returns[-60:].std(ddof=1) * ANNUALIZE_VOL if len(returns) >= 60 else None
         
         # Value at Risk (95%)
-        var_95 = np.percentile(returns, 5)
+        var_95 = linear_percentile(returns, 5)
         
         # Maximum drawdown
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdowns = (cumulative - running_max) / running_max
-        max_drawdown = drawdowns.min()
+        cumulative = np.cumprod(1.0 + returns)
+        max_drawdown = (cumulative / np.maximum.accumulate(cumulative) - 1.0).min()
         
         return {
             'daily_volatility': round(float(daily_vol) * 100, 2),
@@ -217,12 +355,10 @@ class IndicatorService:
         Returns:
             Dictionary with returns statistics
         """
-        df = data.copy()
-        
-        if 'Return' not in df.columns:
-            df['Return'] = df['Close'].pct_change()
-        
-        returns = df['Return'].dropna()
+        if 'Return' in data.columns:
+            returns = data['Return'].dropna()
+        else:
+            returns = data['Close'].pct_change().dropna()
         
         # Basic statistics
         mean_return = returns.mean()
@@ -239,14 +375,15 @@ class IndicatorService:
         total_days = len(returns)
         
         # Best and worst days
-        best_day = returns.max()
-        worst_day = returns.min()
+        values = returns.to_numpy()
+        best_day = values.max() if len(values) else np.nan
+        worst_day = values.min() if len(values) else np.nan
         
         return {
             'mean_daily_return': round(float(mean_return) * 100, 4),
             'median_daily_return': round(float(median_return) * 100, 4),
             'std_daily_return': round(float(std_return) * 100, 4),
-            'annualized_return': round(float(mean_return * 252) * 100, 2),
+            'annualized_return': round(float(mean_return * TRADING_DAYS) * 100, 2),
             'skewness': round(float(skewness), 3),
             'kurtosis': round(float(kurtosis), 3),
             'positive_days': int(positive_days),
@@ -272,12 +409,10 @@ class IndicatorService:
         Returns:
             Dictionary with support/resistance levels
         """
-        recent = data.tail(lookback)
-        
-        # Simple pivot points
-        high = recent['High'].max()
-        low = recent['Low'].min()
-        close = data['Close'].iloc[-1]
+        # Simple pivot points, read from the column arrays (no tail frame)
+        high = float(data['High'].to_numpy()[-lookback:].max())
+        low = float(data['Low'].to_numpy()[-lookback:].min())
+        close = float(data['Close'].to_numpy()[-1])
         
         pivot = (high + low + close) / 3
         r1 = 2 * pivot - low
@@ -306,13 +441,12 @@ class IndicatorService:
         Returns:
             Dictionary with RSI signal
         """
-        if 'RSI' not in data.columns:
-            data = data.copy()
-            data['RSI'] = self._calculate_rsi(data['Close'])
-        
-        rsi = data['RSI'].iloc[-1]
+        if 'RSI' in data.columns:
+            rsi = float(data['RSI'].to_numpy()[-1])
+        else:
+            rsi = float(self._indicator_values(data)[-1, INDICATOR_COLUMNS.index('RSI')])
         
-        if pd.isna(rsi):
+        if math.isnan(rsi):
             return {'rsi': None, 'signal': 'Insufficient data'}
         
         if rsi >= 70:
@@ -332,7 +466,7 @@ class IndicatorService:
             interpretation = 'No clear momentum signal'
         
         return {
-            'rsi': round(float(rsi), 2),
+            'rsi': round(rsi, 2),
             'signal': signal,
             'interpretation': interpretation
         }
@@ -352,30 +486,53 @@ class IndicatorService:
         Returns:
             Dictionary with chart-ready data
         """
-        df = self.calculate_all_indicators(data)
+        # Indicators need the full history; only the charted tail is serialized
+        start = max(len(data) - days, 0) if days else 0
+        names = [name for name, _, _ in CHART_SERIES]
         
-        if days:
-            df = df.tail(days)
+        # Reuse indicator columns the caller already computed
+        if all(name in data.columns for name in names):
+            charted = data[names].to_numpy(dtype=np.float64)[start:]
+        else:
+            columns = [INDICATOR_COLUMNS.index(name) for name in names]
+            charted = self._indicator_values(data)[start:, columns]
+        
+        # One float64 matrix (OHLC, then the charted indicators), scaled,
+        # NaN-filled and rounded in single passes. Prices are stored as
+        # float32 and widened here so the JSON carries two-decimal values.
+        scales = np.array([scale for _, scale, _ in CHART_SERIES])
+        fills = np.array([fill for _, _, fill in CHART_SERIES])
+        
+        values = np.empty((len(charted), len(PRICE_COLUMNS) + len(CHART_SERIES)))
+        values[:, :len(PRICE_COLUMNS)] = data[PRICE_COLUMNS].to_numpy()[start:]
+        series = values[:, len(PRICE_COLUMNS):]
+        np.multiply(charted, scales, out=series)
+        np.copyto(series, np.broadcast_to(fills, series.shape), where=np.isnan(series))
+        np.round(values, 2, out=values)
+        
+        open_, high, low, close, ma20, ma50, bb_upper, bb_middle, bb_lower, volatility, returns, rsi = (
+            values.T.tolist()
+        )
         
         # Convert to JSON-serializable format
         chart_data = {
-            'dates': df.index.strftime('%Y-%m-%d').tolist(),
+            'dates': data.index[start:].strftime('%Y-%m-%d').tolist(),
             'ohlc': {
-                'open': df['Open'].round(2).tolist(),
-                'high': df['High'].round(2).tolist(),
-                'low': df['Low'].round(2).tolist(),
-                'close': df['Close'].round(2).tolist()
+                'open': open_,
+                'high': high,
+                'low': low,
+                'close': close
             },
             'indicators': {
-                'ma20': df['MA20'].round(2).fillna(0).tolist(),
-                'ma50': df['MA50'].round(2).fillna(0).tolist(),
-                'bb_upper': df['BB_Upper'].round(2).fillna(0).tolist(),
-                'bb_middle': df['BB_Middle'].round(2).fillna(0).tolist(),
-                'bb_lower': df['BB_Lower'].round(2).fillna(0).tolist()
+                'ma20': ma20,
+                'ma50': ma50,
+                'bb_upper': bb_upper,
+                'bb_middle': bb_middle,
+                'bb_lower': bb_lower
             },
-            'volatility': df['Volatility'].fillna(0).multiply(100).round(2).tolist(),
-            'returns': df['Return'].fillna(0).multiply(100).round(2).tolist(),
-            'rsi': df['RSI'].fillna(50).round(2).tolist()
+            'volatility': volatility,
+            'returns': returns,
+            'rsi': rsi
         }
         
         return chart_data
@@ -11,9 +11,12 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 import joblib
 
+from utils.errors import UserError
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +43,9 @@ class PreprocessingService:
         self.scaler = None
         self.scaler_path = scaler_path
         self._is_fitted = False
+        self._fit_key = None
+        self._scale = None
+        self._min = None
         
         # Try to load existing scaler
         if scaler_path and Path(scaler_path).exists():
@@ -56,19 +62,31 @@ class PreprocessingService:
             Self for method chaining
         """
         try:
+            # Cached frames are reused across requests; skip refitting on the
+            # same snapshot (identified by its length, endpoints and end values)
+            frame = data[self.features]
+            fit_key = (
+                len(frame), frame.index[0], frame.index[-1],
+                tuple(frame.iloc[0]), tuple(frame.iloc[-1])
+            ) if len(frame) else None
+            if self._is_fitted and fit_key is not None and fit_key == self._fit_key:
+                return self
+            
             # Ensure correct column order
-            data_ordered = data[self.features].copy()
+            data_ordered = frame.to_numpy(dtype=np.float32)
             
             # Create and fit scaler
             self.scaler = MinMaxScaler(feature_range=(0, 1))
-            self.scaler.fit(data_ordered.values)
+            self.scaler.fit(data_ordered)
+            self._cache_scaler_params()
             self._is_fitted = True
+            self._fit_key = fit_key
             
-            logger.info(f"Scaler fitted on {len(data)} samples")
+            logger.info("Scaler fitted on %s samples", len(data))
             return self
             
         except Exception as e:
-            logger.error(f"Error fitting scaler: {e}")
+            logger.error("Error fitting scaler: %s", e)
             raise
     
     def save_scaler(self, path: Optional[Path] = None) -> None:
@@ -84,7 +102,7 @@ class PreprocessingService:
         save_path = path or self.scaler_path
         if save_path:
             joblib.dump(self.scaler, save_path)
-            logger.info(f"Scaler saved to {save_path}")
+            logger.info("Scaler saved to %s", save_path)
     
     def load_scaler(self, path: Path) -> None:
         """
@@ -95,12 +113,19 @@ class PreprocessingService:
         """
         try:
             self.scaler = joblib.load(path)
+            self._cache_scaler_params()
             self._is_fitted = True
-            logger.info(f"Scaler loaded from {path}")
+            self._fit_key = None
+            logger.info("Scaler loaded from %s", path)
         except Exception as e:
-            logger.warning(f"Could not load scaler from {path}: {e}")
+            logger.warning("Could not load scaler from %s: %s", path, e)
             self._is_fitted = False
     
+    def _cache_scaler_params(self) -> None:
+        """Keep the fitted scale/offset as float32 arrays for the inline transforms."""
+        self._scale = self.scaler.scale_.astype(np.float32)
+        self._min = self.scaler.min_.astype(np.float32)
+    
     def transform(self, data: pd.DataFrame) -> np.ndarray:
         """
         Scale the data using fitted scaler.
@@ -108,14 +133,31 @@ class PreprocessingService:
         Args:
             data: DataFrame with OHLC columns
             
+        Returns:
+            Scaled numpy array
+        """
+        # float32 in keeps the scaled output float32 for the model
+        return self.transform_arr(data[self.features].to_numpy(dtype=np.float32))
+    
+    def transform_arr(self, arr: np.ndarray) -> np.ndarray:
+        """
+        Scale a raw feature array (columns in self.features order).
+        
+        Args:
+            arr: Array shaped (rows, num_features)
+        
         Returns:
             Scaled numpy array
         """
         if not self._is_fitted:
             raise ValueError("Scaler not fitted. Call fit_scaler first.")
         
-        data_ordered = data[self.features].copy()
-        return self.scaler.transform(data_ordered.values)
+        # Same arithmetic as MinMaxScaler.transform without its validation
+        # and copies on the per-request path
+        scaled = arr * self._scale + self._min
+        if getattr(self.scaler, 'clip', False):
+            np.clip(scaled, *self.scaler.feature_range, out=scaled)
+        return scaled
     
     def inverse_transform(self, data: np.ndarray) -> np.ndarray:
         """
@@ -130,7 +172,7 @@ class PreprocessingService:
         if not self._is_fitted:
             raise ValueError("Scaler not fitted. Call fit_scaler first.")
         
-        return self.scaler.inverse_transform(data)
+        return (data - self._min) / self._scale
     
     def create_sequences(
         self,
@@ -147,17 +189,24 @@ class PreprocessingService:
             window_size: Override default window size
             
         Returns:
-            Tuple of (X, y) arrays
+            Tuple of (X, y) arrays; X is a read-only strided view into data
+            shaped (len(data) - ws, ws, num_features), not a copy
         """
         ws = window_size or self.window_size
-        X = []
-        y = []
+        data = np.asarray(data)
         
-        for i in range(ws, len(data)):
-            X.append(data[i - ws:i])
-            y.append(data[i])
+        if len(data) <= ws:
+            return (
+                np.empty((0, ws) + data.shape[1:], dtype=data.dtype),
+                np.empty((0,) + data.shape[1:], dtype=data.dtype)
+            )
+        
+        # Window i covers rows i..i+ws-1 and is labelled with row i+ws, so the
+        # last window (which has no label) is dropped
+        X = np.moveaxis(sliding_window_view(data, ws, axis=0), -1, 1)[:-1]
+        y = data[ws:]
         
-        return np.array(X), np.array(y)
+        return X, y
     
     def prepare_prediction_input(
         self,
@@ -180,42 +229,62 @@ class PreprocessingService:
         ws = window_size or self.window_size
         
         if len(data) < ws:
-            raise ValueError(
+            raise UserError(
                 f"Insufficient data. Need at least {ws} rows, got {len(data)}"
             )
         
         # Get last window_size rows
-        recent_data = data[self.features].iloc[-ws:].copy()
+        recent_data = data[self.features].to_numpy(dtype=np.float32)[-ws:]
         
         # Scale the data
         if not self._is_fitted:
             # If no scaler, fit on available data (for dynamic scaling)
             self.fit_scaler(data)
         
-        scaled_data = self.transform(recent_data)
+        scaled_data = self.transform_arr(recent_data)
         
         # Reshape for LSTM: (batch_size, timesteps, features)
         return scaled_data.reshape(1, ws, self.num_features)
     
+    def make_sequence_buffer(self, sequence: np.ndarray) -> Tuple[np.ndarray, int]:
+        """
+        Create a ring buffer for recursive forecasting from an input window.
+        
+        The buffer holds every row twice (at t and t + window_size), so the
+        current window is always a contiguous slice of it.
+        
+        Args:
+            sequence: Scaled window shaped (window_size, num_features)
+        
+        Returns:
+            Tuple of (buffer shaped (2 * window_size, num_features), head)
+        """
+        return np.concatenate([sequence, sequence]), 0
+    
     def update_sequence_with_prediction(
         self,
-        current_sequence: np.ndarray,
+        buffer: np.ndarray,
+        head: int,
         new_prediction: np.ndarray
-    ) -> np.ndarray:
+    ) -> Tuple[np.ndarray, int]:
         """
-        Update the sequence by removing oldest row and adding new prediction.
+        Drop the oldest row of the window and append a new prediction.
         
-        Used for recursive multi-step forecasting.
+        Used for recursive multi-step forecasting. Only the new row is
+        written (twice); nothing is shifted or allocated per step.
         
         Args:
-            current_sequence: Current input sequence (window_size, num_features)
+            buffer: Ring buffer from make_sequence_buffer
+            head: Current head index
             new_prediction: New prediction to append (num_features,)
             
         Returns:
-            Updated sequence
+            Tuple of (updated window view shaped (window_size, num_features), new head)
         """
-        # Remove first row and append new prediction
-        return np.vstack((current_sequence[1:], new_prediction.reshape(1, -1)))
+        ws = len(buffer) // 2
+        buffer[head] = buffer[head + ws] = new_prediction.reshape(-1)
+        head = (head + 1) % ws
+        return buffer[head:head + ws], head
     
     def calculate_returns(self, data: pd.DataFrame) -> pd.Series:
         """
@@ -4,19 +4,55 @@ Report Service Module
 Generates PDF and CSV reports for stock analysis.
 """
 
+import copy
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
 from pathlib import Path
 import io
 import csv
+from operator import itemgetter, methodcaller
 
+import numpy as np
 import pandas as pd
 
 from app.config import Config
 
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (
+        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+    )
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    HAVE_REPORTLAB = True
+except ImportError:
+    HAVE_REPORTLAB = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
 logger = logging.getLogger(__name__)
 
+# Forecast entry fields, in report column order
+FORECAST_FIELDS = ('day', 'date', 'open', 'high', 'low', 'close', 'close_lower', 'close_upper')
+
+# Fields every forecast entry carries (open/high/low are optional)
+_FORECAST_REQUIRED = itemgetter('day', 'date', 'close', 'close_lower', 'close_upper')
+
+
+class _LineEcho:
+    """File-like sink that hands each csv.writer line straight back."""
+    
+    def write(self, value: str) -> str:
+        return value
+
 
 class ReportService:
     """Service for generating analysis reports."""
@@ -26,129 +62,294 @@ class ReportService:
         self.reports_dir = Config.REPORTS_DIR
         self.disclaimer = Config.DISCLAIMER
         Path(self.reports_dir).mkdir(parents=True, exist_ok=True)
+        if HAVE_REPORTLAB:
+            self._init_pdf_styles()
     
-    def generate_csv_report(
+    def _init_pdf_styles(self):
+        """Build the paragraph and table styles shared by every PDF report."""
+        self._styles = getSampleStyleSheet()
+        
+        self._title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self._styles['Heading1'],
+            fontSize=24,
+            textColor=colors.darkblue,
+            alignment=TA_CENTER,
+            spaceAfter=30
+        )
+        
+        self._heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=self._styles['Heading2'],
+            fontSize=14,
+            textColor=colors.darkblue,
+            spaceBefore=20,
+            spaceAfter=10
+        )
+        
+        self._disclaimer_style = ParagraphStyle(
+            'Disclaimer',
+            parent=self._styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_LEFT
+        )
+        
+        # Markup is parsed once; each build lays out its own shallow copy
+        self._disclaimer_paragraph = Paragraph(self.disclaimer, self._disclaimer_style)
+        
+        self._summary_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        self._forecast_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ])
+        
+        self._trend_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ])
+    
+    def iter_csv_report(
         self,
         ticker: str,
         forecast_data: Dict[str, Any],
         historical_data: pd.DataFrame,
         indicators: Dict[str, Any]
-    ) -> io.StringIO:
+    ) -> Iterator[str]:
         """
-        Generate CSV report with forecast and analysis data.
+        Yield the full analysis report as CSV, one line at a time.
         
         Args:
             ticker: Stock ticker symbol
             forecast_data: Forecast results
             historical_data: Historical price data
             indicators: Technical indicators
-            
-        Returns:
-            StringIO buffer with CSV content
+        
+        Yields:
+            CSV-formatted lines
         """
-        output = io.StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(_LineEcho())
         
         # Header section
-        writer.writerow(['Stock Forecast Report'])
-        writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow(['Ticker', ticker])
-        writer.writerow([])
+        yield writer.writerow(['Stock Forecast Report'])
+        yield writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+        yield writer.writerow(['Ticker', ticker])
+        yield writer.writerow([])
         
         # Current price section
-        writer.writerow(['=== CURRENT PRICE ==='])
+        yield writer.writerow(['=== CURRENT PRICE ==='])
         if len(historical_data) > 0:
-            latest = historical_data.iloc[-1]
-            writer.writerow(['Date', historical_data.index[-1].strftime('%Y-%m-%d')])
-            writer.writerow(['Open', f"{latest['Open']:.2f}"])
-            writer.writerow(['High', f"{latest['High']:.2f}"])
-            writer.writerow(['Low', f"{latest['Low']:.2f}"])
-            writer.writerow(['Close', f"{latest['Close']:.2f}"])
-        writer.writerow([])
+            # Last element of each column array; iloc[-1] would build a row Series
+            yield writer.writerow(['Date', historical_data.index[-1].strftime('%Y-%m-%d')])
+            for column in ('Open', 'High', 'Low', 'Close'):
+                yield writer.writerow([column, f"{historical_data[column].to_numpy()[-1]:.2f}"])
+        yield writer.writerow([])
         
         # Forecast section
-        writer.writerow(['=== FORECAST ==='])
-        writer.writerow(['Day', 'Date', 'Open', 'High', 'Low', 'Close', 'Lower Band', 'Upper Band'])
+        yield writer.writerow(['=== FORECAST ==='])
+        yield writer.writerow(['Day', 'Date', 'Open', 'High', 'Low', 'Close', 'Lower Band', 'Upper Band'])
         
         if 'forecast' in forecast_data:
-            for f in forecast_data['forecast']:
-                writer.writerow([
-                    f['day'],
-                    f['date'],
-                    f['open'],
-                    f['high'],
-                    f['low'],
-                    f['close'],
-                    f['close_lower'],
-                    f['close_upper']
-                ])
-        writer.writerow([])
+            yield self._forecast_rows_csv(forecast_data['forecast'])
+        yield writer.writerow([])
         
         # Summary section
-        writer.writerow(['=== FORECAST SUMMARY ==='])
+        yield writer.writerow(['=== FORECAST SUMMARY ==='])
         if 'summary' in forecast_data:
             summary = forecast_data['summary']
-            writer.writerow(['Latest Close', summary.get('latest_close', 'N/A')])
-            writer.writerow(['Final Predicted Close', summary.get('final_predicted_close', 'N/A')])
-            writer.writerow(['Total Change', summary.get('total_change', 'N/A')])
-            writer.writerow(['Total Change %', summary.get('total_change_percent', 'N/A')])
-            writer.writerow(['Trend', summary.get('trend', 'N/A')])
-        writer.writerow([])
+            yield writer.writerow(['Latest Close', summary.get('latest_close', 'N/A')])
+            yield writer.writerow(['Final Predicted Close', summary.get('final_predicted_close', 'N/A')])
+            yield writer.writerow(['Total Change', summary.get('total_change', 'N/A')])
+            yield writer.writerow(['Total Change %', summary.get('total_change_percent', 'N/A')])
+            yield writer.writerow(['Trend', summary.get('trend', 'N/A')])
+        yield writer.writerow([])
         
         # Technical indicators section
-        writer.writerow(['=== TECHNICAL INDICATORS ==='])
+        yield writer.writerow(['=== TECHNICAL INDICATORS ==='])
         if 'trend' in indicators:
             trend = indicators['trend']
-            writer.writerow(['Trend Signal', trend.get('signal', 'N/A')])
-            writer.writerow(['MA20', trend.get('ma20', 'N/A')])
-            writer.writerow(['MA50', trend.get('ma50', 'N/A')])
+            yield writer.writerow(['Trend Signal', trend.get('signal', 'N/A')])
+            yield writer.writerow(['MA20', trend.get('ma20', 'N/A')])
+            yield writer.writerow(['MA50', trend.get('ma50', 'N/A')])
         
         if 'volatility' in indicators:
             vol = indicators['volatility']
-            writer.writerow(['Annual Volatility', f"{vol.get('annual_volatility', 'N/A')}%"])
-            writer.writerow(['Max Drawdown', f"{vol.get('max_drawdown', 'N/A')}%"])
-        writer.writerow([])
+            yield writer.writerow(['Annual Volatility', f"{vol.get('annual_volatility', 'N/A')}%"])
+            yield writer.writerow(['Max Drawdown', f"{vol.get('max_drawdown', 'N/A')}%"])
+        yield writer.writerow([])
         
         # Disclaimer
-        writer.writerow(['=== DISCLAIMER ==='])
-        writer.writerow([self.disclaimer])
-        
-        output.seek(0)
-        return output
+        yield writer.writerow(['=== DISCLAIMER ==='])
+        yield writer.writerow([self.disclaimer])
     
-    def generate_forecast_csv(self, forecast_data: Dict[str, Any]) -> io.StringIO:
+    def generate_csv_report(
+        self,
+        ticker: str,
+        forecast_data: Dict[str, Any],
+        historical_data: pd.DataFrame,
+        indicators: Dict[str, Any]
+    ) -> io.StringIO:
         """
-        Generate simple CSV with just forecast data.
+        Generate CSV report with forecast and analysis data.
         
         Args:
+            ticker: Stock ticker symbol
             forecast_data: Forecast results
+            historical_data: Historical price data
+            indicators: Technical indicators
             
         Returns:
             StringIO buffer with CSV content
         """
         output = io.StringIO()
-        writer = csv.writer(output)
+        output.writelines(
+            self.iter_csv_report(ticker, forecast_data, historical_data, indicators)
+        )
+        output.seek(0)
+        return output
+    
+    def iter_forecast_csv(self, forecast_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield the forecast table as CSV, one line at a time.
+        
+        Args:
+            forecast_data: Forecast results
+        
+        Yields:
+            CSV-formatted lines
+        """
+        writer = csv.writer(_LineEcho())
         
         # Header
-        writer.writerow(['Day', 'Date', 'Open', 'High', 'Low', 'Close', 'Lower_95CI', 'Upper_95CI'])
+        yield writer.writerow(['Day', 'Date', 'Open', 'High', 'Low', 'Close', 'Lower_95CI', 'Upper_95CI'])
         
         # Data
         if 'forecast' in forecast_data:
-            for f in forecast_data['forecast']:
-                writer.writerow([
-                    f['day'],
-                    f['date'],
-                    f['open'],
-                    f['high'],
-                    f['low'],
-                    f['close'],
-                    f['close_lower'],
-                    f['close_upper']
-                ])
+            yield self._forecast_rows_csv(forecast_data['forecast'])
+    
+    def generate_forecast_csv(self, forecast_data: Dict[str, Any]) -> io.StringIO:
+        """
+        Generate simple CSV with just forecast data.
         
+        Args:
+            forecast_data: Forecast results
+            
+        Returns:
+            StringIO buffer with CSV content
+        """
+        output = io.StringIO()
+        output.writelines(self.iter_forecast_csv(forecast_data))
         output.seek(0)
         return output
     
+    def generate_forecast_parquet(self, forecast_data: Dict[str, Any]) -> io.BytesIO:
+        """
+        Generate the forecast table as a zstd-compressed Parquet file.
+        
+        Columns match the forecast CSV; open/high/low are null because the
+        model predicts close only.
+        
+        Args:
+            forecast_data: Forecast results
+        
+        Returns:
+            BytesIO buffer with Parquet content
+        """
+        if not HAVE_PYARROW:
+            logger.warning("pyarrow not installed, Parquet export unavailable")
+            raise ImportError("pyarrow is required for Parquet export")
+        
+        forecast = forecast_data.get('forecast', [])
+        n = len(forecast)
+        
+        def column(key):
+            return np.fromiter((f.get(key, np.nan) for f in forecast), np.float64, n)
+        
+        table = pa.table({
+            'day': np.fromiter((f['day'] for f in forecast), np.int32, n),
+            'date': pa.array([f['date'] for f in forecast], pa.string()),
+            'open': pa.array(column('open'), from_pandas=True),
+            'high': pa.array(column('high'), from_pandas=True),
+            'low': pa.array(column('low'), from_pandas=True),
+            'close': column('close'),
+            'close_lower': column('close_lower'),
+            'close_upper': column('close_upper')
+        })
+        
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression='zstd', use_dictionary=True)
+        buffer.seek(0)
+        return buffer
+    
+    @staticmethod
+    def _forecast_columns(forecast: list) -> Dict[str, tuple]:
+        """
+        Transpose forecast entries into one tuple per field.
+        
+        The model predicts close only, so open/high/low default to ''.
+        
+        Args:
+            forecast: Forecast entries (list of dicts)
+        
+        Returns:
+            Dict of field name to column values, in FORECAST_FIELDS order
+        """
+        if not forecast:
+            return {field: () for field in FORECAST_FIELDS}
+        
+        # itemgetter/methodcaller keep the per-entry lookups inside C-level map
+        day, date, close, lower, upper = zip(*map(_FORECAST_REQUIRED, forecast))
+        open_, high, low = (
+            tuple(map(methodcaller('get', field, ''), forecast))
+            for field in ('open', 'high', 'low')
+        )
+        return dict(zip(FORECAST_FIELDS, (day, date, open_, high, low, close, lower, upper)))
+    
+    @classmethod
+    def _forecast_rows_csv(cls, forecast: list) -> str:
+        """Format every forecast row with a single writerows call, as one chunk."""
+        # Scratch buffers are not pooled: reusing one via seek/truncate timed
+        # no faster than a fresh StringIO, and pooling needs locking
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(zip(*cls._forecast_columns(forecast).values()))
+        return buffer.getvalue()
+    
+    @classmethod
+    def _forecast_rows_pdf(cls, forecast: list) -> list:
+        """Format the forecast table cells for the PDF, one column at a time."""
+        cols = cls._forecast_columns(forecast)
+        
+        def dollars(values):
+            return ['$%s' % v if v != '' else 'N/A' for v in values]
+        
+        return list(zip(
+            map(str, cols['day']),
+            cols['date'],
+            dollars(cols['open']),
+            dollars(cols['high']),
+            dollars(cols['low']),
+            map('$%s'.__mod__, cols['close']),
+            map('$%s-$%s'.__mod__, zip(cols['close_lower'], cols['close_upper']))
+        ))
+    
     def generate_pdf_report(
         self,
         ticker: str,
@@ -168,53 +369,26 @@ class ReportService:
         Returns:
             BytesIO buffer with PDF content
         """
-        try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import (
-                SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-            )
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        except ImportError:
+        if not HAVE_REPORTLAB:
             logger.warning("reportlab not installed, PDF generation unavailable")
             raise ImportError("reportlab is required for PDF generation")
         
+        # ReportLab serialises the whole document in memory and hands it to
+        # a single write() call, so a plain BytesIO needs no write buffering
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.darkblue,
-            alignment=TA_CENTER,
-            spaceAfter=30
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.darkblue,
-            spaceBefore=20,
-            spaceAfter=10
-        )
         
         # Title
-        elements.append(Paragraph(f"Stock Forecast Report: {ticker}", title_style))
+        elements.append(Paragraph(f"Stock Forecast Report: {ticker}", self._title_style))
         elements.append(Paragraph(
             f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            styles['Normal']
+            self._styles['Normal']
         ))
         elements.append(Spacer(1, 20))
         
         # Forecast Summary
-        elements.append(Paragraph("Forecast Summary", heading_style))
+        elements.append(Paragraph("Forecast Summary", self._heading_style))
         
         if 'summary' in forecast_data:
             summary = forecast_data['summary']
@@ -228,55 +402,27 @@ class ReportService:
             ]
             
             table = Table(summary_data, colWidths=[2.5*inch, 2.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            table.setStyle(self._summary_table_style)
             elements.append(table)
         
         elements.append(Spacer(1, 20))
         
         # Forecast Table
-        elements.append(Paragraph("Daily Forecast", heading_style))
+        elements.append(Paragraph("Daily Forecast", self._heading_style))
         
         if 'forecast' in forecast_data:
             forecast_header = ['Day', 'Date', 'Open', 'High', 'Low', 'Close', '95% CI']
-            forecast_rows = [forecast_header]
-            
-            for f in forecast_data['forecast']:
-                forecast_rows.append([
-                    str(f['day']),
-                    f['date'],
-                    f"${f['open']}",
-                    f"${f['high']}",
-                    f"${f['low']}",
-                    f"${f['close']}",
-                    f"${f['close_lower']}-${f['close_upper']}"
-                ])
+            forecast_rows = [forecast_header] + self._forecast_rows_pdf(forecast_data['forecast'])
             
             table = Table(forecast_rows, colWidths=[0.5*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1.3*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-            ]))
+            table.setStyle(self._forecast_table_style)
             elements.append(table)
         
         elements.append(Spacer(1, 20))
         
         # Technical Indicators
         if indicators:
-            elements.append(Paragraph("Technical Analysis", heading_style))
+            elements.append(Paragraph("Technical Analysis", self._heading_style))
             
             if 'trend' in indicators:
                 trend = indicators['trend']
@@ -289,27 +435,14 @@ class ReportService:
                 ]
                 
                 table = Table(trend_data, colWidths=[2.5*inch, 2.5*inch])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-                ]))
+                table.setStyle(self._trend_table_style)
                 elements.append(table)
         
         elements.append(Spacer(1, 30))
         
         # Disclaimer
-        elements.append(Paragraph("Disclaimer", heading_style))
-        disclaimer_style = ParagraphStyle(
-            'Disclaimer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_LEFT
-        )
-        elements.append(Paragraph(self.disclaimer, disclaimer_style))
+        elements.append(Paragraph("Disclaimer", self._heading_style))
+        elements.append(copy.copy(self._disclaimer_paragraph))
         
         # Build PDF
         doc.build(elements)
@@ -323,7 +456,7 @@ class ReportService:
         
         Args:
             ticker: Stock ticker symbol
-            report_type: Type of report (csv, pdf)
+            report_type: Type of report (csv, pdf, parquet)
             
         Returns:
             Filename string
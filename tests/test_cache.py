@@ -0,0 +1,145 @@
+"""
+Tests for the in-process SWRCache and SingleFlight helpers.
+"""
+
+import threading
+import time
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import SingleFlight, SWRCache
+
+
+class FakeClock:
+    """Stand-in for the time module with a manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', fake)
+    return fake
+
+
+def _concurrent(fn, n=8):
+    """Call fn from n threads released together; return their results."""
+    barrier = threading.Barrier(n)
+    results = [None] * n
+    
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+    
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_evicts_least_recently_used_at_maxsize(clock):
+    cache = SWRCache(maxsize=2)
+    cache.get_or_load('a', lambda: 1, ttl=60)
+    cache.get_or_load('b', lambda: 2, ttl=60)
+    cache.get_or_load('a', lambda: -1, ttl=60)  # hit: 'b' is now the oldest
+    cache.get_or_load('c', lambda: 3, ttl=60)
+    
+    assert cache.get_or_load('a', lambda: -1, ttl=60) == 1
+    assert cache.get_or_load('c', lambda: -1, ttl=60) == 3
+    assert cache.get_or_load('b', lambda: 22, ttl=60) == 22
+
+
+def test_expired_entries_are_evicted_before_live_ones(clock):
+    cache = SWRCache(maxsize=2)
+    cache.get_or_load('old', lambda: 1, ttl=10, stale_ttl=0)
+    clock.now += 5
+    cache.get_or_load('live', lambda: 2, ttl=60)
+    cache.get_or_load('old', lambda: -1, ttl=10)  # hit: 'live' is now the oldest
+    clock.now += 10
+    cache.get_or_load('new', lambda: 3, ttl=60)
+    
+    assert cache.get_or_load('live', lambda: -1, ttl=60) == 2
+    assert cache.get_or_load('new', lambda: -1, ttl=60) == 3
+
+
+def test_serves_stale_value_while_refreshing(clock):
+    cache = SWRCache()
+    cache.get_or_load('k', lambda: 'v1', ttl=10, stale_ttl=10)
+    clock.now += 15
+    
+    release = threading.Event()
+    calls = []
+    
+    def slow_loader():
+        calls.append(1)
+        release.wait(timeout=5)
+        return 'v2'
+    
+    # Stale hits return at once and schedule a single background refresh
+    assert cache.get_or_load('k', slow_loader, ttl=10, stale_ttl=10) == 'v1'
+    assert cache.get_or_load('k', slow_loader, ttl=10, stale_ttl=10) == 'v1'
+    
+    release.set()
+    cache._executor.shutdown(wait=True)
+    
+    assert len(calls) == 1
+    assert cache.get_or_load('k', lambda: 'unused', ttl=10) == 'v2'
+
+
+def test_value_past_stale_window_is_reloaded(clock):
+    cache = SWRCache()
+    cache.get_or_load('k', lambda: 'v1', ttl=10, stale_ttl=10)
+    clock.now += 25
+    
+    assert cache.get_or_load('k', lambda: 'v2', ttl=10, stale_ttl=10) == 'v2'
+
+
+def test_concurrent_misses_share_one_load():
+    cache = SWRCache()
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value'
+    
+    results = _concurrent(lambda: cache.get_or_load('k', loader, ttl=60))
+    
+    assert results == ['value'] * 8
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_result_and_exception():
+    flight = SingleFlight()
+    calls = []
+    
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        return 42
+    
+    assert _concurrent(lambda: flight.do('k', fn)) == [42] * 8
+    assert len(calls) == 1
+    
+    def failing():
+        time.sleep(0.2)
+        raise RuntimeError('boom')
+    
+    def call():
+        try:
+            flight.do('k', failing)
+        except RuntimeError as e:
+            return str(e)
+    
+    assert _concurrent(call) == ['boom'] * 8
+    
+    # The key is released once the call finishes
+    assert flight.do('k', lambda: 'again') == 'again'
@@ -0,0 +1,88 @@
+"""
+Tests for chart point reduction against straightforward references.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import downsample
+from utils.downsample import bucket_bounds, bucket_size, downsample_indices, resample_ohlc
+
+
+def _prices(n: int, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def _minmax_reference(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Per-bucket loop: first, last, and each inner bucket's min and max, skipping NaN."""
+    n = len(y)
+    n_bins = (n_out - 2) // 2
+    keep = {0, n - 1}
+    if n_bins < 1:
+        return np.array(sorted(keep))
+    width = -(-(n - 2) // n_bins)
+    for start in range(1, n - 1, width):
+        bucket = y[start:min(start + width, n - 1)]
+        keep.add(start + int(np.argmin(np.where(np.isnan(bucket), np.inf, bucket))))
+        keep.add(start + int(np.argmax(np.where(np.isnan(bucket), -np.inf, bucket))))
+    return np.array(sorted(keep))
+
+
+@pytest.fixture
+def numpy_path(monkeypatch):
+    monkeypatch.setattr(downsample, 'HAVE_TSDOWNSAMPLE', False)
+
+
+@pytest.mark.parametrize('n, n_out', [(5000, 2000), (2001, 2000), (1003, 100), (997, 7), (50, 4), (50, 3)])
+def test_minmax_matches_bucket_loop(numpy_path, n, n_out):
+    y = _prices(n)
+    y[n // 3:n // 3 + 40] = np.nan
+    idx = downsample_indices(y, n_out)
+    
+    np.testing.assert_array_equal(idx, _minmax_reference(y, n_out))
+    assert len(idx) <= n_out
+
+
+def test_extremes_and_endpoints_survive(numpy_path):
+    y = _prices(10000)
+    idx = downsample_indices(y, 500)
+    
+    assert {0, len(y) - 1, int(np.argmin(y)), int(np.argmax(y))} <= set(idx.tolist())
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_short_series_is_unchanged():
+    np.testing.assert_array_equal(downsample_indices(_prices(300), 2000), np.arange(300))
+
+
+@pytest.mark.parametrize('n, n_out', [(1000, 100), (1001, 100), (7, 2000)])
+def test_resample_ohlc_matches_pandas(n, n_out):
+    rng = np.random.default_rng(5)
+    close = _prices(n)
+    frame = pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, n)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000, 1_000_000, n)
+    })
+    size = bucket_size(n, n_out)
+    expected = frame.groupby(np.arange(n) // size).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    )
+    
+    result = resample_ohlc(*(frame[c].to_numpy() for c in expected.columns), size)
+    
+    assert len(expected) <= n_out
+    for column, values in zip(expected.columns, result):
+        np.testing.assert_array_equal(values, expected[column].to_numpy())
+    assert resample_ohlc(*(frame[c].to_numpy() for c in expected.columns[:4]), None, size)[4] is None
+
+
+def test_bucket_bounds_cover_every_row_once():
+    starts, ends = bucket_bounds(10, 4)
+    
+    np.testing.assert_array_equal(starts, [0, 4, 8])
+    np.testing.assert_array_equal(ends, [3, 7, 9])
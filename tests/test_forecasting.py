@@ -0,0 +1,57 @@
+"""
+Tests for the NumPy LSTM inference path used by the forecasting service.
+"""
+
+import numpy as np
+import pytest
+
+from utils.numpy_lstm import NumpyLSTM
+
+keras = pytest.importorskip('keras')
+
+
+def _small_lstm(window: int = 12, features: int = 4):
+    """Two stacked LSTMs with Dropout and Dense heads, random weights."""
+    keras.utils.set_random_seed(7)
+    return keras.Sequential([
+        keras.Input((window, features)),
+        keras.layers.LSTM(16, return_sequences=True),
+        keras.layers.Dropout(0.2),
+        keras.layers.LSTM(8),
+        keras.layers.Dense(8, activation='relu'),
+        keras.layers.Dense(features)
+    ])
+
+
+def test_predict_matches_keras():
+    model = _small_lstm()
+    X = np.random.default_rng(0).random((3, 12, 4), dtype=np.float32)
+    
+    np.testing.assert_allclose(
+        NumpyLSTM.from_keras(model).predict(X), model.predict(X, verbose=0), atol=1e-5
+    )
+
+
+def test_rollout_matches_recursive_keras_predict():
+    model = _small_lstm()
+    X = np.random.default_rng(1).random((2, 12, 4), dtype=np.float32)
+    horizon = 15  # longer than the window, so the ring buffer wraps
+    
+    expected = np.empty((2, horizon, 4), dtype=np.float32)
+    window = X.copy()
+    for i in range(horizon):
+        step = model.predict(window, verbose=0)
+        expected[:, i] = step
+        window = np.concatenate([window[:, 1:], step[:, np.newaxis]], axis=1)
+    
+    np.testing.assert_allclose(NumpyLSTM.from_keras(model).rollout(X, horizon), expected, atol=1e-5)
+
+
+def test_unsupported_architecture_is_rejected():
+    model = keras.Sequential([
+        keras.Input((12, 4)),
+        keras.layers.GRU(8),
+        keras.layers.Dense(4)
+    ])
+    
+    assert NumpyLSTM.from_keras(model) is None
@@ -0,0 +1,63 @@
+"""
+Tests for the RSI shared by the indicator API and the chart helpers.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.indicator_service import IndicatorService
+from utils.fast_ewm import rsi_wilder
+from utils.plotting_utils import _chart_indicators, _chart_indicators_many, get_rsi_trace
+
+
+# Closing prices from Wilder's worked RSI example (as tabulated by StockCharts)
+WILDER_CLOSES = np.array([
+    44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08,
+    45.89, 46.03, 45.61, 46.28, 46.28, 46.00, 46.03, 46.41, 46.22, 45.64
+])
+WILDER_RSI = [70.4641, 66.2496, 66.4809, 69.3469, 66.2947, 57.9150]
+
+
+def test_rsi_wilder_matches_reference_values():
+    rsi = rsi_wilder(WILDER_CLOSES, 14)
+    
+    assert np.isnan(rsi[:14]).all()
+    np.testing.assert_allclose(rsi[14:], WILDER_RSI, atol=1e-4)
+
+
+def test_rsi_wilder_flat_and_rising_series():
+    # No change at all leaves RSI undefined; gains without losses are maximum strength
+    assert np.isnan(rsi_wilder(np.full(30, 5.0), 14)).all()
+    np.testing.assert_array_equal(rsi_wilder(np.arange(30.0), 14)[14:], 100.0)
+
+
+def test_rsi_wilder_short_series_is_all_nan():
+    assert np.isnan(rsi_wilder(WILDER_CLOSES[:14], 14)).all()
+
+
+def test_chart_rsi_uses_the_api_definition():
+    rng = np.random.default_rng(0)
+    closes = [100 + np.cumsum(rng.normal(size=n)) for n in (80, 120)]
+    expected = [rsi_wilder(close, 14) for close in closes]
+    
+    np.testing.assert_array_equal(_chart_indicators(closes[0])['rsi'], expected[0])
+    for columns, rsi in zip(_chart_indicators_many(closes), expected):
+        np.testing.assert_array_equal(columns['rsi'], rsi)
+    
+    df = pd.DataFrame({'Close': closes[0]}, index=pd.date_range('2024-01-01', periods=80))
+    trace, _ = get_rsi_trace(df, dates=[''] * 80)
+    np.testing.assert_array_equal(np.array(trace['y'], dtype=float), expected[0])
+    
+    api = IndicatorService().calculate_all_indicators(df)['RSI'].to_numpy()
+    np.testing.assert_allclose(api, expected[0], equal_nan=True)
+
+
+@pytest.mark.parametrize('closes, signal', [
+    (np.full(30, 5.0), 'Insufficient data'),
+    (np.arange(30.0) + 10, 'Overbought'),
+])
+def test_rsi_signal_edges(closes, signal):
+    df = pd.DataFrame({'Close': closes}, index=pd.date_range('2024-01-01', periods=len(closes)))
+    
+    assert IndicatorService().get_rsi_signal(df)['signal'] == signal
@@ -0,0 +1,61 @@
+"""
+Parity tests for utils.rolling against pandas' rolling().mean()/.std().
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import rolling
+from utils.rolling import rolling_mean, rolling_mean_std, rolling_means, rolling_std
+
+
+def _prices(level: float, n: int = 600) -> np.ndarray:
+    """Fixed random-walk closes around level, about 1% daily moves."""
+    rng = np.random.default_rng(42)
+    return level * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+@pytest.fixture(params=['numpy', 'bottleneck'])
+def backend(request, monkeypatch):
+    if request.param == 'bottleneck':
+        if not rolling.HAVE_BOTTLENECK:
+            pytest.skip('bottleneck not installed')
+    else:
+        monkeypatch.setattr(rolling, 'HAVE_BOTTLENECK', False)
+    return request.param
+
+
+@pytest.mark.parametrize('level', [150.0, 600000.0])
+@pytest.mark.parametrize('window', [1, 2, 20, 50])
+def test_matches_pandas(backend, level, window):
+    close = _prices(level)
+    expected = pd.Series(close).rolling(window)
+    
+    # The sum-of-squares form is accurate relative to the price level, not to
+    # a std near zero (two almost equal closes in a short window)
+    std_tol = {'rtol': 1e-7, 'atol': level * 1e-9}
+    
+    np.testing.assert_allclose(rolling_mean(close, window), expected.mean(), rtol=1e-12)
+    if window > 1:
+        np.testing.assert_allclose(rolling_std(close, window), expected.std(), **std_tol)
+        mean, std = rolling_mean_std(close, window, ddof=0)
+        np.testing.assert_allclose(mean, expected.mean(), rtol=1e-12)
+        np.testing.assert_allclose(std, expected.std(ddof=0), **std_tol)
+
+
+def test_matrix_and_multiple_windows(backend):
+    closes = np.column_stack([_prices(150.0), _prices(30.0)[::-1]])
+    frame = pd.DataFrame(closes)
+    
+    for result, window in zip(rolling_means(closes, [5, 20, 50]), [5, 20, 50]):
+        np.testing.assert_allclose(result, frame.rolling(window).mean(), rtol=1e-12)
+    np.testing.assert_allclose(rolling_std(closes, 20), frame.rolling(20).std(), rtol=1e-9)
+
+
+def test_short_and_flat_series(backend):
+    assert np.isnan(rolling_mean(_prices(150.0, 10), 20)).all()
+    
+    mean, std = rolling_mean_std(np.full(30, 612345.67), 20)
+    np.testing.assert_allclose(mean[19:], 612345.67, rtol=1e-12)
+    np.testing.assert_array_equal(std[19:], 0.0)
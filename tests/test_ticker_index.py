@@ -0,0 +1,69 @@
+"""
+Tests for the suffix-array ticker autocomplete index.
+"""
+
+import csv
+import itertools
+from pathlib import Path
+
+import pytest
+
+from utils.ticker_index import TickerIndex
+
+TICKERS_CSV = Path(__file__).absolute().parent.parent / 'data' / 'tickers.csv'
+
+
+NAMES = {
+    'AAPL': 'Apple Inc.',
+    'MSFT': 'Microsoft Corporation',
+    'GOOGL': 'Alphabet Inc.',
+    'AMZN': 'Amazon.com Inc.',
+    'META': 'Meta Platforms Inc.',
+    'BRK-B': 'Berkshire Hathaway Inc.',
+    'AMD': 'Advanced Micro Devices',
+    'MA': 'Mastercard Inc.',
+    '^GSPC': 'S&P 500',
+    'EURUSD=X': 'EUR/USD',
+}
+
+
+def _scan(names, query, limit=10):
+    """Reference: linear substring scan in table order."""
+    query = query.upper()
+    return [t for t, name in names.items() if query in t.upper() or query in name.upper()][:limit]
+
+
+@pytest.mark.parametrize('query', [
+    'a', 'AAPL', 'inc', 'INC.', 'micro', 'ma', 'm', '-b', '^gs', '=x', 'usd', '500', 'zzz', 'apple inc.x'
+])
+def test_search_matches_linear_scan(query):
+    index = TickerIndex(NAMES)
+    
+    assert index.search(query) == _scan(NAMES, query)
+
+
+def test_limit_keeps_table_order():
+    index = TickerIndex(NAMES)
+    
+    assert index.search('inc', limit=3) == _scan(NAMES, 'inc', limit=3) == ['AAPL', 'GOOGL', 'AMZN']
+
+
+def test_empty_query_returns_leading_tickers():
+    assert TickerIndex(NAMES).search('', limit=4) == ['AAPL', 'MSFT', 'GOOGL', 'AMZN']
+
+
+def test_ticker_matching_in_symbol_and_name_appears_once():
+    assert TickerIndex({'META': 'Meta Platforms'}).search('meta') == ['META']
+
+
+def test_bundled_table_matches_linear_scan():
+    with open(TICKERS_CSV, newline='', encoding='utf-8') as f:
+        names = {row['ticker'].upper(): row['name'] for row in csv.DictReader(f)}
+    index = TickerIndex(names)
+    
+    # Every one- and two-letter query, plus each symbol and a name fragment
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ.-& '
+    queries = [''.join(p) for n in (1, 2) for p in itertools.product(letters, repeat=n)]
+    queries += list(names) + [name[1:6] for name in names.values()]
+    for query in queries:
+        assert index.search(query, limit=5) == _scan(names, query, limit=5), query
@@ -0,0 +1,190 @@
+"""
+In-process caching utilities for API responses.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+    
+    The first caller for a key runs the function; callers arriving while
+    it is still running wait for and share its result (or exception).
+    """
+    
+    def __init__(self):
+        """Initialize the in-flight call table."""
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn for key, or wait for an identical call already in flight.
+        
+        Args:
+            key: Hashable key identifying the call
+            fn: Zero-argument callable producing the value
+        
+        Returns:
+            Result of fn
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+class SWRCache:
+    """
+    Thread-safe keyed cache with a stale-while-revalidate policy.
+    
+    Entries are served as-is while fresh. Once an entry is older than its
+    TTL but still inside the stale window, the cached value is returned
+    immediately and a background refresh is scheduled. Callers only block
+    on the loader when nothing usable is cached, and concurrent misses for
+    the same key share a single loader call. At most maxsize entries are
+    kept: expired ones are dropped first, then the least recently used.
+    """
+    
+    def __init__(self, max_workers: int = 4, maxsize: int = 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_workers: Maximum number of concurrent background refreshes
+            maxsize: Maximum number of entries kept
+        """
+        # key -> (value, fresh_until, stale_until), least recently used first
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, float, float]]' = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='swr-refresh'
+        )
+    
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float,
+        stale_ttl: float = None
+    ) -> Any:
+        """
+        Return the cached value for a key, loading it if necessary.
+        
+        Args:
+            key: Hashable cache key
+            loader: Zero-argument callable producing the value
+            ttl: Seconds the value is considered fresh
+            stale_ttl: Extra seconds a stale value may be served while
+                refreshing (defaults to ttl)
+        
+        Returns:
+            Cached or freshly loaded value
+        """
+        stale_ttl = ttl if stale_ttl is None else stale_ttl
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry[2]:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+        
+        if entry is not None:
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                return value
+            if now < stale_until:
+                self._schedule_refresh(key, loader, ttl, stale_ttl)
+                return value
+        
+        def load_and_store():
+            # Another caller may have stored a value since the check above
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                return entry[0]
+            value = loader()
+            self._store(key, value, ttl, stale_ttl)
+            return value
+        
+        return self._flight.do(key, load_and_store)
+    
+    def _store(self, key: Hashable, value: Any, ttl: float, stale_ttl: float) -> None:
+        """Store a value with its freshness deadlines, evicting to stay within maxsize."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (value, now + ttl, now + ttl + stale_ttl)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                expired = [k for k, entry in self._entries.items() if entry[2] <= now]
+                for k in expired:
+                    del self._entries[k]
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+    
+    def _schedule_refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float,
+        stale_ttl: float
+    ) -> None:
+        """Refresh a stale entry in the background, at most once per key."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            try:
+                self._store(key, loader(), ttl, stale_ttl)
+            except Exception as e:
+                logger.warning("Background refresh failed for %s: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        self._executor.submit(refresh)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
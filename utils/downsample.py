@@ -0,0 +1,115 @@
+"""
+Point reduction for long chart series.
+
+Line data keeps the extreme points of each bucket, so spikes survive:
+tsdownsample's MinMaxLTTB when it is installed, otherwise a plain
+NumPy min/max pass. OHLC data is aggregated over fixed-size buckets of
+consecutive rows instead, like a coarser bar interval.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    HAVE_TSDOWNSAMPLE = True
+except ImportError:
+    HAVE_TSDOWNSAMPLE = False
+
+
+# Plotly.js stays responsive well below this many points per trace
+DEFAULT_POINTS = 2000
+
+
+def _minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """First, last and the min/max of each of (n_out - 2) // 2 inner buckets; NaN is skipped."""
+    n = len(y)
+    n_bins = (n_out - 2) // 2
+    if n_bins < 1:
+        # No room for a min/max pair besides the endpoints
+        return np.array([0, n - 1])
+    width = -(-(n - 2) // n_bins)
+    
+    # Pad the inner points to whole buckets so one argmin/argmax covers all of them
+    inner = np.full(n_bins * width, np.nan)
+    inner[:n - 2] = y[1:-1]
+    rows = inner.reshape(n_bins, width)
+    missing = np.isnan(rows)
+    offsets = np.arange(n_bins) * width + 1
+    lo = np.argmin(np.where(missing, np.inf, rows), axis=1) + offsets
+    hi = np.argmax(np.where(missing, -np.inf, rows), axis=1) + offsets
+    
+    return np.unique(np.minimum(np.concatenate(([0, n - 1], lo, hi)), n - 1))
+
+
+def downsample_indices(y: np.ndarray, n_out: int = DEFAULT_POINTS) -> np.ndarray:
+    """
+    Indices of at most n_out representative points of a series.
+    
+    Args:
+        y: 1-D numeric series (NaN allowed)
+        n_out: Target number of points
+    
+    Returns:
+        Sorted index array; every index when len(y) <= n_out
+    """
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) <= max(n_out, 2):
+        return np.arange(len(y))
+    if HAVE_TSDOWNSAMPLE and np.isfinite(y).all():
+        return MinMaxLTTBDownsampler().downsample(y, n_out=n_out).astype(np.intp)
+    return _minmax_indices(y, n_out)
+
+
+def bucket_size(n: int, n_out: int = DEFAULT_POINTS) -> int:
+    """Rows per bucket so that n rows make at most n_out buckets."""
+    return max(-(-n // n_out), 1)
+
+
+def bucket_bounds(n: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First and last row of each bucket of size consecutive rows.
+    
+    Args:
+        n: Number of rows
+        size: Rows per bucket (the last bucket may be shorter)
+    
+    Returns:
+        Tuple of (starts, ends) index arrays, usable with ufunc.reduceat(values, starts)
+    """
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+    return starts, ends
+
+
+def resample_ohlc(open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                  close: np.ndarray, volume: Optional[np.ndarray],
+                  size: int) -> Tuple[np.ndarray, ...]:
+    """
+    Merge each bucket of size consecutive rows into one bar.
+    
+    One ufunc.reduceat pass per column; a fused numba loop measured
+    slower, since max/min with NaN ordering does not vectorize.
+    
+    Args:
+        open_: Open prices without NaNs
+        high: High prices without NaNs
+        low: Low prices without NaNs
+        close: Close prices without NaNs
+        volume: Volume column, or None
+        size: Rows per bucket (see bucket_size)
+    
+    Returns:
+        Tuple of (open, high, low, close, volume) per bucket: first open,
+        highest high, lowest low, last close and summed volume (None if
+        volume is None)
+    """
+    starts, ends = bucket_bounds(len(close), size)
+    return (
+        open_[starts],
+        np.maximum.reduceat(high, starts),
+        np.minimum.reduceat(low, starts),
+        close[ends],
+        None if volume is None else np.add.reduceat(volume, starts)
+    )
@@ -0,0 +1,19 @@
+"""
+Exceptions whose messages are safe to show to API clients.
+
+The blueprint error handlers return str(error) only for these; any other
+exception is reported with a fixed message so internal details never
+reach the client.
+"""
+
+
+class UserError(ValueError):
+    """Bad or unusable input, e.g. an unknown ticker (HTTP 400)."""
+    
+    status_code = 400
+
+
+class UpstreamError(UserError):
+    """The market data provider failed or could not be reached (HTTP 502)."""
+    
+    status_code = 502
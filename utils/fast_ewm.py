@@ -0,0 +1,107 @@
+"""
+Recursive exponential moving averages on NumPy arrays.
+
+Uses a Numba-compiled loop (parallel across series) when numba is
+installed, otherwise an equivalent scipy.signal.lfilter call; both
+replace pandas' ewm(adjust=False).mean() for NaN-free inputs. Inputs are
+1-D series or 2-D (time, series) matrices; recursions run along axis 0.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+def span_to_alpha(span: float) -> float:
+    """Smoothing factor for a pandas-style span."""
+    return 2.0 / (span + 1.0)
+
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _ewm_kernel(x, alpha):
+        out = np.empty_like(x)
+        for j in prange(x.shape[1]):
+            acc = x[0, j]
+            out[0, j] = acc
+            for i in range(1, x.shape[0]):
+                acc = alpha * x[i, j] + (1.0 - alpha) * acc
+                out[i, j] = acc
+        return out
+else:
+    from scipy.signal import lfilter
+    
+    def _ewm_kernel(x, alpha):
+        # y[i] = alpha * x[i] + (1 - alpha) * y[i - 1], seeded so y[0] = x[0]
+        out, _ = lfilter([alpha], [1.0, alpha - 1.0], x, axis=0, zi=(1.0 - alpha) * x[:1])
+        return out
+
+
+def ewm_adjust_false(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential moving average matching pandas' ewm(alpha=..., adjust=False).mean().
+    
+    Args:
+        x: Array without NaNs, time along axis 0
+        alpha: Smoothing factor in (0, 1]
+    
+    Returns:
+        float64 array shaped like x
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if x.size == 0:
+        return x.copy()
+    if x.ndim == 1:
+        return _ewm_kernel(x[:, np.newaxis], float(alpha))[:, 0]
+    return _ewm_kernel(x, float(alpha))
+
+
+def warmup() -> None:
+    """
+    Compile (or load the cached build of) the EWM kernel in this process.
+    
+    Not run at import: numba's parallel threading layer is not fork-safe,
+    so it must first start in each worker rather than in a preloading parent.
+    """
+    ewm_adjust_false(np.zeros(2), 0.5)
+
+
+def rsi_wilder(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder's smoothing.
+    
+    The first average gain/loss is the simple mean of the first period
+    changes; later ones follow avg = avg + (x - avg) / period, which is the
+    same recursion as ewm_adjust_false with alpha = 1 / period.
+    
+    Args:
+        close: Closing prices without NaNs, time along axis 0
+        period: Smoothing period
+    
+    Returns:
+        float64 array shaped like close, NaN for the first period rows and
+        where the smoothed gain and loss are both zero (a flat series)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    rsi = np.full(close.shape, np.nan)
+    if len(close) <= period:
+        return rsi
+    
+    delta = np.diff(close, axis=0)
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+    
+    alpha = 1.0 / period
+    avg_gain = ewm_adjust_false(np.concatenate([gain[:period].mean(axis=0, keepdims=True), gain[period:]]), alpha)
+    avg_loss = ewm_adjust_false(np.concatenate([loss[:period].mean(axis=0, keepdims=True), loss[period:]]), alpha)
+    
+    # No losses means maximum strength; no change at all leaves RSI undefined (NaN)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = np.where(avg_loss > 0, avg_gain / avg_loss, np.where(avg_gain > 0, np.inf, np.nan))
+    rsi[period:] = 100 - (100 / (1 + rs))
+    
+    return rsi
@@ -2,11 +2,26 @@
 Utility helper functions for stock forecast dashboard.
 """
 
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Optional, Union, List, Dict, Any
 
+from utils.validation import is_valid_ticker  # noqa: F401 (re-exported)
+
+
+# Default parse_date formats, each keyed by the string shape strptime accepts
+# for it (%m/%d/%H/%M/%S take one or two digits, %d a leading space); the
+# shapes never overlap, so at most one format can apply to a given string
+_DATE_FORMATS = [
+    (re.compile(r'\d{4}-\d{1,2}- ?\d{1,2}'), "%Y-%m-%d"),
+    (re.compile(r'\d{4}/\d{1,2}/ ?\d{1,2}'), "%Y/%m/%d"),
+    (re.compile(r'\d{1,2}/ ?\d{1,2}/\d{4}'), "%m/%d/%Y"),
+    (re.compile(r' ?\d{1,2}-\d{1,2}-\d{4}'), "%d-%m-%Y"),
+    (re.compile(r'\d{4}-\d{1,2}- ?\d{1,2}\s+\d{1,2}:\d{1,2}:\d{1,2}'), "%Y-%m-%d %H:%M:%S")
+]
+
 
 def format_currency(value: float, currency: str = "USD", decimals: int = 2) -> str:
     """
@@ -58,6 +73,24 @@ def format_large_number(value: float) -> str:
     return f"{value:.2f}"
 
 
+def format_large_numbers(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized format_large_number for a whole column of values.
+    
+    Args:
+        values: Array of numeric values
+    
+    Returns:
+        Array of formatted strings with K, M, B suffixes
+    """
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+    conditions = [magnitude >= 1e9, magnitude >= 1e6, magnitude >= 1e3]
+    scaled = np.select(conditions, [values / 1e9, values / 1e6, values / 1e3], default=values)
+    suffix = np.select(conditions, ['B', 'M', 'K'], default='')
+    return np.char.add(np.char.mod('%.2f', scaled), suffix)
+
+
 def parse_date(date_str: str, formats: List[str] = None) -> Optional[datetime]:
     """
     Parse date string trying multiple formats.
@@ -70,13 +103,14 @@ def parse_date(date_str: str, formats: List[str] = None) -> Optional[datetime]:
         Parsed datetime object or None if failed
     """
     if formats is None:
-        formats = [
-            "%Y-%m-%d",
-            "%Y/%m/%d",
-            "%m/%d/%Y",
-            "%d-%m-%Y",
-            "%Y-%m-%d %H:%M:%S"
-        ]
+        # Classify by shape and try the one format that can match
+        for pattern, fmt in _DATE_FORMATS:
+            if pattern.fullmatch(date_str):
+                try:
+                    return datetime.strptime(date_str, fmt)
+                except ValueError:
+                    return None
+        return None
     
     for fmt in formats:
         try:
@@ -87,20 +121,22 @@ def parse_date(date_str: str, formats: List[str] = None) -> Optional[datetime]:
     return None
 
 
-def get_trading_days(start_date: datetime, end_date: datetime) -> int:
+def get_trading_days(start_date: datetime, end_date: datetime, holidays: Optional[List] = None) -> int:
     """
-    Calculate approximate number of trading days between dates.
+    Count trading days (Mon-Fri) from start_date up to, not including, end_date.
     
     Args:
         start_date: Start datetime
         end_date: End datetime
+        holidays: Optional exchange holiday dates to exclude
         
     Returns:
-        Approximate number of trading days
+        Number of trading days (negative if end_date precedes start_date)
     """
-    total_days = (end_date - start_date).days
-    # Approximate: 5 trading days per 7 calendar days
-    return int(total_days * 5 / 7)
+    return int(np.busday_count(
+        start_date.date(), end_date.date(),
+        holidays=[] if holidays is None else holidays
+    ))
 
 
 def get_date_range(period: str) -> tuple:
@@ -186,6 +222,12 @@ def validate_dataframe(df: pd.DataFrame, required_columns: List[str]) -> bool:
     return all(col in df.columns for col in required_columns)
 
 
+# ASCII characters clean_ticker drops once a ticker is uppercased
+_TICKER_DELETE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c in '.-')
+))
+
+
 def clean_ticker(ticker: str) -> str:
     """
     Clean and normalize stock ticker symbol.
@@ -203,9 +245,9 @@ def clean_ticker(ticker: str) -> str:
     cleaned = ticker.strip().upper()
     
     # Remove any special characters except hyphen and period
-    cleaned = ''.join(c for c in cleaned if c.isalnum() or c in '.-')
-    
-    return cleaned
+    if cleaned.isascii():
+        return cleaned.translate(_TICKER_DELETE)
+    return ''.join(c for c in cleaned if c.isalnum() or c in '.-')
 
 
 def get_trend_emoji(value: float) -> str:
@@ -251,10 +293,13 @@ def moving_average(data: np.ndarray, window: int) -> np.ndarray:
     Returns:
         Moving average array
     """
+    from utils.rolling import rolling_mean
+    
     if len(data) < window:
         return np.array([])
     
-    return np.convolve(data, np.ones(window) / window, mode='valid')
+    # O(n) running-sum mean; keep only the full windows ('valid' mode)
+    return rolling_mean(np.asarray(data, dtype=np.float64), window)[window - 1:]
 
 
 def exponential_moving_average(data: np.ndarray, span: int) -> np.ndarray:
@@ -268,13 +313,14 @@ def exponential_moving_average(data: np.ndarray, span: int) -> np.ndarray:
     Returns:
         EMA array
     """
-    alpha = 2 / (span + 1)
-    ema = np.zeros_like(data)
-    ema[0] = data[0]
+    from utils.fast_ewm import ewm_adjust_false, span_to_alpha
     
-    for i in range(1, len(data)):
-        ema[i] = alpha * data[i] + (1 - alpha) * ema[i-1]
+    data = np.asarray(data)
+    ema = ewm_adjust_false(data, span_to_alpha(span))
     
+    # Keep float inputs' dtype, as the previous loop did
+    if np.issubdtype(data.dtype, np.floating):
+        return ema.astype(data.dtype, copy=False)
     return ema
 
 
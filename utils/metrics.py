@@ -6,6 +6,12 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Union
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
 
 def calculate_mse(actual: np.ndarray, predicted: np.ndarray) -> float:
     """
@@ -98,6 +104,9 @@ def calculate_directional_accuracy(actual: np.ndarray, predicted: np.ndarray) ->
     if len(actual) < 2:
         return 0.0
     
+    if HAVE_NUMBA:
+        return _directional_matches(np.asarray(actual), np.asarray(predicted)) / (len(actual) - 1)
+    
     actual_direction = np.sign(np.diff(actual))
     predicted_direction = np.sign(np.diff(predicted))
     
@@ -105,6 +114,20 @@ def calculate_directional_accuracy(actual: np.ndarray, predicted: np.ndarray) ->
     return correct / len(actual_direction)
 
 
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _directional_matches(actual, predicted):
+        # Same test as comparing np.sign of both diffs, without the temporaries;
+        # a NaN step never matches, as nan == nan is False
+        count = 0
+        for i in range(1, len(actual)):
+            da = actual[i] - actual[i - 1]
+            dp = predicted[i] - predicted[i - 1]
+            if (da > 0) == (dp > 0) and (da < 0) == (dp < 0) and da == da and dp == dp:
+                count += 1
+        return count
+
+
 def calculate_sharpe_ratio(returns: np.ndarray, risk_free_rate: float = 0.02, periods_per_year: int = 252) -> float:
     """
     Calculate Sharpe Ratio.
@@ -169,6 +192,9 @@ def calculate_max_drawdown(prices: np.ndarray) -> Tuple[float, int, int]:
     if len(prices) == 0:
         return 0.0, 0, 0
     
+    if HAVE_NUMBA:
+        return _max_drawdown_scan(np.asarray(prices))
+    
     cummax = np.maximum.accumulate(prices)
     drawdown = (cummax - prices) / cummax
     
@@ -178,6 +204,28 @@ def calculate_max_drawdown(prices: np.ndarray) -> Tuple[float, int, int]:
     return drawdown[max_dd_idx], peak_idx, max_dd_idx
 
 
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _max_drawdown_scan(prices):
+        # One pass tracking the running peak; strict comparisons keep the
+        # first peak and first trough, as argmax does in the NumPy path
+        running_max = prices[0]
+        running_peak = 0
+        max_dd = 0.0
+        peak = 0
+        trough = 0
+        for i in range(1, len(prices)):
+            if prices[i] > running_max:
+                running_max = prices[i]
+                running_peak = i
+            dd = (running_max - prices[i]) / running_max
+            if dd > max_dd:
+                max_dd = dd
+                peak = running_peak
+                trough = i
+        return max_dd, peak, trough
+
+
 def calculate_volatility(returns: np.ndarray, periods_per_year: int = 252) -> float:
     """
     Calculate annualized volatility.
@@ -209,13 +257,33 @@ def calculate_beta(stock_returns: np.ndarray, market_returns: np.ndarray) -> flo
     if len(stock_returns) != len(market_returns) or len(stock_returns) == 0:
         return 1.0
     
-    covariance = np.cov(stock_returns, market_returns)[0, 1]
-    market_variance = np.var(market_returns)
+    return _beta_and_means(stock_returns, market_returns)[0]
+
+
+def _beta_and_means(stock_returns: np.ndarray, market_returns: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Beta and both mean returns from one set of centred dot products.
     
-    if market_variance == 0:
-        return 1.0
+    Beta keeps the original definition: sample covariance (ddof=1, as
+    np.cov) over population market variance (ddof=0, as np.var).
+    
+    Returns:
+        Tuple of (beta, mean stock return, mean market return)
+    """
+    stock_returns = np.asarray(stock_returns, dtype=np.float64)
+    market_returns = np.asarray(market_returns, dtype=np.float64)
+    n = len(stock_returns)
+    
+    mean_s = stock_returns.mean()
+    mean_m = market_returns.mean()
+    dm = market_returns - mean_m
+    ss_m = dm @ dm
     
-    return covariance / market_variance
+    if ss_m == 0:
+        return 1.0, mean_s, mean_m
+    
+    covariance = (stock_returns - mean_s) @ dm / (n - 1)
+    return covariance / (ss_m / n), mean_s, mean_m
 
 
 def calculate_alpha(stock_returns: np.ndarray, market_returns: np.ndarray, 
@@ -235,11 +303,11 @@ def calculate_alpha(stock_returns: np.ndarray, market_returns: np.ndarray,
     if len(stock_returns) != len(market_returns) or len(stock_returns) == 0:
         return 0.0
     
-    beta = calculate_beta(stock_returns, market_returns)
-    daily_rf = risk_free_rate / periods_per_year
+    # Beta's centring pass already yields both means
+    beta, mean_s, mean_m = _beta_and_means(stock_returns, market_returns)
     
-    expected_return = np.mean(stock_returns) * periods_per_year
-    market_return = np.mean(market_returns) * periods_per_year
+    expected_return = mean_s * periods_per_year
+    market_return = mean_m * periods_per_year
     
     return expected_return - (risk_free_rate + beta * (market_return - risk_free_rate))
 
@@ -269,6 +337,29 @@ def calculate_information_ratio(returns: np.ndarray, benchmark_returns: np.ndarr
     return np.sqrt(periods_per_year) * np.mean(active_returns) / tracking_error
 
 
+def linear_percentile(values: np.ndarray, q: float) -> float:
+    """
+    Single percentile with np.percentile's linear interpolation.
+    
+    Only the two order statistics around the target rank are selected
+    with np.partition (O(n)), rather than sorting the whole array.
+    
+    Args:
+        values: Non-empty array without NaNs
+        q: Percentile in [0, 100]
+    
+    Returns:
+        The q-th percentile, bit-identical to np.percentile
+    """
+    pos = (q / 100) * (len(values) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    part = np.partition(values, [lo, hi])
+    a, b, t = part[lo], part[hi], pos - lo
+    # Same lerp form as NumPy, so results match it to the last bit
+    return float(b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t)
+
+
 def calculate_var(returns: np.ndarray, confidence_level: float = 0.95) -> float:
     """
     Calculate Value at Risk (VaR).
@@ -283,7 +374,7 @@ def calculate_var(returns: np.ndarray, confidence_level: float = 0.95) -> float:
     if len(returns) == 0:
         return 0.0
     
-    return -np.percentile(returns, (1 - confidence_level) * 100)
+    return -linear_percentile(returns, (1 - confidence_level) * 100)
 
 
 def calculate_cvar(returns: np.ndarray, confidence_level: float = 0.95) -> float:
@@ -327,6 +418,64 @@ def calculate_calmar_ratio(returns: np.ndarray, prices: np.ndarray) -> float:
     return annual_return / max_dd
 
 
+# Metric names understood by calculate_metrics, in result order
+METRIC_NAMES = ('mse', 'rmse', 'mae', 'mape', 'r2', 'directional_accuracy')
+
+
+def calculate_metrics(actual: np.ndarray, predicted: np.ndarray, which) -> Dict[str, float]:
+    """
+    Calculate only the requested prediction metrics.
+    
+    Same definitions as the individual calculate_* functions. The error,
+    absolute-error and squared-error reductions are computed once when
+    any requested metric needs them, and skipped when none does.
+    
+    Args:
+        actual: Actual values
+        predicted: Predicted values
+        which: Iterable of names from METRIC_NAMES
+    
+    Returns:
+        Dictionary of the requested metrics, in METRIC_NAMES order
+    """
+    which = frozenset(which)
+    unknown = which.difference(METRIC_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+    
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    metrics = {}
+    
+    if which & {'mse', 'rmse', 'mae', 'mape', 'r2'}:
+        err = actual - predicted
+    
+    if which & {'mse', 'rmse', 'r2'}:
+        ss_res = err @ err
+        mse = ss_res / len(err)
+        if 'mse' in which:
+            metrics['mse'] = float(mse)
+        if 'rmse' in which:
+            metrics['rmse'] = float(np.sqrt(mse))
+    
+    if which & {'mae', 'mape'}:
+        abs_err = np.abs(err)
+        if 'mae' in which:
+            metrics['mae'] = float(abs_err.mean())
+        if 'mape' in which:
+            metrics['mape'] = float((abs_err / np.abs(actual + 1e-8)).mean() * 100)
+    
+    if 'r2' in which:
+        centered = actual - actual.mean()
+        ss_tot = centered @ centered
+        metrics['r2'] = float(1 - ss_res / ss_tot) if ss_tot != 0 else 0.0
+    
+    if 'directional_accuracy' in which:
+        metrics['directional_accuracy'] = float(calculate_directional_accuracy(actual, predicted))
+    
+    return {name: metrics[name] for name in METRIC_NAMES if name in metrics}
+
+
 def calculate_all_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
     """
     Calculate all prediction metrics.
@@ -338,14 +487,46 @@ def calculate_all_metrics(actual: np.ndarray, predicted: np.ndarray) -> Dict[str
     Returns:
         Dictionary of all metrics
     """
-    return {
-        'mse': calculate_mse(actual, predicted),
-        'rmse': calculate_rmse(actual, predicted),
-        'mae': calculate_mae(actual, predicted),
-        'mape': calculate_mape(actual, predicted),
-        'r2': calculate_r2(actual, predicted),
-        'directional_accuracy': calculate_directional_accuracy(actual, predicted)
-    }
+    return calculate_metrics(actual, predicted, METRIC_NAMES)
+
+
+def calculate_forecast_metrics(
+    actual: np.ndarray,
+    predicted: np.ndarray
+) -> Tuple[float, float, float, float, float, float]:
+    """
+    Calculate the model evaluation metrics, sharing intermediate arrays.
+    
+    The error and first-difference arrays are computed once and reused,
+    instead of re-deriving them for each metric.
+    
+    Args:
+        actual: Actual values
+        predicted: Predicted values
+        
+    Returns:
+        Tuple of (rmse, mae, mape, naive_rmse, directional_accuracy,
+        residual_std); mape and directional_accuracy are percentages and
+        naive_rmse is the RMSE of a persistence (previous value) forecast
+    """
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    
+    err = actual - predicted
+    abs_err = np.abs(err)
+    actual_diff = np.diff(actual)
+    
+    rmse = np.sqrt(err @ err / len(err))
+    mae = abs_err.mean()
+    mape = (abs_err / np.abs(actual)).mean() * 100
+    naive_rmse = np.sqrt(actual_diff @ actual_diff / len(actual_diff))
+    directional_accuracy = (np.sign(np.diff(predicted)) == np.sign(actual_diff)).mean() * 100
+    residual_std = err.std()
+    
+    return (
+        float(rmse), float(mae), float(mape),
+        float(naive_rmse), float(directional_accuracy), float(residual_std)
+    )
 
 
 def calculate_all_risk_metrics(returns: np.ndarray, prices: np.ndarray, 
@@ -353,6 +534,10 @@ def calculate_all_risk_metrics(returns: np.ndarray, prices: np.ndarray,
     """
     Calculate all risk-related metrics.
     
+    Same definitions as the individual calculate_* functions (2% risk-free
+    rate, 95% confidence), but the mean, standard deviation and max
+    drawdown are each computed once and shared across metrics.
+    
     Args:
         returns: Array of returns
         prices: Array of prices
@@ -361,15 +546,46 @@ def calculate_all_risk_metrics(returns: np.ndarray, prices: np.ndarray,
     Returns:
         Dictionary of all risk metrics
     """
-    metrics = {
-        'volatility': calculate_volatility(returns),
-        'sharpe_ratio': calculate_sharpe_ratio(returns),
-        'sortino_ratio': calculate_sortino_ratio(returns),
-        'max_drawdown': calculate_max_drawdown(prices)[0],
-        'var_95': calculate_var(returns, 0.95),
-        'cvar_95': calculate_cvar(returns, 0.95),
-        'calmar_ratio': calculate_calmar_ratio(returns, prices)
-    }
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    
+    # Max drawdown is shared by its own entry and the Calmar ratio
+    max_dd = calculate_max_drawdown(prices)[0]
+    
+    if n == 0:
+        metrics = {
+            'volatility': 0.0,
+            'sharpe_ratio': 0.0,
+            'sortino_ratio': 0.0,
+            'max_drawdown': max_dd,
+            'var_95': 0.0,
+            'cvar_95': 0.0,
+            'calmar_ratio': 0.0
+        }
+    else:
+        periods_per_year = 252
+        daily_rf = 0.02 / periods_per_year
+        
+        # Std is shift-invariant, so one centred pass serves volatility and Sharpe
+        mean = returns.mean()
+        centered = returns - mean
+        std = np.sqrt(centered @ centered / n)
+        excess_mean = mean - daily_rf
+        
+        downside = returns[returns < daily_rf] - daily_rf
+        downside_std = downside.std() if len(downside) > 0 else 0.0
+        
+        var_95 = -linear_percentile(returns, (1 - 0.95) * 100)
+        
+        metrics = {
+            'volatility': std * np.sqrt(periods_per_year),
+            'sharpe_ratio': np.sqrt(periods_per_year) * excess_mean / std if std != 0 else 0.0,
+            'sortino_ratio': np.sqrt(periods_per_year) * excess_mean / downside_std if downside_std != 0 else 0.0,
+            'max_drawdown': max_dd,
+            'var_95': var_95,
+            'cvar_95': -returns[returns <= -var_95].mean(),
+            'calmar_ratio': mean * periods_per_year / max_dd if max_dd != 0 else 0.0
+        }
     
     if benchmark_returns is not None and len(benchmark_returns) == len(returns):
         metrics['beta'] = calculate_beta(returns, benchmark_returns)
@@ -0,0 +1,199 @@
+"""
+NumPy re-implementation of stacked-LSTM inference.
+
+Runs the recursive forecast rollout directly on float32 weight arrays
+extracted from a Keras model, avoiding per-call TensorFlow dispatch.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DENSE_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0)
+}
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Logistic sigmoid written via tanh so large inputs cannot overflow."""
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+class NumpyLSTM:
+    """Stacked LSTM followed by Dense layers, evaluated with NumPy."""
+    
+    def __init__(
+        self,
+        lstm_weights: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        dense_weights: List[Tuple[np.ndarray, np.ndarray, str]]
+    ):
+        """
+        Initialize from extracted layer weights.
+        
+        Args:
+            lstm_weights: (kernel, recurrent_kernel, bias) per LSTM layer
+            dense_weights: (kernel, bias, activation) per Dense layer
+        """
+        self.lstm_weights = lstm_weights
+        self.dense_weights = dense_weights
+    
+    @classmethod
+    def from_keras(cls, model) -> Optional['NumpyLSTM']:
+        """
+        Extract weights from a plain stacked-LSTM Keras model.
+        
+        Only LSTM layers (default activations, not stateful or reversed)
+        followed by linear/relu Dense layers are supported; Dropout and
+        input layers are skipped since they are no-ops at inference.
+        
+        Args:
+            model: Loaded Keras model
+        
+        Returns:
+            NumpyLSTM instance, or None if the architecture is unsupported
+        """
+        lstm_weights = []
+        dense_weights = []
+        
+        for layer in model.layers:
+            kind = type(layer).__name__
+            config = layer.get_config()
+            
+            if kind in ('InputLayer', 'Dropout'):
+                continue
+            
+            if kind == 'LSTM' and not dense_weights:
+                if (
+                    config.get('activation') != 'tanh'
+                    or config.get('recurrent_activation') != 'sigmoid'
+                    or config.get('go_backwards') or config.get('stateful')
+                    or not config.get('use_bias', True)
+                ):
+                    return None
+                kernel, recurrent_kernel, bias = layer.get_weights()
+                lstm_weights.append((
+                    kernel.astype(np.float32),
+                    recurrent_kernel.astype(np.float32),
+                    bias.astype(np.float32)
+                ))
+                last_returns_sequences = config.get('return_sequences', False)
+                continue
+            
+            if kind == 'Dense' and lstm_weights:
+                activation = config.get('activation')
+                if activation not in _DENSE_ACTIVATIONS or not config.get('use_bias', True):
+                    return None
+                kernel, bias = layer.get_weights()
+                dense_weights.append((kernel.astype(np.float32), bias.astype(np.float32), activation))
+                continue
+            
+            logger.info("NumPy LSTM path unavailable: unsupported layer %s", kind)
+            return None
+        
+        if not lstm_weights or last_returns_sequences:
+            return None
+        
+        return cls(lstm_weights, dense_weights)
+    
+    @staticmethod
+    def _run_layer(
+        projected: np.ndarray,
+        recurrent_kernel: np.ndarray,
+        return_sequences: bool
+    ) -> np.ndarray:
+        """
+        Run one LSTM layer from zero state over pre-projected inputs.
+        
+        Args:
+            projected: x @ kernel + bias, shaped (batch, timesteps, 4 * units)
+            recurrent_kernel: Recurrent weights shaped (units, 4 * units)
+            return_sequences: Return every hidden state instead of the last
+        
+        Returns:
+            Hidden states shaped (batch, timesteps, units) or (batch, units)
+        """
+        batch, timesteps, _ = projected.shape
+        units = recurrent_kernel.shape[0]
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        states = np.empty((batch, timesteps, units), dtype=np.float32) if return_sequences else None
+        
+        for t in range(timesteps):
+            # Keras gate order: input, forget, cell, output
+            z = projected[:, t] + h @ recurrent_kernel
+            i = _sigmoid(z[:, :units])
+            f = _sigmoid(z[:, units:2 * units])
+            g = np.tanh(z[:, 2 * units:3 * units])
+            o = _sigmoid(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if states is not None:
+                states[:, t] = h
+        
+        return states if return_sequences else h
+    
+    def _forward(self, first_projection: np.ndarray) -> np.ndarray:
+        """Run the network given the first layer's input projection."""
+        last = len(self.lstm_weights) - 1
+        out = self._run_layer(first_projection, self.lstm_weights[0][1], last > 0)
+        
+        for k in range(1, last + 1):
+            kernel, recurrent_kernel, bias = self.lstm_weights[k]
+            out = self._run_layer(out @ kernel + bias, recurrent_kernel, k < last)
+        
+        for kernel, bias, activation in self.dense_weights:
+            out = _DENSE_ACTIVATIONS[activation](out @ kernel + bias)
+        
+        return out
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict one step for a batch of windows.
+        
+        Args:
+            X: Inputs shaped (batch, timesteps, features)
+        
+        Returns:
+            Predictions shaped (batch, outputs)
+        """
+        kernel, _, bias = self.lstm_weights[0]
+        return self._forward(X.astype(np.float32, copy=False) @ kernel + bias)
+    
+    def rollout(self, X: np.ndarray, horizon: int) -> np.ndarray:
+        """
+        Recursively predict horizon steps, feeding each prediction back in.
+        
+        Each step re-runs the LSTM over the shifted window from zero state,
+        exactly like calling the Keras model on it. Only the newly appended
+        row's first-layer input projection is computed per step; the
+        projections live in a doubled ring buffer, so the current window is
+        always a plain slice and nothing is shifted.
+        
+        Args:
+            X: Scaled windows shaped (batch, window_size, features); the
+                model output size must equal features
+            horizon: Number of steps to predict
+        
+        Returns:
+            Predictions shaped (batch, horizon, features)
+        """
+        kernel, _, bias = self.lstm_weights[0]
+        window = X.shape[1]
+        projected = X.astype(np.float32, copy=False) @ kernel + bias
+        preds = np.empty((X.shape[0], horizon, X.shape[2]), dtype=np.float32)
+        
+        # Every row is stored at t and t + window; the window starting at
+        # head is ring[:, head:head + window]
+        ring = np.concatenate([projected, projected], axis=1)
+        
+        for i in range(horizon):
+            head = i % window
+            step = self._forward(ring[:, head:head + window])
+            preds[:, i] = step
+            ring[:, head] = ring[:, head + window] = step @ kernel + bias
+        
+        return preds
@@ -1,14 +1,39 @@
 """
 Plotting utilities for chart generation.
 Server-side chart configuration helpers for Plotly.js frontend.
+Rolling statistics come from utils.rolling (bottleneck's C kernels when installed).
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+import base64
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple, Union
 import pandas as pd
 import numpy as np
+from cachetools import TTLCache
 
+from utils.downsample import (
+    DEFAULT_POINTS, bucket_bounds, bucket_size, downsample_indices, resample_ohlc
+)
+from utils.fast_ewm import rsi_wilder
+from utils.rolling import rolling_mean, rolling_mean_std, rolling_means
 
-# Dark theme color palette
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+# Dark theme color palette; builders read it at call time, so edits take effect
 COLORS = {
     'background': '#0d1117',
     'paper': '#161b22',
@@ -30,12 +55,157 @@ COLORS = {
     'confidence': 'rgba(163, 113, 247, 0.2)'
 }
 
+# Longest line trace drawn as SVG 'scatter'; longer ones use WebGL 'scattergl'
+SVG_MAX_POINTS = 5000
+
+# Serialized chart payloads, keyed on a hash of the frame's content
+CHART_JSON_CACHE_SIZE = 256
+CHART_JSON_CACHE_TTL = 60  # Seconds
+_chart_json_cache = TTLCache(maxsize=CHART_JSON_CACHE_SIZE, ttl=CHART_JSON_CACHE_TTL)
+_chart_json_lock = threading.Lock()
+
+
+def date_strings(df: pd.DataFrame) -> List[str]:
+    """
+    Format a DataFrame's DatetimeIndex as YYYY-MM-DD strings.
+    
+    Compute this once per chart and pass it to the trace builders as
+    dates, instead of letting each builder re-format the index.
+    
+    Args:
+        df: DataFrame with datetime index
+    
+    Returns:
+        List of date strings
+    """
+    # pandas formats this ISO pattern in C; a datetime64[D] -> str cast is slower
+    return df.index.strftime('%Y-%m-%d').tolist()
+
+
+def _take(values: Union[List, np.ndarray], idx: np.ndarray) -> Union[List, np.ndarray]:
+    """Select rows idx from a list or array, keeping its type."""
+    if isinstance(values, np.ndarray):
+        return values[idx]
+    return [values[i] for i in idx]
+
+
+def _maybe_downsample(x: List, y: List, n_out: int = DEFAULT_POINTS,
+                      extra: Optional[List] = None) -> Tuple:
+    """
+    Reduce a long x/y series to about n_out points that keep its extremes.
+    
+    Args:
+        x: X-axis values
+        y: Y-axis values (None/NaN allowed)
+        n_out: Target number of points
+        extra: Optional per-point list (e.g. bar colors) reduced alongside
+    
+    Returns:
+        Tuple of (x, y, extra), unchanged when len(y) <= n_out
+    """
+    if len(y) <= n_out:
+        return x, y, extra
+    idx = downsample_indices(np.asarray(y, dtype=np.float64), n_out)
+    if isinstance(extra, (list, np.ndarray)):
+        extra = _take(extra, idx)
+    return _take(x, idx), _take(y, idx), extra
+
+
+def _chart_indicators(close: np.ndarray) -> Dict[str, np.ndarray]:
+    """MA20, MA50, Wilder RSI(14) and 2-sigma Bollinger bands of one Close series."""
+    # MA20 doubles as the Bollinger middle band; its std comes from the same sums
+    ma20, std20 = rolling_mean_std(close, 20)
+    return _indicator_columns(ma20, std20, rolling_mean(close, 50), rsi_wilder(close, 14))
+
+
+def _indicator_columns(ma20: np.ndarray, std20: np.ndarray, ma50: np.ndarray,
+                       rsi: np.ndarray) -> Dict[str, np.ndarray]:
+    """Indicator columns in the order format_chart_data_for_json returns them."""
+    return {
+        'ma20': ma20,
+        'ma50': ma50,
+        'rsi': rsi,
+        'bb_upper': ma20 + 2 * std20,
+        'bb_lower': ma20 - 2 * std20
+    }
+
+
+if HAVE_NUMBA:
+    @njit(cache=True, nogil=True)
+    def _window_mean(csum, i, window, shift):
+        # Same arithmetic as utils.rolling._sums_from_cumsum, so results match bit for bit
+        total = csum[i] - csum[i - window] if i >= window else csum[i]
+        return total / window + shift
+    
+    @njit(cache=True, nogil=True)
+    def _chart_indicators_kernel(x, out):
+        # Rows of out: MA20, std20, MA50; NaN where the window is incomplete
+        n = len(x)
+        out[:] = np.nan
+        if n == 0:
+            return
+        
+        # Running sums of the centered price and its square
+        x0 = x[0]
+        c1 = np.empty(n)
+        c2 = np.empty(n)
+        s1 = s2 = 0.0
+        for i in range(n):
+            d = x[i] - x0
+            s1 += d
+            s2 += d * d
+            c1[i] = s1
+            c2[i] = s2
+        
+        for i in range(19, n):
+            t1 = c1[i] - c1[i - 20] if i >= 20 else c1[i]
+            t2 = c2[i] - c2[i - 20] if i >= 20 else c2[i]
+            out[0, i] = t1 / 20 + x0
+            out[1, i] = np.sqrt(max((t2 - t1 * t1 / 20) / 19, 0.0))
+        for i in range(49, n):
+            out[2, i] = _window_mean(c1, i, 50, x0)
+    
+    @njit(cache=True, parallel=True, nogil=True)
+    def _chart_indicators_batch(close, offsets, out):
+        # close holds every series back to back; series k is close[offsets[k]:offsets[k + 1]]
+        for k in prange(len(offsets) - 1):
+            _chart_indicators_kernel(close[offsets[k]:offsets[k + 1]],
+                                     out[:, offsets[k]:offsets[k + 1]])
+
+
+def _chart_indicators_many(closes: List[np.ndarray]) -> List[Dict[str, np.ndarray]]:
+    """
+    _chart_indicators for several series at once.
+    
+    With numba the moving averages run in parallel, without the GIL, over
+    one concatenated buffer; otherwise they are computed one after another.
+    RSI always comes from rsi_wilder, the definition the indicator API uses.
+    """
+    if not HAVE_NUMBA or len(closes) < 2:
+        return [_chart_indicators(close) for close in closes]
+    
+    offsets = np.zeros(len(closes) + 1, dtype=np.int64)
+    np.cumsum([len(close) for close in closes], out=offsets[1:])
+    out = np.empty((3, offsets[-1]))
+    _chart_indicators_batch(np.concatenate(closes), offsets, out)
+    return [_indicator_columns(*out[:, start:end], rsi_wilder(close, 14))
+            for close, start, end in zip(closes, offsets[:-1], offsets[1:])]
+
+
+def warmup() -> None:
+    """Compile (or load the cached build of) the batched indicator kernel in this process."""
+    if HAVE_NUMBA:
+        _chart_indicators_many([np.zeros(2), np.zeros(2)])
+
 
 def get_layout_config(title: str = '', height: int = 400, 
                      show_legend: bool = True, show_rangeslider: bool = False) -> Dict:
     """
     Get standard Plotly layout configuration for dark theme.
     
+    A new nested dict is built on every call (about 2 us); callers such as
+    create_subplot_layout modify the result, so no part of it is shared.
+    
     Args:
         title: Chart title
         height: Chart height in pixels
@@ -83,29 +253,51 @@ def get_layout_config(title: str = '', height: int = 400,
             'bgcolor': COLORS['paper'],
             'font': {'color': COLORS['text']},
             'bordercolor': COLORS['border']
-        }
+        },
+        # No animated transitions; a constant uirevision keeps zoom across restyles
+        'transition': {'duration': 0},
+        'uirevision': 'constant'
     }
 
 
-def get_candlestick_trace(df: pd.DataFrame, name: str = 'Price') -> Dict:
+def get_candlestick_trace(df: pd.DataFrame, name: str = 'Price',
+                          dates: Optional[List[str]] = None,
+                          downsample: bool = True,
+                          target_candles: int = DEFAULT_POINTS) -> Dict:
     """
     Generate candlestick trace configuration.
     
+    Histories longer than target_candles rows are merged into at most
+    that many candles of equal row count (first open, highest high,
+    lowest low, last close), dated by each bucket's first row.
+    
     Args:
         df: DataFrame with OHLC columns and datetime index
         name: Trace name
+        dates: Pre-formatted date strings (see date_strings)
+        downsample: Whether to merge long histories into fewer candles
+        target_candles: Maximum number of candles when downsampling
         
     Returns:
         Plotly candlestick trace dictionary
     """
+    x = dates if dates is not None else date_strings(df)
+    open_, high = df['Open'].to_numpy(), df['High'].to_numpy()
+    low, close = df['Low'].to_numpy(), df['Close'].to_numpy()
+    
+    if downsample and len(df) > target_candles:
+        size = bucket_size(len(df), target_candles)
+        x = _take(x, bucket_bounds(len(df), size)[0])
+        open_, high, low, close, _ = resample_ohlc(open_, high, low, close, None, size)
+    
     return {
         'type': 'candlestick',
         'name': name,
-        'x': df.index.strftime('%Y-%m-%d').tolist(),
-        'open': df['Open'].tolist(),
-        'high': df['High'].tolist(),
-        'low': df['Low'].tolist(),
-        'close': df['Close'].tolist(),
+        'x': x,
+        'open': open_.tolist(),
+        'high': high.tolist(),
+        'low': low.tolist(),
+        'close': close.tolist(),
         'increasing': {
             'line': {'color': COLORS['accent_green']},
             'fillcolor': COLORS['accent_green']
@@ -119,13 +311,18 @@ def get_candlestick_trace(df: pd.DataFrame, name: str = 'Price') -> Dict:
 
 def get_line_trace(x: List, y: List, name: str = '', color: str = None,
                   dash: str = 'solid', width: int = 2, fill: str = None,
-                  fillcolor: str = None, showlegend: bool = True) -> Dict:
+                  fillcolor: str = None, showlegend: bool = True,
+                  downsample: bool = True, renderer: str = 'auto') -> Dict:
     """
     Generate line trace configuration.
     
+    Series longer than DEFAULT_POINTS are reduced to about that many
+    points, keeping each bucket's minimum and maximum. With renderer
+    'auto', traces still longer than SVG_MAX_POINTS are drawn with WebGL.
+    
     Args:
         x: X-axis values
-        y: Y-axis values
+        y: Y-axis values; an ndarray is reduced before conversion to a list
         name: Trace name
         color: Line color
         dash: Line dash style ('solid', 'dash', 'dot', 'dashdot')
@@ -133,12 +330,22 @@ def get_line_trace(x: List, y: List, name: str = '', color: str = None,
         fill: Fill type ('tozeroy', 'tonexty', etc.)
         fillcolor: Fill color
         showlegend: Whether to show in legend
+        downsample: Whether to reduce long series
+        renderer: 'auto', 'scatter' (SVG) or 'scattergl' (WebGL)
         
     Returns:
         Plotly scatter trace dictionary
     """
+    if downsample:
+        x, y, _ = _maybe_downsample(x, y)
+    if isinstance(y, np.ndarray):
+        y = y.tolist()
+    
+    if renderer == 'auto':
+        renderer = 'scattergl' if len(y) > SVG_MAX_POINTS else 'scatter'
+    
     trace = {
-        'type': 'scatter',
+        'type': renderer,
         'mode': 'lines',
         'name': name,
         'x': x,
@@ -149,6 +356,7 @@ def get_line_trace(x: List, y: List, name: str = '', color: str = None,
             'width': width
         },
         'showlegend': showlegend,
+        'connectgaps': False,
         'hovertemplate': '%{y:.2f}<extra>' + name + '</extra>'
     }
     
@@ -160,7 +368,8 @@ def get_line_trace(x: List, y: List, name: str = '', color: str = None,
 
 
 def get_area_trace(x: List, y: List, name: str = '', color: str = None,
-                  fillcolor: str = None) -> Dict:
+                  fillcolor: str = None, downsample: bool = True,
+                  renderer: str = 'auto') -> Dict:
     """
     Generate area trace configuration.
     
@@ -170,16 +379,19 @@ def get_area_trace(x: List, y: List, name: str = '', color: str = None,
         name: Trace name
         color: Line color
         fillcolor: Fill color
+        downsample: Whether to reduce long series
+        renderer: 'auto', 'scatter' (SVG) or 'scattergl' (WebGL)
         
     Returns:
         Plotly scatter trace with fill
     """
     return get_line_trace(x, y, name, color, fill='tozeroy', 
-                         fillcolor=fillcolor or 'rgba(88, 166, 255, 0.2)')
+                         fillcolor=fillcolor or 'rgba(88, 166, 255, 0.2)',
+                         downsample=downsample, renderer=renderer)
 
 
 def get_bar_trace(x: List, y: List, name: str = '', colors: List = None,
-                 showlegend: bool = True) -> Dict:
+                 showlegend: bool = True, downsample: bool = True) -> Dict:
     """
     Generate bar trace configuration.
     
@@ -189,10 +401,14 @@ def get_bar_trace(x: List, y: List, name: str = '', colors: List = None,
         name: Trace name
         colors: List of colors per bar
         showlegend: Whether to show in legend
+        downsample: Whether to reduce long series (per-bar colors follow)
         
     Returns:
         Plotly bar trace dictionary
     """
+    if downsample:
+        x, y, colors = _maybe_downsample(x, y, extra=colors)
+    
     return {
         'type': 'bar',
         'name': name,
@@ -206,60 +422,90 @@ def get_bar_trace(x: List, y: List, name: str = '', colors: List = None,
     }
 
 
-def get_volume_trace(df: pd.DataFrame) -> Dict:
+def get_volume_trace(df: pd.DataFrame, dates: Optional[List[str]] = None,
+                     downsample: bool = True,
+                     target_candles: int = DEFAULT_POINTS) -> Dict:
     """
     Generate volume bar trace with color based on price direction.
     
+    Long histories are summed into the same buckets get_candlestick_trace
+    uses for the same target_candles, so bars stay aligned with the candles. Each bar's color is 1 (up)
+    or 0 (down), mapped through a two-stop colorscale, rather than a
+    repeated color string.
+    
     Args:
         df: DataFrame with Volume and Close columns
+        dates: Pre-formatted date strings (see date_strings)
+        downsample: Whether to merge long histories into fewer bars
+        target_candles: Maximum number of bars when downsampling
         
     Returns:
         Plotly bar trace for volume
     """
-    colors = [COLORS['volume_up'] if df['Close'].iloc[i] >= df['Open'].iloc[i] 
-              else COLORS['volume_down'] for i in range(len(df))]
+    x = dates if dates is not None else date_strings(df)
+    open_, close = df['Open'].to_numpy(), df['Close'].to_numpy()
+    volume = df['Volume'].to_numpy()
+    
+    if downsample and len(df) > target_candles:
+        starts, ends = bucket_bounds(len(df), bucket_size(len(df), target_candles))
+        x = _take(x, starts)
+        open_, close = open_[starts], close[ends]
+        volume = np.add.reduceat(volume, starts)
+    
+    up = (close >= open_).astype(np.uint8)
     
     return {
         'type': 'bar',
         'name': 'Volume',
-        'x': df.index.strftime('%Y-%m-%d').tolist(),
-        'y': df['Volume'].tolist(),
-        'marker': {'color': colors},
+        'x': x,
+        'y': volume.tolist(),
+        'marker': {
+            'color': up.tolist(),
+            'colorscale': [[0, COLORS['volume_down']], [1, COLORS['volume_up']]],
+            'cmin': 0,
+            'cmax': 1,
+            'showscale': False
+        },
         'yaxis': 'y2',
         'showlegend': False,
         'hovertemplate': 'Volume: %{y:,.0f}<extra></extra>'
     }
 
 
-def get_moving_average_traces(df: pd.DataFrame, windows: List[int] = [20, 50]) -> List[Dict]:
+def get_moving_average_traces(df: pd.DataFrame, windows: List[int] = [20, 50],
+                              dates: Optional[List[str]] = None) -> List[Dict]:
     """
     Generate moving average line traces.
     
     Args:
         df: DataFrame with Close column
         windows: List of MA windows
+        dates: Pre-formatted date strings (see date_strings)
         
     Returns:
         List of Plotly trace dictionaries
     """
-    traces = []
     colors = [COLORS['ma_20'], COLORS['ma_50'], COLORS['accent_purple']]
+    x = dates if dates is not None else date_strings(df)
     
-    for i, window in enumerate(windows):
-        ma = df['Close'].rolling(window=window).mean()
-        traces.append(get_line_trace(
-            x=df.index.strftime('%Y-%m-%d').tolist(),
-            y=ma.tolist(),
+    # One cumulative sum over Close serves every window
+    means = rolling_means(df['Close'].to_numpy(dtype=np.float64), windows)
+    
+    return [
+        get_line_trace(
+            x=x,
+            y=ma,
             name=f'MA{window}',
             color=colors[i % len(colors)],
             width=1
-        ))
-    
-    return traces
+        )
+        for i, (window, ma) in enumerate(zip(windows, means))
+    ]
 
 
 def get_bollinger_bands_traces(df: pd.DataFrame, window: int = 20, 
-                               num_std: float = 2.0) -> List[Dict]:
+                               num_std: float = 2.0,
+                               dates: Optional[List[str]] = None) -> List[Dict]:
     """
     Generate Bollinger Bands traces.
     
@@ -267,22 +513,23 @@ def get_bollinger_bands_traces(df: pd.DataFrame, window: int = 20,
         df: DataFrame with Close column
         window: Rolling window size
         num_std: Number of standard deviations
+        dates: Pre-formatted date strings (see date_strings)
         
     Returns:
         List of Plotly trace dictionaries (upper, middle, lower)
     """
-    ma = df['Close'].rolling(window=window).mean()
-    std = df['Close'].rolling(window=window).std()
+    # Mean and sample std from one cumulative pass over x and x**2
+    ma, std = rolling_mean_std(df['Close'].to_numpy(dtype=np.float64), window)
     upper = ma + (std * num_std)
     lower = ma - (std * num_std)
     
-    x = df.index.strftime('%Y-%m-%d').tolist()
+    x = dates if dates is not None else date_strings(df)
     
     return [
-        get_line_trace(x, upper.tolist(), 'BB Upper', COLORS['accent_purple'], 
+        get_line_trace(x, upper, 'BB Upper', COLORS['accent_purple'], 
                       dash='dash', width=1),
-        get_line_trace(x, ma.tolist(), 'BB Middle', COLORS['accent_purple'], width=1),
-        get_line_trace(x, lower.tolist(), 'BB Lower', COLORS['accent_purple'], 
+        get_line_trace(x, ma, 'BB Middle', COLORS['accent_purple'], width=1),
+        get_line_trace(x, lower, 'BB Lower', COLORS['accent_purple'], 
                       dash='dash', width=1, fill='tonexty', 
                       fillcolor=COLORS['bollinger'])
     ]
@@ -327,30 +574,29 @@ def get_forecast_traces(dates: List, forecast: List, lower_bound: List = None,
     return traces
 
 
-def get_rsi_trace(df: pd.DataFrame, window: int = 14) -> Tuple[Dict, Dict]:
+def get_rsi_trace(df: pd.DataFrame, window: int = 14,
+                  dates: Optional[List[str]] = None) -> Tuple[Dict, Dict]:
     """
     Generate RSI trace with overbought/oversold zones.
     
     Args:
         df: DataFrame with Close column
         window: RSI window
+        dates: Pre-formatted date strings (see date_strings)
         
     Returns:
         Tuple of (RSI trace, layout config for RSI subplot)
     """
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = rsi_wilder(df['Close'].to_numpy(dtype=np.float64), window)
     
     trace = {
         'type': 'scatter',
         'mode': 'lines',
         'name': 'RSI',
-        'x': df.index.strftime('%Y-%m-%d').tolist(),
+        'x': dates if dates is not None else date_strings(df),
         'y': rsi.tolist(),
         'line': {'color': COLORS['accent_blue'], 'width': 1.5},
+        'connectgaps': False,
         'yaxis': 'y3'
     }
     
@@ -364,6 +610,16 @@ def get_rsi_trace(df: pd.DataFrame, window: int = 14) -> Tuple[Dict, Dict]:
     return trace, shapes
 
 
+@lru_cache(maxsize=32)
+def _subplot_domains(rows: int, row_heights: Tuple[float, ...]) -> Tuple[Tuple[float, float], ...]:
+    """Vertical (start, end) domain of each subplot row, top row first, with 0.02 gaps."""
+    domains = []
+    for i in range(rows):
+        domain_start = sum(row_heights[i + 1:]) + 0.02 * (rows - i - 1)
+        domains.append((domain_start, domain_start + row_heights[i]))
+    return tuple(domains)
+
+
 def create_subplot_layout(rows: int = 3, row_heights: List[float] = None,
                          shared_xaxes: bool = True) -> Dict:
     """
@@ -383,10 +639,8 @@ def create_subplot_layout(rows: int = 3, row_heights: List[float] = None,
     layout = get_layout_config(height=600)
     
     # Configure y-axes for each row
-    for i in range(rows):
+    for i, (domain_start, domain_end) in enumerate(_subplot_domains(rows, tuple(row_heights))):
         yaxis_name = 'yaxis' if i == 0 else f'yaxis{i + 1}'
-        domain_start = sum(row_heights[i + 1:]) + 0.02 * (rows - i - 1)
-        domain_end = domain_start + row_heights[i]
         
         layout[yaxis_name] = {
             'domain': [domain_start, domain_end],
@@ -399,42 +653,184 @@ def create_subplot_layout(rows: int = 3, row_heights: List[float] = None,
     return layout
 
 
-def format_chart_data_for_json(df: pd.DataFrame, include_indicators: bool = True) -> Dict:
+def _json_column(values: np.ndarray) -> Union[np.ndarray, List]:
+    """
+    Numeric column in the cheapest form to_json can serialize.
+    
+    With orjson, numeric data stays a contiguous ndarray (float32 widened
+    so the digits match tolist()); otherwise, or for object columns, it is
+    converted with tolist().
+    """
+    values = np.asarray(values)
+    if not HAVE_ORJSON or values.dtype.kind not in 'biuf':
+        return values.tolist()
+    if values.dtype.kind == 'f':
+        values = values.astype(np.float64, copy=False)
+    return np.ascontiguousarray(values)
+
+
+def _typed(values: np.ndarray) -> Dict:
+    """
+    Numeric column as a Plotly.js typed-array descriptor.
+    
+    Plotly.js 2.28+ decodes {'dtype': 'f8', 'bdata': <base64>} wherever it
+    accepts a data array, so the column crosses the wire as 8 raw bytes per
+    value (NaN included) instead of decimal text.
+    """
+    values = np.ascontiguousarray(values, dtype='<f8')
+    return {'dtype': 'f8', 'bdata': base64.b64encode(values.data).decode('ascii')}
+
+
+def to_json(data: Dict) -> bytes:
+    """
+    Serialize chart data, including any ndarray columns, to JSON bytes.
+    
+    Args:
+        data: Dictionary from format_chart_data_for_json
+    
+    Returns:
+        UTF-8 JSON; NaN is written as null when orjson is available
+    """
+    if HAVE_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode()
+
+
+def format_chart_data_for_json(df: pd.DataFrame, include_indicators: bool = True,
+                               downsample: bool = True, binary: bool = False) -> Dict:
     """
     Format DataFrame data for JSON response to frontend.
     
+    When orjson is installed, numeric series are returned as ndarrays
+    rather than lists, so they are encoded without boxing every element;
+    serialize the result with to_json (or the app's orjson provider).
+    
+    Histories longer than DEFAULT_POINTS rows are merged into at most that
+    many buckets: OHLC as in get_candlestick_trace, volume summed, and the
+    indicators (computed on the full history) taken at each bucket's
+    last row, like close.
+    
+    With binary=True every numeric column is a base64 float64 descriptor
+    (see _typed) that Plotly.js takes in place of an array; dates stay a
+    list of strings.
+    
     Args:
         df: DataFrame with OHLC data
         include_indicators: Whether to include technical indicators
+        downsample: Whether to merge long histories into fewer rows
+        binary: Whether to encode numeric columns as Plotly typed arrays
         
     Returns:
         Dictionary formatted for JSON response
     """
+    indicators = None
+    if include_indicators:
+        indicators = _chart_indicators(df['Close'].to_numpy(dtype=np.float64))
+    return _format_chart_data(df, indicators, downsample, binary)
+
+
+def format_chart_data_batch(dfs: Dict[str, pd.DataFrame], downsample: bool = True,
+                            binary: bool = False) -> Dict[str, Dict]:
+    """
+    Format several tickers' data at once, as format_chart_data_for_json would.
+    
+    The indicators for all tickers are computed in one call, in parallel
+    across tickers when numba is installed, instead of one ticker at a time.
+    
+    Args:
+        dfs: Mapping of ticker to DataFrame with OHLC data
+        downsample: Whether to merge long histories into fewer rows
+        binary: Whether to encode numeric columns as Plotly typed arrays
+    
+    Returns:
+        Mapping of ticker to the dictionary format_chart_data_for_json returns
+    """
+    closes = [df['Close'].to_numpy(dtype=np.float64) for df in dfs.values()]
+    return {
+        ticker: _format_chart_data(df, indicators, downsample, binary)
+        for (ticker, df), indicators in zip(dfs.items(), _chart_indicators_many(closes))
+    }
+
+
+def _frame_digest(df: pd.DataFrame) -> bytes:
+    """blake2b digest of the index and OHLCV columns that chart payloads read."""
+    h = hashlib.blake2b(digest_size=16)
+    columns = [col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in df.columns]
+    h.update(repr(columns).encode())
+    
+    # Date strings depend on the timezone as well as the instants
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex):
+        h.update(str(index.tz).encode())
+        index = index.asi8
+    
+    for values in [np.asarray(index)] + [df[col].to_numpy() for col in columns]:
+        if values.dtype.hasobject:
+            values = pd.util.hash_array(values)
+        values = np.ascontiguousarray(values)
+        h.update(values.dtype.str.encode())
+        h.update(values.view(np.uint8))
+    return h.digest()
+
+
+def chart_data_json(df: pd.DataFrame, include_indicators: bool = True,
+                    downsample: bool = True, binary: bool = False) -> bytes:
+    """
+    format_chart_data_for_json serialized with to_json, memoized by content.
+    
+    Dashboards re-request the same ticker and timeframe within seconds;
+    identical frames (same index and OHLCV values) hit a TTL cache of the
+    encoded bytes and skip both the indicator work and the encoding.
+    
+    Args:
+        df: DataFrame with OHLC data
+        include_indicators: Whether to include technical indicators
+        downsample: Whether to merge long histories into fewer rows
+        binary: Whether to encode numeric columns as Plotly typed arrays
+    
+    Returns:
+        UTF-8 JSON bytes
+    """
+    key = (_frame_digest(df), include_indicators, downsample, binary)
+    with _chart_json_lock:
+        body = _chart_json_cache.get(key)
+    if body is not None:
+        return body
+    
+    body = to_json(format_chart_data_for_json(df, include_indicators, downsample, binary))
+    with _chart_json_lock:
+        _chart_json_cache[key] = body
+    return body
+
+
+def _format_chart_data(df: pd.DataFrame, indicators: Optional[Dict[str, np.ndarray]],
+                       downsample: bool, binary: bool) -> Dict:
+    """format_chart_data_for_json with the full-length indicator columns supplied."""
+    dates = date_strings(df)
+    open_, high = df['Open'].to_numpy(), df['High'].to_numpy()
+    low, close = df['Low'].to_numpy(), df['Close'].to_numpy()
+    volume = df['Volume'].to_numpy() if 'Volume' in df.columns else None
+    
+    ends = None
+    if downsample and len(df) > DEFAULT_POINTS:
+        size = bucket_size(len(df))
+        starts, ends = bucket_bounds(len(df), size)
+        dates = _take(dates, starts)
+        open_, high, low, close, volume = resample_ohlc(open_, high, low, close, volume, size)
+    
+    column = _typed if binary else _json_column
     data = {
-        'dates': df.index.strftime('%Y-%m-%d').tolist(),
-        'open': df['Open'].tolist(),
-        'high': df['High'].tolist(),
-        'low': df['Low'].tolist(),
-        'close': df['Close'].tolist(),
-        'volume': df['Volume'].tolist() if 'Volume' in df.columns else []
+        'dates': dates,
+        'open': column(open_),
+        'high': column(high),
+        'low': column(low),
+        'close': column(close),
+        'volume': column(volume) if volume is not None else []
     }
     
-    if include_indicators:
-        data['ma20'] = df['Close'].rolling(window=20).mean().tolist()
-        data['ma50'] = df['Close'].rolling(window=50).mean().tolist()
-        
-        # RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['rsi'] = (100 - (100 / (1 + rs))).tolist()
-        
-        # Bollinger Bands
-        ma = df['Close'].rolling(window=20).mean()
-        std = df['Close'].rolling(window=20).std()
-        data['bb_upper'] = (ma + 2 * std).tolist()
-        data['bb_lower'] = (ma - 2 * std).tolist()
+    if indicators is not None:
+        for key, values in indicators.items():
+            data[key] = column(values if ends is None else values[ends])
     
     return data
 
@@ -443,6 +839,8 @@ def get_chart_config() -> Dict:
     """
     Get standard Plotly config for all charts.
     
+    Built fresh per call, like get_layout_config, so callers may modify it.
+    
     Returns:
         Plotly config dictionary
     """
@@ -451,6 +849,8 @@ def get_chart_config() -> Dict:
         'displayModeBar': True,
         'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
         'displaylogo': False,
+        'doubleClick': 'reset',
+        'plotGlPixelRatio': 2,
         'toImageButtonOptions': {
             'format': 'png',
             'filename': 'stock_chart',
@@ -0,0 +1,125 @@
+"""
+Rolling-window statistics on NumPy arrays.
+
+Each helper makes a single cumulative-sum pass over the input instead of
+re-walking every window, and returns NaN where the window is incomplete
+(matching pandas' rolling(...).mean()/.std() defaults). Inputs are 1-D
+series or 2-D (time, series) matrices; windows run along axis 0. When
+bottleneck is installed its C moving-window kernels are used instead.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import bottleneck as bn
+    HAVE_BOTTLENECK = True
+except ImportError:
+    HAVE_BOTTLENECK = False
+
+
+def _window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum over each full trailing window along axis 0 (len(x) - window + 1 rows)."""
+    return _sums_from_cumsum(np.cumsum(x, axis=0), window)
+
+
+def _sums_from_cumsum(csum: np.ndarray, window: int) -> np.ndarray:
+    """Full trailing window sums from a cumulative sum taken along axis 0."""
+    sums = csum[window - 1:].copy()
+    sums[1:] -= csum[:-window]
+    return sums
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing rolling mean.
+    
+    Args:
+        x: Float array without NaNs, time along axis 0
+        window: Window length
+    
+    Returns:
+        Array shaped like x, NaN for the first window - 1 rows
+    """
+    if HAVE_BOTTLENECK and window <= len(x):
+        return bn.move_mean(x, window, min_count=window, axis=0)
+    
+    out = np.full(x.shape, np.nan)
+    if window <= len(x):
+        # Centering keeps the running sum small, limiting cancellation error
+        shift = x[0]
+        out[window - 1:] = _window_sums(x - shift, window) / window + shift
+    return out
+
+
+def rolling_means(x: np.ndarray, windows: Sequence[int]) -> List[np.ndarray]:
+    """
+    Trailing rolling means for several windows from one cumulative sum.
+    
+    Args:
+        x: Float array without NaNs, time along axis 0
+        windows: Window lengths
+    
+    Returns:
+        List of arrays shaped like x, one per window, NaN for the first window - 1 rows
+    """
+    if HAVE_BOTTLENECK:
+        return [rolling_mean(x, window) for window in windows]
+    
+    shift = x[0] if len(x) else 0.0
+    csum = np.cumsum(x - shift, axis=0)
+    means = []
+    for window in windows:
+        out = np.full(x.shape, np.nan)
+        if window <= len(x):
+            out[window - 1:] = _sums_from_cumsum(csum, window) / window + shift
+        means.append(out)
+    return means
+
+
+def rolling_mean_std(x: np.ndarray, window: int, ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing rolling mean and standard deviation from one set of sums.
+    
+    Args:
+        x: Float array without NaNs, time along axis 0
+        window: Window length
+        ddof: Delta degrees of freedom for the standard deviation
+    
+    Returns:
+        Tuple of (mean, std) arrays shaped like x, NaN where the window is incomplete
+    """
+    if HAVE_BOTTLENECK and ddof < window <= len(x):
+        return (
+            bn.move_mean(x, window, min_count=window, axis=0),
+            bn.move_std(x, window, min_count=window, axis=0, ddof=ddof)
+        )
+    
+    mean = np.full(x.shape, np.nan)
+    std = np.full(x.shape, np.nan)
+    if window <= len(x):
+        # Sums of x and x**2 come from one cumulative pass over both columns
+        centered = x - x[0]
+        sums = _window_sums(np.stack([centered, centered * centered], axis=-1), window)
+        s1, s2 = sums[..., 0], sums[..., 1]
+        mean[window - 1:] = s1 / window + x[0]
+        if window > ddof:
+            var = (s2 - s1 * s1 / window) / (window - ddof)
+            std[window - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return mean, std
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Trailing rolling standard deviation.
+    
+    Args:
+        x: Float array without NaNs, time along axis 0
+        window: Window length
+        ddof: Delta degrees of freedom
+    
+    Returns:
+        Array shaped like x, NaN where the window is incomplete
+    """
+    return rolling_mean_std(x, window, ddof)[1]
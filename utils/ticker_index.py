@@ -0,0 +1,58 @@
+"""
+Substring index for ticker autocomplete.
+
+A sorted suffix array over ticker symbols and company names, so each
+lookup is a binary search plus the matching entries instead of a scan
+over the whole ticker table.
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Dict, List
+
+
+class TickerIndex:
+    """Suffix-array index over ticker symbols and names."""
+    
+    def __init__(self, names: Dict[str, str]):
+        """
+        Build the index.
+        
+        Args:
+            names: Ticker -> display name, in preferred result order
+        """
+        self._tickers = list(names)
+        
+        entries = []
+        for rank, (ticker, name) in enumerate(names.items()):
+            for text in {ticker.upper(), name.upper()}:
+                entries.extend((text[i:], rank) for i in range(len(text)))
+        entries.sort()
+        
+        self._suffixes = [suffix for suffix, _ in entries]
+        self._ranks = [rank for _, rank in entries]
+    
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Find tickers whose symbol or name contains the query.
+        
+        Args:
+            query: Case-insensitive search text
+            limit: Maximum results to return
+        
+        Returns:
+            Matching tickers in table order
+        """
+        query = query.upper()
+        if not query:
+            return self._tickers[:limit]
+        
+        # Every occurrence of query is a prefix of some suffix, and those
+        # suffixes sit in one contiguous run of the sorted array
+        ranks = set()
+        i = bisect_left(self._suffixes, query)
+        while i < len(self._suffixes) and self._suffixes[i].startswith(query):
+            ranks.add(self._ranks[i])
+            i += 1
+        
+        return [self._tickers[r] for r in heapq.nsmallest(limit, ranks)]
@@ -0,0 +1,25 @@
+"""
+Request input validation with no heavy imports.
+
+Kept free of pandas/numpy so the route blueprints can validate input
+without pulling in the data stack at import time.
+"""
+
+# Characters allowed in a Yahoo symbol: stocks (BRK.B, BF-B, 005930),
+# indices (^GSPC), FX pairs (EURUSD=X) and futures (GC=F)
+_TICKER_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-^=')
+
+
+def is_valid_ticker(ticker: str) -> bool:
+    """
+    Cheap syntactic check for a ticker symbol.
+    
+    Args:
+        ticker: Ticker string (any case)
+        
+    Returns:
+        True if the ticker is 1-10 letters, digits or . - ^ = characters
+    """
+    if not isinstance(ticker, str) or not ticker or len(ticker) > 10:
+        return False
+    return _TICKER_CHARS.issuperset(ticker.upper())